@@ -0,0 +1,100 @@
+"""
+Latency of the local metrics API under concurrent keep-alive clients.
+
+Runs the pipeline on a synthetic dataset in a temporary directory, serves its
+database with api.server and reports p50/p99 per route for the first (cold)
+requests and for the cached ones.
+
+Usage: python benchmarks/bench_api.py --rows 50000 --clients 8 --requests 500
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from synthetic import build_tables, with_schema_columns, write_csvs
+
+for key in ("SENDGRID_API_KEY", "EMAIL_SENDER", "EMAIL_RECEIVER", "TEMPLATE_ID"):
+    os.environ.setdefault(key, "benchmark@example.com")
+
+from api.server import MetricsService, make_server  # noqa: E402
+from pipeline.stages import pipeline_context, run_ingest, run_persist  # noqa: E402
+
+ROUTES = ["/flows", "/flows/1", "/series/month", "/series/week?flow=1", "/skills/top?limit=20"]
+
+
+def percentile(samples: list[float], q: float) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+
+def client(address, requests: int, latencies: dict[str, list[float]]):
+    connection = http.client.HTTPConnection(*address)
+    for i in range(requests):
+        route = ROUTES[i % len(ROUTES)]
+        start = time.perf_counter()
+        connection.request("GET", route)
+        connection.getresponse().read()
+        latencies[route].append(time.perf_counter() - start)
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per client")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_csvs(with_schema_columns(build_tables(args.rows)), root / "data")
+        ctx = pipeline_context(root / "data", root / "salida")
+        run_ingest(ctx)
+        run_persist(ctx)
+        ctx.outbox.close()
+
+        service = MetricsService(ctx.database)
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        cold = {route: [] for route in ROUTES}
+        client(server.server_address, len(ROUTES), cold)
+        latencies = {route: [] for route in ROUTES}
+        threads = [
+            threading.Thread(target=client, args=(server.server_address, args.requests, latencies))
+            for _ in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        print(f"{'Route':<24} {'cold ms':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for route in ROUTES:
+            samples = latencies[route]
+            print(
+                f"{route:<24} {cold[route][0] * 1000:>8.2f} "
+                f"{percentile(samples, 50) * 1000:>8.2f} {percentile(samples, 99) * 1000:>8.2f}"
+            )
+        every = [sample for samples in latencies.values() for sample in samples]
+        print(
+            f"{len(every)} cached requests from {args.clients} clients in {elapsed:.2f}s "
+            f"({len(every) / elapsed:.0f} req/s), p99 {percentile(every, 99) * 1000:.2f} ms"
+        )
+        print(f"cache: {service.cache.stats()}")
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Throughput comparison of the metrics backends (pandas, Polars lazy, Arrow).
+
+Usage: python benchmarks/bench_backends.py --rows 1000000 --repeat 3
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_tables, write_csvs
+
+from processing.backends import BACKENDS, GROUP_METRICS, compute_group_metrics
+
+
+def best_time(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = build_tables(args.rows)
+    total_rows = sum(len(data[metric.table]) for metric in GROUP_METRICS.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_csvs(data, Path(tmp))
+        print(f"{'backend':<8} {'source':<10} {'seconds':>8} {'M rows/s':>9}")
+        for name in BACKENDS:
+            for source_name, source in (("memory", data), ("csv", paths)):
+                try:
+                    seconds = best_time(
+                        lambda: compute_group_metrics(source, name), args.repeat
+                    )
+                except ImportError as e:
+                    print(f"{name:<8} {source_name:<10} skipped ({e})")
+                    break
+                print(
+                    f"{name:<8} {source_name:<10} {seconds:>8.3f} "
+                    f"{total_rows / seconds / 1e6:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
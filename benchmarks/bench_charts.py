@@ -0,0 +1,43 @@
+"""
+Chart rendering throughput: serial versus process pool.
+
+Usage: python benchmarks/bench_charts.py --charts 200 --processes 4 --dpi 100
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import synthetic  # noqa: F401  (adds src to sys.path)
+from reporting.charts import ChartSpec, render_charts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--charts", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    months = [f"2024-{month:02d}" for month in range(1, 13)]
+    specs = [
+        ChartSpec(f"flow-{i}", f"Flow {i}", months, rng.integers(0, 100, 12).tolist(), "Mes", "Total")
+        for i in range(args.charts)
+    ]
+
+    for processes in (None, args.processes):
+        start = time.perf_counter()
+        charts = render_charts(specs, dpi=args.dpi, processes=processes)
+        seconds = time.perf_counter() - start
+        size = sum(len(chart.data) for chart in charts)
+        print(
+            f"processes={processes or 1:<3} {seconds:>7.2f}s "
+            f"{len(charts) / seconds:>7.1f} charts/s {size / 2**20:>7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Batch runs of several datasets: one after another versus a process pool.
+
+Writes one synthetic dataset per "country" to a temporary directory and runs
+the full pipeline on all of them with pipeline.datasets.run_datasets.
+
+Usage: python benchmarks/bench_datasets.py --datasets 4 --rows 50000 --processes 4
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from synthetic import build_tables, with_schema_columns, write_csvs
+
+for key in ("SENDGRID_API_KEY", "EMAIL_SENDER", "EMAIL_RECEIVER", "TEMPLATE_ID"):
+    os.environ.setdefault(key, "benchmark@example.com")
+
+from pipeline.datasets import discover_datasets, run_datasets  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--datasets", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(args.datasets):
+            write_csvs(with_schema_columns(build_tables(args.rows, seed=i)), root / "data" / f"pais{i}")
+        datasets = discover_datasets(root / "data")
+
+        sequential = run_datasets(datasets, root / "sequential", processes=1)
+        print(f"sequential: {sequential.seconds:.2f}s")
+        pooled = run_datasets(datasets, root / "pool", processes=args.processes)
+        print(f"pool:       {pooled.seconds:.2f}s (processes={args.processes}, cpus={os.cpu_count()})")
+        print(pooled.table())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Email delivery throughput against a local mock SendGrid endpoint.
+
+Compares one request (and connection) per message, re-encoding the
+attachments every time, with BatchMailer.
+
+Usage: python benchmarks/bench_delivery.py --messages 5000 --attachment-kb 500
+"""
+
+import argparse
+import base64
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import synthetic  # noqa: F401  (adds src to sys.path)
+from delivery.batch import BatchMailer, Recipient, batch_body
+from delivery.outbox import Attachment
+from delivery.transport import SENDGRID_SEND_PATH, HTTPSession, check_response
+
+
+class MockSendGrid(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--attachment-kb", type=int, default=500)
+    parser.add_argument("--single", type=int, default=200, help="Messages sent one request each")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockSendGrid)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://%s:%d" % server.server_address
+
+    attachments = [Attachment("metrics.pdf", "application/pdf", os.urandom(args.attachment_kb * 1024))]
+    recipients = [Recipient(f"user{i}@example.com", {"nombre": f"Usuario {i}"}) for i in range(args.messages)]
+    headers = {"Authorization": "Bearer mock", "Content-Type": "application/json"}
+
+    start = time.perf_counter()
+    for recipient in recipients[: args.single]:
+        encoded = [
+            {"content": base64.b64encode(a.content).decode(), "filename": a.filename, "type": a.type}
+            for a in attachments
+        ]
+        body = batch_body("r@example.com", "tpl", [recipient], json.dumps(encoded).encode())
+        session = HTTPSession(url)
+        check_response(*session.post(SENDGRID_SEND_PATH, body, headers))
+        session.close()
+    seconds = time.perf_counter() - start
+    print(f"per message: {args.single / seconds:>9.0f} messages/s ({args.single} messages)")
+
+    with BatchMailer("mock", "r@example.com", url) as mailer:
+        result = mailer.send(recipients, "tpl", attachments)
+    print(
+        f"batched:     {result.messages_per_second:>9.0f} messages/s ({result.messages} messages, "
+        f"{result.requests} requests, {result.connections} connection)"
+    )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Metric export: in-memory CSV report versus streaming to a file.
+
+Reports wall time and peak traced memory (tracemalloc) of each export.
+
+Usage: python benchmarks/bench_export.py --rows 1000000 --repeat 20
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+from synthetic import build_tables
+
+from processing.metrics import get_all_metrics_as_dict
+from reporting.documents import create_csv_report
+from reporting.export import export_metrics, write_csv_report
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {seconds:>7.2f}s peak {peak / 2**20:>8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20, help="Copies of every metric table")
+    args = parser.parse_args()
+
+    metrics = get_all_metrics_as_dict(build_tables(args.rows))
+    metrics = {name: pd.concat([df] * args.repeat, ignore_index=True) for name, df in metrics.items()}
+    print(f"{sum(len(df) for df in metrics.values())} metric rows")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        measure("create_csv_report", lambda: (tmp / "a.csv").write_bytes(create_csv_report(metrics)))
+        measure("write_csv_report", lambda: write_csv_report(metrics, tmp / "b.csv"))
+        measure("write_csv_report gzip", lambda: write_csv_report(metrics, tmp / "c.csv.gz", "gzip"))
+        measure("jsonl gzip", lambda: export_metrics(metrics, tmp / "jsonl", "jsonl", "gzip"))
+        measure("parquet zstd", lambda: export_metrics(metrics, tmp / "parquet", "parquet", "zstd"))
+
+
+if __name__ == "__main__":
+    main()
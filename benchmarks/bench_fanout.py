@@ -0,0 +1,34 @@
+"""
+Per-Flow report fan-out throughput (reports per second).
+
+Usage: python benchmarks/bench_fanout.py --rows 200000 --flows 100 --processes 4
+"""
+
+import argparse
+import os
+import tempfile
+
+from synthetic import build_tables
+
+from reporting.fanout import fan_out_flow_reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--flows", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--dpi", type=int, default=72)
+    args = parser.parse_args()
+
+    data = build_tables(args.rows, n_flows=args.flows)
+    with tempfile.TemporaryDirectory() as tmp:
+        summary = fan_out_flow_reports(data, tmp, processes=args.processes, dpi=args.dpi)
+    print(
+        f"{summary.reports} reports in {summary.seconds:.2f}s "
+        f"({summary.reports_per_second:.1f} reports/s, processes={args.processes})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Overhead of the pipeline instrumentation: disabled, RSS and tracemalloc modes.
+
+Times get_all_metrics_as_dict on synthetic tables with the process-wide
+recorder in each mode, and the per-call cost of an instrumented no-op.
+
+Usage: python benchmarks/bench_instrumentation.py --rows 200000 --repeat 3
+"""
+
+import argparse
+import time
+
+from synthetic import build_tables, with_schema_columns
+
+from processing.metrics import get_all_metrics_as_dict
+from utils.instrumentation import MEMORY_MODES, RECORDER, instrument
+
+CALLS = 1_000_000
+
+
+def best_time(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@instrument("noop")
+def noop():
+    pass
+
+
+def plain():
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = with_schema_columns(build_tables(args.rows))
+
+    def calls(function):
+        return lambda: [function() for _ in range(CALLS)]
+
+    base_call = best_time(calls(plain), args.repeat)
+    print(f"disabled decorator: {(best_time(calls(noop), args.repeat) - base_call) / CALLS * 1e9:.0f} ns/call")
+
+    baseline = best_time(lambda: get_all_metrics_as_dict(data), args.repeat)
+    print(f"{'mode':<12} {'seconds':>8} {'overhead':>9} {'measurements':>13}")
+    print(f"{'disabled':<12} {baseline:>8.3f} {'':>9} {0:>13}")
+    for memory in MEMORY_MODES:
+        RECORDER.enable(memory)
+        seconds = best_time(lambda: get_all_metrics_as_dict(data), args.repeat)
+        RECORDER.disable()
+        print(f"{memory:<12} {seconds:>8.3f} {seconds / baseline - 1:>9.1%} {len(RECORDER.measurements):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Memory and speed of sparse candidate-Flow matching.
+
+Builds a random users x skills matrix (Zipf-distributed skills) and a Flows x
+users applications matrix, then ranks the top candidates of every Flow.
+
+Usage: python benchmarks/bench_matching.py --users 1000000 --skills 10000 --flows 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import synthetic  # noqa: F401  (adds src to sys.path)
+from processing.matching import SkillMatcher, incidence_matrix
+from processing.skills import SkillDictionary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--skills", type=int, default=10_000)
+    parser.add_argument("--flows", type=int, default=200)
+    parser.add_argument("--skills-per-user", type=int, default=10)
+    parser.add_argument("--applications", type=int, default=2_000_000)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n_pairs = args.users * args.skills_per_user
+    pair_users = np.repeat(np.arange(args.users), args.skills_per_user)
+    pair_codes = np.minimum(rng.zipf(1.3, n_pairs) - 1, args.skills - 1)
+    app_flows = rng.integers(0, args.flows, args.applications)
+    app_users = rng.integers(0, args.users, args.applications)
+
+    start = time.perf_counter()
+    users = incidence_matrix(pair_users, pair_codes, (args.users, args.skills))
+    applicants = incidence_matrix(app_flows, app_users, (args.flows, args.users))
+    matcher = SkillMatcher(
+        SkillDictionary([f"skill {code}" for code in range(args.skills)]),
+        np.arange(args.users),
+        users,
+        np.arange(args.flows),
+        applicants,
+    )
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = matcher.top_candidates(k=args.k)
+    ranked = time.perf_counter() - start
+
+    matrix_bytes = sum(
+        m.data.nbytes + m.indices.nbytes + m.indptr.nbytes
+        for m in (matcher.users, matcher.flows, matcher.applicants)
+    )
+    print(f"users x skills nnz: {users.nnz:,}")
+    print(f"matrices: {matrix_bytes / 2**20:,.1f} MiB")
+    print(f"build: {built:.2f}s")
+    print(f"top-{args.k} for {args.flows} flows: {ranked:.2f}s ({len(result):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+PDF table rendering: row-by-row iterrows versus reporting.tables.render_table.
+
+Usage: python benchmarks/bench_pdf_tables.py --rows 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+import synthetic  # noqa: F401  (adds src to sys.path)
+from reporting.tables import render_table
+
+
+def iterrows_table(pdf: FPDF, df: pd.DataFrame) -> None:
+    """Previous PDFReport.add_table implementation, kept as the baseline."""
+    pdf.set_font("Arial", "B", 9)
+    col_width = pdf.w / (len(df.columns) + 1)
+    for col in df.columns:
+        pdf.cell(col_width, 8, str(col), border=1)
+    pdf.ln()
+    pdf.set_font("Arial", "", 9)
+    for _, row in df.iterrows():
+        for item in row:
+            pdf.cell(col_width, 8, str(item), border=1)
+        pdf.ln()
+
+
+def build_table(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "ID Flow": np.arange(rows).astype(str),
+            "Participantes": rng.integers(0, 5000, rows),
+            "Aplicaciones": rng.integers(0, 9000, rows),
+            "Votos": rng.integers(0, 20000, rows),
+            "Conv. %": np.round(rng.random(rows) * 100, 2),
+        }
+    )
+
+
+def render(draw) -> tuple[float, int, int]:
+    start = time.perf_counter()
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=10)
+    pdf.add_page()
+    draw(pdf)
+    output = pdf.output(dest="S")
+    return time.perf_counter() - start, pdf.page_no(), len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--max-rows", type=int, default=100)
+    args = parser.parse_args()
+
+    df = build_table(args.rows)
+    cases = {
+        "iterrows": lambda pdf: iterrows_table(pdf, df),
+        "render_table": lambda pdf: render_table(pdf, df),
+        f"render_table max_rows={args.max_rows}": lambda pdf: render_table(
+            pdf, df, max_rows=args.max_rows
+        ),
+    }
+    print(f"{'renderer':<28} {'seconds':>8} {'pages':>6} {'KiB':>8}")
+    for name, draw in cases.items():
+        seconds, pages, size = render(draw)
+        print(f"{name:<28} {seconds:>8.3f} {pages:>6} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
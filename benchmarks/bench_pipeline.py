@@ -0,0 +1,46 @@
+"""
+End-to-end pipeline wall time: stages one after another versus the task DAG.
+
+Writes synthetic CSVs to a temporary directory and runs the full pipeline
+on them (separate output directory, so a fresh database, checkpoints and
+artifacts, for every run).
+
+Usage: python benchmarks/bench_pipeline.py --rows 200000 --workers 4
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_tables, with_schema_columns, write_csvs
+
+for key in ("SENDGRID_API_KEY", "EMAIL_SENDER", "EMAIL_RECEIVER", "TEMPLATE_ID"):
+    os.environ.setdefault(key, "benchmark@example.com")
+
+from pipeline.stages import pipeline_context, run_pipeline, run_pipeline_dag  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_csvs(with_schema_columns(build_tables(args.rows)), root / "data")
+        start = time.perf_counter()
+        run_pipeline(pipeline_context(root / "data", root / "sequential"))
+        print(f"sequential: {time.perf_counter() - start:.2f}s")
+
+        report = run_pipeline_dag(pipeline_context(root / "data", root / "dag"), max_workers=args.workers)
+        print(f"dag:        {report.wall_seconds:.2f}s (workers={args.workers})")
+        print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
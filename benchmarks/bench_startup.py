@@ -0,0 +1,30 @@
+"""
+Cold-start import time of every pipeline entry point (python -X importtime).
+
+Usage: python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import statistics
+
+import synthetic  # noqa: F401  (adds src to sys.path)
+from utils.startup import ENTRY_POINT_BUDGETS_MS, profile_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest imported modules to list")
+    args = parser.parse_args()
+
+    for module, budget in ENTRY_POINT_BUDGETS_MS.items():
+        profiles = [profile_import(module) for _ in range(args.repeat)]
+        median = statistics.median(profile.total_ms for profile in profiles)
+        slowest = sorted(profiles[-1].self_ms.items(), key=lambda item: -item[1])[: args.top]
+        print(f"{module:<20} {median:>8.1f} ms (budget {budget} ms)")
+        for name, ms in slowest:
+            print(f"    {name:<40} {ms:>7.1f} ms self")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Synthetic TalentPitch-like tables for benchmarks.
+
+Run from the repository root, e.g.: python benchmarks/bench_backends.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+SKILLS = ["Python", "SQL", "UX", "Figma", "Data", "Power BI, DAX", "Excel", "Java"]
+
+
+def build_tables(
+    n_events: int, n_users: int | None = None, n_flows: int = 200, seed: int = 0
+) -> dict[str, pd.DataFrame]:
+    """Build the pipeline tables with n_events rows in every event table."""
+    rng = np.random.default_rng(seed)
+    n_users = n_users or max(n_events // 10, 10)
+
+    def dates(size, start="2024-01-01", days=600):
+        seconds = rng.integers(0, days * 86400, size)
+        return pd.Timestamp(start) + pd.to_timedelta(seconds, unit="s")
+
+    skill_lists = np.array(
+        [str(rng.choice(SKILLS, k, replace=False).tolist()) for k in (1, 2, 3) for _ in range(50)],
+        dtype=object,
+    )
+    data = {
+        "flows": pd.DataFrame(
+            {"id": np.arange(1, n_flows + 1), "created_at": dates(n_flows)}
+        ),
+        "users": pd.DataFrame(
+            {
+                "id": np.arange(1, n_users + 1),
+                "gender": rng.choice(["M", "F", "O"], n_users),
+                "country": rng.choice(["CO", "MX", "AR"], n_users),
+                "city": rng.choice(["Bogotá", "Medellín", "CDMX", "Rosario"], n_users),
+                "birth_date": dates(n_users, "1960-01-01", 17000),
+                "created_at": dates(n_users),
+            }
+        ),
+        "resumes": pd.DataFrame(
+            {
+                "id": np.arange(1, n_users + 1),
+                "user_id": rng.integers(1, n_users + 1, n_users),
+                "skills": rng.choice(skill_lists, n_users),
+                "created_at": dates(n_users),
+            }
+        ),
+        "resumes_exhibited": pd.DataFrame(
+            {
+                "id": np.arange(1, n_events + 1),
+                "resume_id": rng.integers(1, n_users + 1, n_events),
+                "model_id": rng.integers(1, n_flows + 1, n_events),
+                "created_at": dates(n_events),
+            }
+        ),
+        "profiles": pd.DataFrame(
+            {
+                "user_id": np.arange(1, n_users + 1),
+                "skills": rng.choice(skill_lists, n_users),
+                "tools": "['Figma']",
+                "languages": "['Español']",
+            }
+        ),
+    }
+    for table in ["votes", "shares", "views"]:
+        data[table] = pd.DataFrame(
+            {
+                "id": np.arange(1, n_events + 1),
+                "model_id": rng.integers(1, n_flows + 1, n_events),
+                "user_id": rng.integers(1, n_users + 1, n_events),
+                "created_at": dates(n_events),
+            }
+        )
+    data["votes"]["value"] = rng.integers(1, 6, n_events)
+    return data
+
+
+def with_schema_columns(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Add the schema columns build_tables leaves out, so the tables pass ingestion."""
+    from utils.schemas import FIELDS_FILES
+
+    complete = {}
+    for table, df in data.items():
+        df = df.copy()
+        for column in FIELDS_FILES[table]:
+            if column in df.columns:
+                continue
+            if column == "email":
+                df[column] = [f"user{i}@example.com" for i in df["id"]]
+            elif column == "views":
+                df[column] = 0
+            elif column == "sent_at":
+                df[column] = df["created_at"]
+            else:
+                df[column] = f"{table}-{column}"
+        complete[table] = df
+    return complete
+
+
+def write_csvs(data: dict[str, pd.DataFrame], directory: Path) -> dict[str, Path]:
+    """Write every table to directory/<table>.csv and return the paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for table, df in data.items():
+        paths[table] = directory / f"{table}.csv"
+        df.to_csv(paths[table], index=False)
+    return paths
@@ -0,0 +1,156 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+from processing.skill_index import POSTING_DTYPE
+from processing.timeseries import PERIOD_COLUMNS
+
+POOL_SIZE = 4
+SERIES_GRANULARITIES = ("month", "week")
+
+# Per-Flow KPI -> query returning (flow id, value) rows; labels as in get_all_metrics_as_dict
+FLOW_KPI_QUERIES = {
+    "Participantes Únicos": (
+        "SELECT re.model_id, COUNT(DISTINCT r.user_id) FROM resumes_exhibited re "
+        "LEFT JOIN resumes r ON r.id = re.resume_id GROUP BY re.model_id"
+    ),
+    "Total Aplicaciones": "SELECT model_id, COUNT(id) FROM resumes_exhibited GROUP BY model_id",
+    "Votos Totales": "SELECT model_id, SUM(value) FROM votes GROUP BY model_id",
+    "Compartidos": "SELECT model_id, COUNT(id) FROM shares GROUP BY model_id",
+    "Visualizaciones Únicas": "SELECT model_id, COUNT(DISTINCT user_id) FROM views GROUP BY model_id",
+    "Visualizaciones Totales": "SELECT model_id, COUNT(id) FROM views GROUP BY model_id",
+}
+
+
+class ReadOnlyPool:
+    """
+    Pool of read-only SQLite connections shared by the request threads.
+
+    Connections are opened lazily up to size; a thread that finds none idle
+    waits for one to be returned.
+    """
+
+    def __init__(self, path: str | Path, size: int = POOL_SIZE) -> None:
+        self.path = Path(path).resolve()
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            connection = self.open() if can_open else self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+
+@contextmanager
+def read_transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run several queries against one snapshot of the database.
+
+    A persist committing between two of them would otherwise mix old and new
+    rows in one response.
+    """
+    connection.execute("BEGIN")
+    try:
+        yield connection
+    finally:
+        connection.execute("COMMIT")
+
+
+def data_version(connection: sqlite3.Connection) -> str | None:
+    """Version of the persisted data (save_data_version), None if never recorded."""
+    try:
+        row = connection.execute("SELECT version FROM data_versions ORDER BY id DESC LIMIT 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def flow_kpis(connection: sqlite3.Connection) -> dict[int, dict]:
+    """
+    Every per-Flow KPI of the persisted data, plus the conversion rate.
+
+    The KPI queries share one read transaction, so they all see the same data.
+
+    Returns:
+        Dictionary mapping Flow ids to {'ID Flow': id, <KPI label>: value, ...}
+    """
+    flows: dict[int, dict] = {}
+    with read_transaction(connection):
+        for label, query in FLOW_KPI_QUERIES.items():
+            for flow_id, value in connection.execute(query):
+                if flow_id is not None:
+                    flows.setdefault(flow_id, {"ID Flow": flow_id})[label] = value
+    for kpis in flows.values():
+        if kpis.get("Total Aplicaciones") and "Participantes Únicos" in kpis:
+            kpis["Tasa Conversión"] = kpis["Participantes Únicos"] / kpis["Total Aplicaciones"] * 100
+    return dict(sorted(flows.items()))
+
+
+def period_label(day: str, granularity: str) -> str:
+    """Report label ('YYYY-MM' or 'YYYY-WNN') of the period containing an ISO day."""
+    if granularity == "month":
+        return day[:7]
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def application_series(
+    connection: sqlite3.Connection, granularity: str, flow_id: int | None = None
+) -> list[dict]:
+    """
+    Applications per month or ISO week, for every Flow or one of them.
+
+    Rows are grouped by day in SQL and rolled up to periods here, since the
+    ISO week is not available in every SQLite version.
+    """
+    query = "SELECT date(created_at) AS day, COUNT(*) FROM resumes_exhibited"
+    params: tuple = ()
+    if flow_id is not None:
+        query += " WHERE model_id = ?"
+        params = (flow_id,)
+    totals: dict[str, int] = {}
+    for day, count in connection.execute(f"{query} GROUP BY day ORDER BY day", params):
+        if day is not None:
+            label = period_label(day, granularity)
+            totals[label] = totals.get(label, 0) + count
+    column = PERIOD_COLUMNS[granularity]
+    return [{column: label, "Total Aplicaciones": total} for label, total in sorted(totals.items())]
+
+
+def top_skills(connection: sqlite3.Connection, limit: int) -> list[dict]:
+    """Skills with the most resumes, from the persisted skill index."""
+    rows = connection.execute(
+        "SELECT skill, length(ids) / ? AS resumes FROM skill_postings "
+        "WHERE kind = 'resume' AND length(ids) > 0 ORDER BY resumes DESC, skill LIMIT ?",
+        (POSTING_DTYPE.itemsize, limit),
+    )
+    return [{"Skill": skill, "Cantidad": count} for skill, count in rows]
@@ -0,0 +1,230 @@
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from api.cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS, TTLCache
+from api.queries import (
+    POOL_SIZE,
+    SERIES_GRANULARITIES,
+    ReadOnlyPool,
+    application_series,
+    data_version,
+    flow_kpis,
+    top_skills,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+VERSION_CHECK_SECONDS = 0.5
+DEFAULT_TOP_SKILLS = 10
+MAX_TOP_SKILLS = 100
+
+
+class APIError(Exception):
+    """Request error returned to the client as {"error": message}."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class MetricsService:
+    """
+    Per-Flow KPIs, application series and top skills read from the clean database.
+
+    Responses are cached already encoded as JSON, keyed by the data version
+    recorded by the persist stage: when a new version shows up (checked at
+    most every version_check_seconds) the cache is cleared, so clients never
+    mix results of two runs. Entries also expire after the cache TTL.
+    """
+
+    ROUTES: list[tuple[re.Pattern, str]] = [
+        (re.compile(r"/flows"), "flows"),
+        (re.compile(r"/flows/(?P<flow_id>\d+)"), "flow"),
+        (re.compile(r"/series/(?P<granularity>\w+)"), "series"),
+        (re.compile(r"/skills/top"), "skills"),
+        (re.compile(r"/version"), "version"),
+    ]
+
+    def __init__(
+        self,
+        database: str | Path,
+        cache: TTLCache | None = None,
+        pool_size: int = POOL_SIZE,
+        version_check_seconds: float = VERSION_CHECK_SECONDS,
+    ) -> None:
+        self.database = Path(database)
+        if not self.database.exists():
+            raise FileNotFoundError(f"Database {self.database} does not exist")
+        self.pool = ReadOnlyPool(self.database, pool_size)
+        self.cache = cache if cache is not None else TTLCache()
+        self.version_check_seconds = version_check_seconds
+        self._version: str | None = None
+        self._checked_at = float("-inf")
+        self._version_lock = threading.Lock()
+        self._flow_index: tuple[bytes, str, dict] | None = None  # /flows body -> its version and KPIs by id
+
+    def data_version(self) -> str:
+        """Current data version, clearing the cache when it changed."""
+        now = time.monotonic()
+        if now - self._checked_at < self.version_check_seconds:
+            return self._version
+        with self._version_lock:
+            if now - self._checked_at >= self.version_check_seconds:
+                with self.pool.connection() as connection:
+                    version = data_version(connection)
+                if version is None:  # database persisted before versions were recorded
+                    version = f"mtime:{self.database.stat().st_mtime_ns}"
+                if version != self._version:
+                    if self._version is not None:
+                        logging.info(f"Data version changed to {version}, clearing the API cache")
+                    self.cache.clear()
+                    self._version = version
+                self._checked_at = time.monotonic()
+        return self._version
+
+    def cached(self, key: tuple, compute: Callable[[Any], Any]) -> bytes:
+        """JSON response of key, computed with a pooled connection on a miss."""
+        version = self.data_version()
+
+        def encode():
+            with self.pool.connection() as connection:
+                return json.dumps({"version": version, "data": compute(connection)}, ensure_ascii=False).encode()
+
+        return self.cache.get_or_compute((version, *key), encode)
+
+    def handle(self, path: str) -> bytes:
+        """
+        JSON response body of a GET request.
+
+        Routes:
+            /flows                       KPIs of every Flow
+            /flows/<id>                  KPIs of one Flow
+            /series/<month|week>?flow=   Applications per period (all Flows or one)
+            /skills/top?limit=           Skills with the most resumes
+            /version                     Data version and cache counters
+
+        Raises:
+            APIError: Unknown route, Flow or invalid parameter
+        """
+        url = urlsplit(path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        for pattern, name in self.ROUTES:
+            match = pattern.fullmatch(url.path.rstrip("/") or "/")
+            if match:
+                return getattr(self, f"get_{name}")(params, **match.groupdict())
+        raise APIError(404, f"Unknown route {url.path}")
+
+    def get_flows(self, params: dict) -> bytes:
+        return self.cached(("flows",), lambda connection: list(flow_kpis(connection).values()))
+
+    def get_flow(self, params: dict, flow_id: str) -> bytes:
+        """One Flow out of the cached /flows response, indexed once per response."""
+        flows = self.get_flows(params)
+        index = self._flow_index
+        if index is None or index[0] is not flows:
+            body = json.loads(flows)
+            index = (flows, body["version"], {kpis["ID Flow"]: kpis for kpis in body["data"]})
+            self._flow_index = index
+        kpis = index[2].get(int(flow_id))
+        if kpis is None:
+            raise APIError(404, f"Flow {flow_id} not found")
+        return json.dumps({"version": index[1], "data": kpis}, ensure_ascii=False).encode()
+
+    def get_series(self, params: dict, granularity: str) -> bytes:
+        if granularity not in SERIES_GRANULARITIES:
+            raise APIError(400, f"Granularity must be one of {', '.join(SERIES_GRANULARITIES)}")
+        flow_id = int_param(params, "flow")
+        return self.cached(
+            ("series", granularity, flow_id),
+            lambda connection: application_series(connection, granularity, flow_id),
+        )
+
+    def get_skills(self, params: dict) -> bytes:
+        limit = int_param(params, "limit", DEFAULT_TOP_SKILLS)
+        if not 0 < limit <= MAX_TOP_SKILLS:
+            raise APIError(400, f"limit must be between 1 and {MAX_TOP_SKILLS}")
+        return self.cached(("skills", limit), lambda connection: top_skills(connection, limit))
+
+    def get_version(self, params: dict) -> bytes:
+        return json.dumps({"version": self.data_version(), "cache": self.cache.stats()._asdict()}).encode()
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def int_param(params: dict, name: str, default: int | None = None) -> int | None:
+    if name not in params:
+        return default
+    try:
+        return int(params[name])
+    except ValueError:
+        raise APIError(400, f"{name} must be an integer")
+
+
+def handler_for(service: MetricsService) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, every response has a Content-Length
+        disable_nagle_algorithm = True  # headers and body are separate writes: don't wait for the ACK
+
+        def do_GET(self):
+            try:
+                status, body = 200, service.handle(self.path)
+            except APIError as e:
+                status, body = e.status, json.dumps({"error": str(e)}).encode()
+            except Exception as e:
+                logging.error(f"Error serving {self.path}: {e}")
+                status, body = 500, json.dumps({"error": "Internal error"}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.debug(f"{self.address_string()} {format % args}")
+
+    return MetricsHandler
+
+
+def make_server(service: MetricsService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """HTTP server for the service (port 0 picks a free port); call serve_forever() to run it."""
+    server = ThreadingHTTPServer((host, port), handler_for(service))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    from db.database import DATABASE_PATH
+
+    parser = argparse.ArgumentParser(description="Local read API for the pipeline metrics")
+    parser.add_argument("--database", default=DATABASE_PATH, help="Clean SQLite database")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL_SECONDS, help="Cache entry lifetime in seconds")
+    parser.add_argument("--cache-entries", type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help="Read-only SQLite connections")
+    args = parser.parse_args(argv)
+
+    service = MetricsService(args.database, TTLCache(args.cache_entries, args.ttl), args.pool_size)
+    server = make_server(service, args.host, args.port)
+    logging.info(f"Serving metrics of {args.database} on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+    main()
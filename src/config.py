@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -13,5 +15,22 @@ class Settings(BaseSettings):
 
     class Config:
         env_file = ".env"
-    
-settings: Settings = Settings()
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Load the settings on first use and cache them.
+
+    Reading the environment (and validating it) is deferred until a setting
+    is actually needed, so importing modules that use settings has no side
+    effects and does not require the email variables to be set.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Backwards compatible `from config import settings`, resolved lazily
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
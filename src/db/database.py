@@ -1,15 +1,16 @@
 import logging
+from functools import lru_cache
+from pathlib import Path
 
-from sqlalchemy import event, create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Engine, event, create_engine
+from sqlalchemy.orm import Session, sessionmaker
 from db.models import Base
 
 
-URL_DATABASE = "sqlite:///talentpitch_data_clean.db"
-engine = create_engine(URL_DATABASE, echo=False, future=True)
+DATABASE_PATH = "talentpitch_data_clean.db"
+URL_DATABASE = f"sqlite:///{DATABASE_PATH}"
 
 
-@event.listens_for(engine, "connect")
 def enable_foreign_keys(dbapi_connection, connection_record):
     """
     Enable SQLite foreign key constraints on each new connection.
@@ -26,19 +27,51 @@ def enable_foreign_keys(dbapi_connection, connection_record):
     cursor.close()
 
 
+@lru_cache(maxsize=None)
+def _engine_for(url: str) -> Engine:
+    engine = create_engine(url, echo=False, future=True)
+    event.listen(engine, "connect", enable_foreign_keys)
+    return engine
+
+
+def get_engine(path: str | Path = DATABASE_PATH) -> Engine:
+    """
+    Engine bound to the SQLite database file at path (one per file).
+
+    Args:
+        path: Database file; relative paths are resolved against the current
+              working directory when the engine is first created
+
+    Returns:
+        Engine: SQLAlchemy engine with foreign key constraints enabled
+    """
+    return _engine_for(f"sqlite:///{Path(path).resolve()}")
+
+
+engine = _engine_for(URL_DATABASE)
+
 SessionDB = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
-def init_db():
+def new_session(bind: Engine | None = None) -> Session:
+    """Session on the given engine (the default database if None)."""
+    return SessionDB(bind=bind) if bind is not None else SessionDB()
+
+
+def init_db(bind: Engine | None = None):
     """
     Initialize the database schema and create all tables.
 
     Creates all tables defined in Base.metadata based on SQLAlchemy ORM models.
     Foreign key constraints are enabled via the 'enable_foreign_keys' event listener.
 
+    Args:
+        bind: Engine of the database to initialize (the default database if None)
+
     Returns:
         Engine: SQLAlchemy engine instance for database operations
     """
-    Base.metadata.create_all(bind=engine)
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind=bind)
     logging.info("Database successfully initialized")
-    return engine
+    return bind
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
 
 Base = declarative_base()
 
@@ -92,3 +92,18 @@ class Profile(Base):
     dream_brands = Column(String)
     dream_roles = Column(String)
     areas_of_interest = Column(String)
+
+
+class SkillPosting(Base):
+    __tablename__ = "skill_postings"
+    code = Column(Integer, primary_key=True)
+    kind = Column(String, primary_key=True)
+    skill = Column(String, index=True)
+    ids = Column(LargeBinary)
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    version = Column(String)
+    created_at = Column(DateTime)
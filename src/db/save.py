@@ -1,9 +1,11 @@
 import logging
 
 import pandas as pd
+from sqlalchemy import Engine, delete
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from db.database import SessionDB
+from db.database import new_session
+from db.models import DataVersion, SkillPosting
 from utils.schemas import TABLES_MAP
 
 
@@ -13,7 +15,8 @@ def transform_date(df: pd.DataFrame) -> pd.DataFrame:
 
     Converts common datetime columns (birth_date, created_at, sent_at) from
     string format to pandas Timestamp objects for database insertion.
-    Handles parsing errors gracefully without raising exceptions.
+    The input DataFrame is not modified, so other pipeline stages can keep
+    reading it while it is being persisted.
 
     Args:
         df: DataFrame containing date columns as strings
@@ -22,10 +25,8 @@ def transform_date(df: pd.DataFrame) -> pd.DataFrame:
         DataFrame with date columns converted to datetime type
     """
     COLUMNS_DATETIME = ["birth_date", "created_at", "sent_at"]
-    for col in COLUMNS_DATETIME:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col])
-    return df
+    converted = {col: pd.to_datetime(df[col]) for col in COLUMNS_DATETIME if col in df.columns}
+    return df.assign(**converted) if converted else df
 
 
 def save_dataframe_to_table(session: Session, df: pd.DataFrame, model):
@@ -47,7 +48,7 @@ def save_dataframe_to_table(session: Session, df: pd.DataFrame, model):
     Raises:
         SQLAlchemyError: If database insertion fails (caught and re-raised with logging)
     """
-    if df.empty or df is None:
+    if df is None or df.empty:
         logging.warning(f"There is no data to save for table {model.__tablename__}")
         return
 
@@ -62,25 +63,47 @@ def save_dataframe_to_table(session: Session, df: pd.DataFrame, model):
         raise
 
 
-def save_data(data: dict[str, pd.DataFrame]):
+def save_data(
+    data: dict[str, pd.DataFrame],
+    replace: bool = False,
+    bind: Engine | None = None,
+    skill_index=None,
+    version: str | None = None,
+):
     """
     Save validated dataframes to the database in a single transaction.
 
     Iterates through all table mappings (from TABLES_MAP), inserts each dataframe
-    into its corresponding table via save_dataframe_to_table(). If any error occurs,
-    rolls back all changes to maintain data consistency.
+    into its corresponding table via save_dataframe_to_table(). The skill index
+    and the data version, when given, are written in the same transaction, so
+    readers never see a version whose data (or index) is not committed yet.
+    If any error occurs, rolls back all changes to maintain data consistency.
 
     Args:
         data: Dictionary mapping table names to validated pandas DataFrames
+              (tables missing from it are left untouched unless replace is set)
+        replace: Delete the existing rows of every table first (children
+                 before parents, so foreign keys hold)
+        bind: Engine of the target database (the default database if None)
+        skill_index: SkillIndex replacing the persisted one (kept if None)
+        version: Identifier of the data, recorded as its DataVersion (none if None)
 
     Raises:
         Exception: On transaction failure (after rollback and logging)
     """
-    session: Session = SessionDB()
+    session: Session = new_session(bind)
 
     try:
+        if replace:
+            for model in reversed(TABLES_MAP.values()):
+                session.execute(delete(model))
         for table_name, model in TABLES_MAP.items():
-            save_dataframe_to_table(session, data.get(table_name), model)
+            if replace or table_name in data:
+                save_dataframe_to_table(session, data.get(table_name), model)
+        if skill_index is not None:
+            add_skill_index(session, skill_index)
+        if version is not None:
+            add_data_version(session, version)
 
         session.commit()
         logging.info("All clean data saved successfully to the database")
@@ -90,3 +113,65 @@ def save_data(data: dict[str, pd.DataFrame]):
         raise
 
     session.close()
+
+
+def add_skill_index(session: Session, index) -> None:
+    """Replace the skill_postings rows with the posting lists of index (within session's transaction)."""
+    session.execute(delete(SkillPosting))
+    session.bulk_insert_mappings(SkillPosting, index.to_records())
+
+
+def add_data_version(session: Session, version: str) -> None:
+    """Add a DataVersion row for version (within session's transaction)."""
+    session.add(DataVersion(version=version, created_at=pd.Timestamp.now()))
+
+
+def save_skill_index(index, bind: Engine | None = None) -> None:
+    """
+    Replace the persisted skill index with the given one in a single transaction.
+
+    Args:
+        index: SkillIndex whose posting lists are stored in skill_postings
+        bind: Engine of the target database (the default database if None)
+
+    Raises:
+        Exception: On transaction failure (after rollback and logging)
+    """
+    session: Session = new_session(bind)
+
+    try:
+        add_skill_index(session, index)
+        session.commit()
+        logging.info("Skill index saved successfully to the database")
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error saving skill index, rolled back transaction: {e}")
+        raise
+
+    session.close()
+
+
+def save_data_version(version: str, bind: Engine | None = None) -> None:
+    """
+    Record the version of the data just persisted (e.g. the ingest checkpoint run id).
+
+    Readers of the database compare it to invalidate what they derived from
+    older data. Prefer save_data(..., version=...) when the data is written
+    too, so both are committed together.
+
+    Args:
+        version: Identifier of the persisted data
+        bind: Engine of the target database (the default database if None)
+    """
+    session: Session = new_session(bind)
+
+    try:
+        add_data_version(session, version)
+        session.commit()
+        logging.info(f"Data version {version} saved to the database")
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Error saving data version, rolled back transaction: {e}")
+        raise
+
+    session.close()
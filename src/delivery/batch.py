@@ -0,0 +1,248 @@
+import base64
+import http.client
+import json
+import time
+from typing import Iterable, Iterator, NamedTuple
+
+from delivery.outbox import Attachment, Outbox, OutboxMessage, content_hash, message_key
+from delivery.transport import (
+    SENDGRID_API_URL,
+    SENDGRID_SEND_PATH,
+    HTTPSession,
+    TransportError,
+    check_response,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SendGrid accepts at most 1000 personalizations per mail/send request
+MAX_PERSONALIZATIONS = 1000
+
+
+class Recipient(NamedTuple):
+    """One personalized message: its address and template data."""
+
+    email: str
+    dynamic_data: dict | None = None
+
+
+class BatchResult(NamedTuple):
+    """Outcome and throughput of a batch delivery."""
+
+    messages: int
+    requests: int
+    connections: int
+    seconds: float
+    messages_per_second: float
+    skipped: int = 0  # messages of batches the outbox had already sent (or another sender holds)
+
+
+class BatchDeliveryError(TransportError):
+    """
+    A batch was rejected after the earlier ones were accepted.
+
+    result counts the messages already sent; batch is the position of the
+    failed batch (0-based).
+    """
+
+    def __init__(self, error: TransportError, result: BatchResult, batch: int) -> None:
+        super().__init__(str(error), error.retryable, error.retry_after)
+        self.result = result
+        self.batch = batch
+
+
+class AttachmentEncoder:
+    """
+    Base64 + JSON encoding of attachments, computed once per distinct content.
+
+    Reports shared by many batches (or many Flows) are encoded a single time;
+    later requests splice the cached JSON fragment into their body.
+    """
+
+    def __init__(self) -> None:
+        self.cache: dict[str, bytes] = {}
+
+    def encode(self, attachment: Attachment) -> bytes:
+        key = content_hash(attachment.content)
+        fragment = self.cache.get(key)
+        if fragment is None:
+            fragment = json.dumps(
+                {"content": base64.b64encode(attachment.content).decode("ascii"), "disposition": "attachment"}
+            ).encode("utf-8")
+            self.cache[key] = fragment
+        # Name and type may differ between attachments with the same content
+        names = json.dumps({"filename": attachment.filename, "type": attachment.type})[1:-1].encode("utf-8")
+        return fragment[:-1] + b", " + names + b"}"
+
+    def encode_all(self, attachments: Iterable[Attachment]) -> bytes:
+        return b"[" + b", ".join(self.encode(attachment) for attachment in attachments) + b"]"
+
+
+def chunked(recipients: Iterable[Recipient], size: int) -> Iterator[list[Recipient]]:
+    batch = []
+    for recipient in recipients:
+        batch.append(recipient)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def batch_body(
+    sender: str, template_id: str, recipients: list[Recipient], attachments_json: bytes | None
+) -> bytes:
+    """mail/send body with one personalization per recipient and pre-encoded attachments."""
+    payload = {
+        "from": {"email": sender},
+        "template_id": template_id,
+        "personalizations": [
+            {"to": [{"email": recipient.email}], "dynamic_template_data": recipient.dynamic_data or {}}
+            for recipient in recipients
+        ],
+    }
+    head = json.dumps(payload).encode("utf-8")
+    if attachments_json is None:
+        return head
+    return head[:-1] + b', "attachments": ' + attachments_json + b"}"
+
+
+class BatchMailer:
+    """
+    High-volume SendGrid delivery of personalized template messages.
+
+    Recipients are grouped into up to MAX_PERSONALIZATIONS personalizations per
+    API request, every request goes through one keep-alive HTTPSession, and
+    attachments are encoded once per distinct content with AttachmentEncoder.
+
+    With an outbox, every batch is enqueued as one outbox message keyed by the
+    delivery key and the batch content, leased while it is posted and marked
+    sent once accepted. Sending again with the same key (e.g. after a failed
+    batch) skips the batches that already went out; a failed batch stays in
+    the outbox as pending (or failed, if the error is permanent), where the
+    OutboxSender can also deliver it.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        sender: str,
+        base_url: str = SENDGRID_API_URL,
+        batch_size: int = MAX_PERSONALIZATIONS,
+        timeout: float = 30.0,
+    ) -> None:
+        if not 1 <= batch_size <= MAX_PERSONALIZATIONS:
+            raise ValueError(f"batch_size must be between 1 and {MAX_PERSONALIZATIONS}")
+        self.api_key = api_key
+        self.sender = sender
+        self.batch_size = batch_size
+        self.session = HTTPSession(base_url, timeout)
+        self.encoder = AttachmentEncoder()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "BatchMailer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def post(self, body: bytes, headers: dict) -> None:
+        """POST one mail/send request; raises TransportError if it is not accepted."""
+        try:
+            response = self.session.post(SENDGRID_SEND_PATH, body, headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise TransportError(f"Connection error: {e}") from e
+        check_response(*response)
+
+    def send(
+        self,
+        recipients: Iterable[Recipient | str],
+        template_id: str,
+        attachments: Iterable[Attachment] = (),
+        outbox: Outbox | None = None,
+        key: str | None = None,
+    ) -> BatchResult:
+        """
+        Send one personalized message per recipient, all with the same attachments.
+
+        Args:
+            recipients: Recipients (or plain addresses) of the messages
+            template_id: SendGrid dynamic template
+            attachments: Files attached to every message
+            outbox: Outbox recording the delivery of every batch (none if None)
+            key: Delivery key, required with an outbox: batches already sent
+                 under the same key are skipped
+
+        Returns:
+            BatchResult with the number of messages, requests and throughput
+
+        Raises:
+            BatchDeliveryError: If a request fails, with the counts of the
+                                batches sent before it
+        """
+        if outbox is not None and key is None:
+            raise ValueError("A delivery key is needed to record batches in the outbox")
+        start = time.perf_counter()
+        connections = self.session.connections_opened
+        attachments = list(attachments)
+        attachments_json = self.encoder.encode_all(attachments) if attachments else None
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+        messages = requests = skipped = 0
+
+        def result() -> BatchResult:
+            seconds = time.perf_counter() - start
+            rate = messages / seconds if seconds > 0 else 0.0
+            return BatchResult(
+                messages, requests, self.session.connections_opened - connections, seconds, rate, skipped
+            )
+
+        recipients = (Recipient(r) if isinstance(r, str) else r for r in recipients)
+        for index, batch in enumerate(chunked(recipients, self.batch_size)):
+            message = None
+            if outbox is not None:
+                message = self.enqueue_batch(outbox, key, template_id, batch, attachments)
+                if message is None:
+                    skipped += len(batch)
+                    continue
+            body = batch_body(self.sender, template_id, batch, attachments_json)
+            batch_headers = headers if message is None else {**headers, "Idempotency-Key": message.idempotency_key}
+            try:
+                self.post(body, batch_headers)
+            except TransportError as e:
+                if message is not None and e.retryable:
+                    outbox.mark_retry(message.id, str(e), time.time())
+                elif message is not None:
+                    outbox.mark_failed(message.id, str(e))
+                logger.error(f"Batch {index} failed after {messages} messages were sent: {e}")
+                raise BatchDeliveryError(e, result(), index) from e
+            if message is not None:
+                outbox.mark_sent(message.id)
+            messages += len(batch)
+            requests += 1
+
+        summary = result()
+        logger.info(
+            f"Sent {messages} messages in {requests} requests ({summary.messages_per_second:.0f} messages/s)"
+            + (f", skipped {skipped} already sent" if skipped else "")
+        )
+        return summary
+
+    def enqueue_batch(
+        self, outbox: Outbox, key: str, template_id: str, batch: list[Recipient], attachments: list[Attachment]
+    ) -> OutboxMessage | None:
+        """
+        Enqueue a batch in the outbox and lease it for delivery.
+
+        Returns:
+            The leased OutboxMessage, or None if the batch was already sent,
+            failed permanently or is being delivered by another sender
+        """
+        personalizations = [(recipient.email, recipient.dynamic_data or {}) for recipient in batch]
+        receivers = [recipient.email for recipient in batch]
+        batch_key = f"{key}:{message_key(receivers, template_id, {}, attachments, personalizations)}"
+        outbox.enqueue(receivers, template_id, {}, attachments, batch_key, personalizations)
+        return outbox.claim_key(batch_key)
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+OUTBOX_PATH = "outbox.db"
+DEFAULT_LEASE_SECONDS = 300.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    content BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_messages_due ON messages (status, next_attempt_at);
+CREATE TABLE IF NOT EXISTS attachments (
+    message_id INTEGER NOT NULL REFERENCES messages (id),
+    position INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob_hash TEXT NOT NULL REFERENCES blobs (hash),
+    PRIMARY KEY (message_id, position)
+);
+"""
+
+
+class Attachment(NamedTuple):
+    """File attached to an outgoing message."""
+
+    filename: str
+    type: str
+    content: bytes
+
+
+class OutboxMessage(NamedTuple):
+    """Message claimed from the outbox for delivery."""
+
+    id: int
+    idempotency_key: str
+    receivers: list[str]
+    template_id: str
+    dynamic_data: dict
+    attachments: list[Attachment]
+    attempts: int
+    # (address, template data) of each personalized message of a batch; None for a single message
+    personalizations: list[tuple[str, dict]] | None = None
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def message_key(
+    receivers: list[str],
+    template_id: str,
+    dynamic_data: dict,
+    attachments: list[Attachment],
+    personalizations: list[tuple[str, dict]] | None = None,
+) -> str:
+    """Default idempotency key: hash of the recipients, template, data and attachments."""
+    hasher = hashlib.sha256()
+    fields = [receivers, template_id, dynamic_data]
+    if personalizations:
+        fields.append(personalizations)
+    hasher.update(json.dumps(fields, sort_keys=True).encode())
+    for attachment in attachments:
+        hasher.update(f"\x00{attachment.filename}\x00{attachment.type}\x00".encode())
+        hasher.update(content_hash(attachment.content).encode())
+    return hasher.hexdigest()
+
+
+class Outbox:
+    """
+    Persistent queue of outgoing emails in a SQLite database.
+
+    Messages move from 'pending' to 'sending' when a sender claims them and
+    to 'sent' or 'failed' once delivered or given up on. A claim is a lease:
+    messages of a sender that died mid-delivery become claimable again after
+    lease_seconds. Attachment contents are stored once per distinct content.
+    """
+
+    def __init__(self, path: str | Path = OUTBOX_PATH, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> None:
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def enqueue(
+        self,
+        receivers: list[str] | str,
+        template_id: str,
+        dynamic_data: dict,
+        attachments: list[Attachment] = (),
+        idempotency_key: str | None = None,
+        personalizations: list[tuple[str, dict]] | None = None,
+    ) -> str:
+        """
+        Add a message to the outbox.
+
+        Enqueuing a message whose idempotency key is already in the outbox is a
+        no-op, so a rerun of the pipeline never sends the same report twice.
+
+        Args:
+            receivers: Recipient address or list of addresses
+            template_id: SendGrid dynamic template
+            dynamic_data: Template data
+            attachments: Files to attach
+            idempotency_key: Delivery key (derived from the content if None)
+            personalizations: (address, template data) of every personalized
+                              message of a batch, sent instead of one message
+                              to all receivers with dynamic_data
+
+        Returns:
+            Idempotency key of the message
+        """
+        receivers = [receivers] if isinstance(receivers, str) else list(receivers)
+        attachments = [Attachment(*attachment) for attachment in attachments]
+        key = idempotency_key or message_key(receivers, template_id, dynamic_data, attachments, personalizations)
+        fields = {"receivers": receivers, "template_id": template_id, "dynamic_data": dynamic_data}
+        if personalizations:
+            fields["personalizations"] = [[email, data or {}] for email, data in personalizations]
+        payload = json.dumps(fields)
+        now = time.time()
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO messages (idempotency_key, payload, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            if cursor.rowcount:
+                message_id = cursor.lastrowid
+                for position, attachment in enumerate(attachments):
+                    blob = content_hash(attachment.content)
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO blobs (hash, content) VALUES (?, ?)",
+                        (blob, attachment.content),
+                    )
+                    self.conn.execute(
+                        "INSERT INTO attachments VALUES (?, ?, ?, ?, ?)",
+                        (message_id, position, attachment.filename, attachment.type, blob),
+                    )
+        return key
+
+    def claim(self, limit: int, now: float | None = None) -> list[OutboxMessage]:
+        """Lease up to limit due messages (pending, or sending with an expired lease)."""
+        now = time.time() if now is None else now
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            rows = self.conn.execute(
+                "SELECT id, idempotency_key, payload, attempts FROM messages "
+                "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at, id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE messages SET status = 'sending', attempts = attempts + 1, next_attempt_at = ? "
+                "WHERE id = ?",
+                [(now + self.lease_seconds, row[0]) for row in rows],
+            )
+
+        return [self._load(*row) for row in rows]
+
+    def claim_key(self, idempotency_key: str, now: float | None = None) -> OutboxMessage | None:
+        """
+        Lease one message for a caller delivering it directly (e.g. BatchMailer).
+
+        A pending message is claimed even before its retry is due; a message
+        leased by another sender (until the lease expires), sent or failed is not.
+        """
+        now = time.time() if now is None else now
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(
+                "SELECT id, idempotency_key, payload, attempts FROM messages WHERE idempotency_key = ? "
+                "AND (status = 'pending' OR (status = 'sending' AND next_attempt_at <= ?))",
+                (idempotency_key, now),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE messages SET status = 'sending', attempts = attempts + 1, next_attempt_at = ? "
+                    "WHERE id = ?",
+                    (now + self.lease_seconds, row[0]),
+                )
+        return self._load(*row) if row is not None else None
+
+    def _load(self, message_id: int, key: str, payload: str, attempts: int) -> OutboxMessage:
+        """OutboxMessage of a row just claimed (attempts is the count before the claim)."""
+        payload = json.loads(payload)
+        attachments = [
+            Attachment(*row)
+            for row in self.conn.execute(
+                "SELECT a.filename, a.type, b.content FROM attachments a "
+                "JOIN blobs b ON b.hash = a.blob_hash WHERE a.message_id = ? ORDER BY a.position",
+                (message_id,),
+            )
+        ]
+        personalizations = payload.get("personalizations")
+        return OutboxMessage(
+            message_id,
+            key,
+            payload["receivers"],
+            payload["template_id"],
+            payload["dynamic_data"],
+            attachments,
+            attempts + 1,
+            [tuple(item) for item in personalizations] if personalizations else None,
+        )
+
+    def mark_sent(self, message_id: int) -> None:
+        self.conn.execute(
+            "UPDATE messages SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+            (time.time(), message_id),
+        )
+
+    def mark_retry(self, message_id: int, error: str, retry_at: float) -> None:
+        self.conn.execute(
+            "UPDATE messages SET status = 'pending', last_error = ?, next_attempt_at = ? WHERE id = ?",
+            (error, retry_at, message_id),
+        )
+
+    def mark_failed(self, message_id: int, error: str) -> None:
+        self.conn.execute(
+            "UPDATE messages SET status = 'failed', last_error = ? WHERE id = ?", (error, message_id)
+        )
+
+    def next_due(self) -> float | None:
+        """Time of the earliest pending or leased message, or None if there is none."""
+        (due,) = self.conn.execute(
+            "SELECT MIN(next_attempt_at) FROM messages WHERE status IN ('pending', 'sending')"
+        ).fetchone()
+        return due
+
+    def counts(self) -> dict[str, int]:
+        """Number of messages by status."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM messages GROUP BY status"))
+
+    def status(self, idempotency_key: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT status FROM messages WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import random
+import time
+from typing import NamedTuple
+
+from delivery.outbox import OUTBOX_PATH, Outbox, OutboxMessage
+from delivery.transport import Transport, TransportError, sendgrid_transport
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 600.0
+
+
+class DeliveryResult(NamedTuple):
+    """Outcome of draining the outbox."""
+
+    sent: int
+    retried: int
+    failed: int
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BACKOFF_BASE_SECONDS,
+    cap: float = BACKOFF_MAX_SECONDS,
+    rng: random.Random | None = None,
+) -> float:
+    """
+    Delay before the next attempt: exponential in the attempt number, capped,
+    with "equal jitter" (between half and all of the exponential delay) so
+    failed messages do not all retry at the same instant.
+    """
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + (rng or random).uniform(0, delay / 2)
+
+
+class OutboxSender:
+    """
+    Asynchronous delivery of outbox messages through a Transport.
+
+    At most `concurrency` messages are in flight at a time. A retryable failure
+    puts the message back as pending with an exponential backoff; after
+    max_attempts, or on a permanent failure, it is marked as failed with the
+    last error so it is never silently lost.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        transport: Transport,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        backoff_max: float = BACKOFF_MAX_SECONDS,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.outbox = outbox
+        self.transport = transport
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rng = rng
+
+    async def deliver(self, message: OutboxMessage, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            try:
+                await self.transport.send(message)
+            except Exception as error:
+                e = error if isinstance(error, TransportError) else TransportError(repr(error))
+                if not e.retryable or message.attempts >= self.max_attempts:
+                    logger.error(f"Giving up on message {message.idempotency_key[:12]}: {e}")
+                    self.outbox.mark_failed(message.id, str(e))
+                    return "failed"
+                delay = backoff_delay(message.attempts, self.backoff_base, self.backoff_max, self.rng)
+                if e.retry_after is not None:
+                    delay = max(delay, e.retry_after)
+                logger.warning(
+                    f"Message {message.idempotency_key[:12]} failed (attempt {message.attempts}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                self.outbox.mark_retry(message.id, str(e), time.time() + delay)
+                return "retried"
+            self.outbox.mark_sent(message.id)
+            return "sent"
+
+    async def run_once(self) -> DeliveryResult:
+        """Deliver every message that is due now."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = []
+        while messages := self.outbox.claim(self.concurrency * 4):
+            outcomes += await asyncio.gather(*(self.deliver(message, semaphore) for message in messages))
+        return DeliveryResult(outcomes.count("sent"), outcomes.count("retried"), outcomes.count("failed"))
+
+    async def drain(self, timeout: float | None = None) -> DeliveryResult:
+        """
+        Deliver until no pending message is left, waiting for retries to become due.
+
+        Args:
+            timeout: Maximum seconds to keep waiting for retries (no limit if None)
+
+        Returns:
+            DeliveryResult with the totals over every round
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sent = retried = failed = 0
+        while True:
+            result = await self.run_once()
+            sent, retried, failed = sent + result.sent, retried + result.retried, failed + result.failed
+            due = self.outbox.next_due()
+            if due is None:
+                break
+            wait = max(0.0, due - time.time())
+            if deadline is not None and time.monotonic() + wait > deadline:
+                break
+            await asyncio.sleep(wait)
+        logger.info(f"Outbox drained: {sent} sent, {retried} retries, {failed} failed")
+        return DeliveryResult(sent, retried, failed)
+
+
+def send_outbox(
+    outbox: Outbox, transport: Transport | None = None, timeout: float | None = None, **options
+) -> DeliveryResult:
+    """
+    Blocking entry point: drain the outbox with an OutboxSender.
+
+    Args:
+        outbox: Outbox to deliver
+        transport: Delivery transport (SendGrid from the settings if None)
+        timeout: Maximum seconds to keep waiting for retries (no limit if None)
+        **options: Extra OutboxSender options (concurrency, max_attempts, ...)
+    """
+    transport = transport if transport is not None else sendgrid_transport()
+    return asyncio.run(OutboxSender(outbox, transport, **options).drain(timeout))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+    send_outbox(Outbox(OUTBOX_PATH))
@@ -0,0 +1,177 @@
+import asyncio
+import base64
+import http.client
+import json
+import queue
+from typing import Protocol
+from urllib.parse import urlsplit
+
+from delivery.outbox import OutboxMessage
+
+SENDGRID_API_URL = "https://api.sendgrid.com"
+SENDGRID_SEND_PATH = "/v3/mail/send"
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TransportError(Exception):
+    """Delivery failure; retryable errors are attempted again after a backoff."""
+
+    def __init__(self, message: str, retryable: bool = True, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class Transport(Protocol):
+    """Delivers one outbox message; raises TransportError on failure."""
+
+    async def send(self, message: OutboxMessage) -> None: ...
+
+
+def sendgrid_payload(message: OutboxMessage, sender: str) -> dict:
+    """SendGrid v3 mail/send body of an outbox message."""
+    if message.personalizations:
+        personalizations = [
+            {"to": [{"email": email}], "dynamic_template_data": data} for email, data in message.personalizations
+        ]
+    else:
+        personalizations = [
+            {
+                "to": [{"email": receiver} for receiver in message.receivers],
+                "dynamic_template_data": message.dynamic_data,
+            }
+        ]
+    payload = {
+        "from": {"email": sender},
+        "template_id": message.template_id,
+        "personalizations": personalizations,
+        "custom_args": {"idempotency_key": message.idempotency_key},
+    }
+    if message.attachments:
+        payload["attachments"] = [
+            {
+                "content": base64.b64encode(attachment.content).decode("ascii"),
+                "filename": attachment.filename,
+                "type": attachment.type,
+                "disposition": "attachment",
+            }
+            for attachment in message.attachments
+        ]
+    return payload
+
+
+class HTTPSession:
+    """
+    Persistent HTTP(S) connection to one host, reused across requests.
+
+    Avoids a TCP and TLS handshake per request. A request that fails because
+    the server closed an idle keep-alive connection is sent once more on a
+    fresh connection. Not thread-safe: use one session per thread.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0) -> None:
+        parts = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.netloc = parts.netloc
+        self.timeout = timeout
+        self.connection = None
+        self.connections_opened = 0
+
+    def post(self, path: str, body: bytes, headers: dict) -> tuple[int, dict, bytes]:
+        """Blocking POST; returns (status, headers, body)."""
+        for attempt in range(2):
+            reused = self.connection is not None
+            if not reused:
+                self.connection = self.connection_class(self.netloc, timeout=self.timeout)
+                self.connections_opened += 1
+            try:
+                self.connection.request("POST", path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if not reused or attempt:
+                    raise
+                continue
+            except Exception:
+                self.close()
+                raise
+            if response.will_close:
+                self.close()
+            return response.status, dict(response.getheaders()), data
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def check_response(status: int, headers: dict, body: bytes) -> None:
+    """Raise TransportError for a non-2xx response."""
+    if 200 <= status < 300:
+        return
+    retry_after = headers.get("Retry-After")
+    raise TransportError(
+        f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}",
+        retryable=status in RETRYABLE_STATUS,
+        retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+    )
+
+
+class SendGridTransport:
+    """
+    Transport for the SendGrid v3 Web API.
+
+    The blocking HTTP call runs in a worker thread so the event loop keeps
+    serving other deliveries; each call borrows a keep-alive HTTPSession from
+    a pool, so concurrent deliveries reuse at most `concurrency` connections.
+    base_url points at a local stub server in tests.
+    """
+
+    def __init__(
+        self, api_key: str, sender: str, base_url: str = SENDGRID_API_URL, timeout: float = 30.0
+    ) -> None:
+        self.api_key = api_key
+        self.sender = sender
+        self.base_url = base_url
+        self.timeout = timeout
+        self.sessions = queue.SimpleQueue()
+
+    def headers(self, idempotency_key: str) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Idempotency-Key": idempotency_key,
+        }
+
+    def post(self, body: bytes, headers: dict) -> tuple[int, dict, bytes]:
+        try:
+            session = self.sessions.get_nowait()
+        except queue.Empty:
+            session = HTTPSession(self.base_url, self.timeout)
+        try:
+            return session.post(SENDGRID_SEND_PATH, body, headers)
+        finally:
+            self.sessions.put(session)
+
+    def close(self) -> None:
+        while not self.sessions.empty():
+            self.sessions.get_nowait().close()
+
+    async def send(self, message: OutboxMessage) -> None:
+        body = json.dumps(sendgrid_payload(message, self.sender)).encode("utf-8")
+        try:
+            response = await asyncio.to_thread(self.post, body, self.headers(message.idempotency_key))
+        except (OSError, http.client.HTTPException) as e:
+            raise TransportError(f"Connection error: {e}") from e
+        check_response(*response)
+
+
+def sendgrid_transport() -> SendGridTransport:
+    """SendGridTransport configured from the application settings."""
+    from config import get_settings
+
+    settings = get_settings()
+    return SendGridTransport(settings.SENDGRID_API_KEY, settings.EMAIL_SENDER)
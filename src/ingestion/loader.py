@@ -1,6 +1,9 @@
+import io
 import pandas as pd
 import logging
 from pathlib import Path
+from typing import Iterator
+from utils.instrumentation import measure
 from utils.schemas import FIELDS_FILES
 from utils.validators import complete_validations
 
@@ -25,7 +28,130 @@ def read_file(file_path: Path) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-def load_data() -> dict:
+def read_file_chunks(file_path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV file lazily in chunks of at most chunksize rows.
+
+    Read errors are logged and end the iteration instead of raising.
+
+    Args:
+        file_path: Path object pointing to the CSV file
+        chunksize: Maximum number of rows per chunk
+
+    Yields:
+        DataFrame chunks of the CSV contents
+    """
+    try:
+        with pd.read_csv(file_path, chunksize=chunksize) as reader:
+            yield from reader
+    except Exception as e:
+        logging.error(f"Error reading {file_path}: {e}")
+
+
+def read_file_tail(file_path: Path, offset: int) -> tuple[pd.DataFrame, int]:
+    """
+    Read the complete CSV rows appended to a file after a byte offset.
+
+    A trailing line without newline is left for the next read, since the
+    writer may still be appending it. The header is taken from the first line
+    of the file so the rows get the same columns as read_file.
+
+    Args:
+        file_path: Path object pointing to the CSV file
+        offset: Byte offset up to which the file was already read (at a line
+                start); 0 reads every row
+
+    Returns:
+        Tuple (DataFrame with the appended rows, offset after the last complete row)
+    """
+    with open(file_path, "rb") as file:
+        header = file.readline()
+        offset = max(offset, len(header))
+        file.seek(offset)
+        appended = file.read()
+    end = appended.rfind(b"\n") + 1
+    if end == 0:
+        return (pd.read_csv(io.BytesIO(header)) if header.strip() else pd.DataFrame()), offset
+    return pd.read_csv(io.BytesIO(header + appended[:end])), offset + end
+
+
+def read_table_chunks(engine, table_name: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a database table lazily in chunks of at most chunksize rows.
+
+    Args:
+        engine: SQLAlchemy engine bound to the clean database
+        table_name: Name of the table to read
+        chunksize: Maximum number of rows per chunk
+
+    Yields:
+        DataFrame chunks of the table rows
+    """
+    yield from pd.read_sql_table(table_name, engine, chunksize=chunksize)
+
+
+def load_data_chunks(engine, chunksize: int = 50_000) -> dict[str, Iterator[pd.DataFrame]]:
+    """
+    Open chunked readers over the validated tables persisted in the database.
+
+    The readers are lazy: rows are only fetched while iterating, so metrics can
+    be computed out of core with get_all_metrics_as_dict.
+
+    Args:
+        engine: SQLAlchemy engine bound to the clean database
+        chunksize: Maximum number of rows per chunk
+
+    Returns:
+        dict: Dictionary mapping table names to chunk iterators
+    """
+    return {
+        name_file: read_table_chunks(engine, name_file, chunksize)
+        for name_file in FIELDS_FILES
+    }
+
+
+def read_source(name_file: str, data_dir: Path) -> pd.DataFrame | None:
+    """
+    Read the CSV file of one table from the data directory.
+
+    Args:
+        name_file: Table name (key of FIELDS_FILES)
+        data_dir: Directory with the CSV files
+
+    Returns:
+        DataFrame with the file contents, or None if the file does not exist
+    """
+    file_path = data_dir / f"{name_file}.csv"
+    if not file_path.exists():
+        logging.warning(f"File {name_file} not found")
+        return None
+    with measure(name_file, "read") as span:
+        df_file = read_file(file_path)
+        span.rows_out = df_file.shape[0]
+    logging.info(f"File {name_file} loaded with {df_file.shape[0]} records")
+    return df_file
+
+
+def validate_table(name_file: str, df_file: pd.DataFrame, data: dict) -> pd.DataFrame:
+    """
+    Validate one loaded table.
+
+    Args:
+        name_file: Table name (key of FIELDS_FILES)
+        df_file: Raw DataFrame of the table
+        data: Already validated tables (the ones referenced by its foreign keys)
+
+    Returns:
+        Validated DataFrame
+    """
+    with measure(name_file, "validation", rows_in=len(df_file)) as span:
+        df_valid = complete_validations(df_file, name_file, {**data, name_file: df_file}, FIELDS_FILES[name_file])
+        span.rows_out = len(df_valid)
+        span.rejected = len(df_file) - len(df_valid)
+    return df_valid
+
+
+def load_data(data_dir: str | Path = "data") -> dict:
     """
     Load and validate CSV data files from the data directory. 
 
@@ -33,28 +159,21 @@ def load_data() -> dict:
     1. Load each CSV file from the data directory from FIELDS_FILES schema
     2. Apply complete validation rules to each dataframe 
     3. Store a dictionary of validated dataframes by file name
-    
+
+    Args:
+        data_dir: Directory with the CSV files
+
     Returns: 
         dict: Dictionary mapping file names to validated pandas DataFrames
     """
-    logging.info("Loading data from CSV files")
-    data_dir = Path("data")
+    logging.info(f"Loading data from CSV files in {data_dir}")
+    data_dir = Path(data_dir)
     data = {}
 
-    for name_file, fields in FIELDS_FILES.items():
+    for name_file in FIELDS_FILES:
         logging.info(f"Loading {name_file}")
-
-        file_path = data_dir / f"{name_file}.csv"
-        if file_path.exists():
-            df_file = read_file(file_path)
-            logging.info(f"File {name_file} loaded with {df_file.shape[0]} records")
-
-            data[name_file] = df_file
-            df_file_with_validations = complete_validations(
-                df_file, name_file, data, fields
-            )
-            data[name_file] = df_file_with_validations
-        else:
-            logging.warning(f"File {name_file} not found")
+        df_file = read_source(name_file, data_dir)
+        if df_file is not None:
+            data[name_file] = validate_table(name_file, df_file, data)
 
     return data
@@ -0,0 +1,132 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from utils.schemas import FIELDS_FILES
+
+POLL_INTERVAL_SECONDS = 1.0
+DEBOUNCE_SECONDS = 5.0
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def table_of(file_name: str) -> str | None:
+    """Table whose CSV file has this name (None for any other file)."""
+    stem, suffix = os.path.splitext(file_name)
+    return stem if suffix == ".csv" and stem in FIELDS_FILES else None
+
+
+def file_signature(path: Path) -> tuple[int, int] | None:
+    """Size and modification time of a file (None if missing)."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class PollingWatcher:
+    """Detects changed data files by comparing their size and mtime every interval."""
+
+    def __init__(self, data_dir: Path, interval: float = POLL_INTERVAL_SECONDS) -> None:
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.signatures = self.scan()
+
+    def scan(self) -> dict[str, tuple[int, int] | None]:
+        return {name: file_signature(self.data_dir / f"{name}.csv") for name in FIELDS_FILES}
+
+    def changes(self, timeout: float) -> set[str]:
+        """
+        Wait up to timeout seconds for data files to change.
+
+        Returns:
+            Names of the tables whose file changed (empty on timeout)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            signatures = self.scan()
+            changed = {name for name in signatures if signatures[name] != self.signatures[name]}
+            self.signatures = signatures
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detects changed data files with Linux inotify (no polling)."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(self.data_dir), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.data_dir}")
+
+    def changes(self, timeout: float) -> set[str]:
+        """
+        Wait up to timeout seconds for data files to change.
+
+        Returns:
+            Names of the tables whose file changed (empty on timeout)
+        """
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return set()
+        changed = set()
+        buffer = os.read(self.fd, 64 * 1024)
+        position = 0
+        while position < len(buffer):
+            _, _, _, length = EVENT_HEADER.unpack_from(buffer, position)
+            start = position + EVENT_HEADER.size
+            name = buffer[start:start + length].rstrip(b"\0").decode(errors="replace")
+            table = table_of(name)
+            if table is not None:
+                changed.add(table)
+            position = start + length
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def open_watcher(data_dir: Path, interval: float = POLL_INTERVAL_SECONDS, polling: bool = False):
+    """
+    Watch the data directory with inotify, falling back to polling.
+
+    Args:
+        data_dir: Directory with the CSV files
+        interval: Polling interval in seconds (polling watcher only)
+        polling: Always poll (e.g. for network file systems, where inotify
+                 does not see changes made by other hosts)
+
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(data_dir)
+        except (OSError, AttributeError) as e:
+            logging.warning(f"inotify unavailable ({e}), polling {data_dir} instead")
+    return PollingWatcher(data_dir, interval)
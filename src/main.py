@@ -1,35 +1,168 @@
+import argparse
 import logging
+from pathlib import Path
 
-from ingestion.loader import load_data
-from db.database import init_db
-from db.save import save_data
-from reporting.reports import save_metrics_csv_pdf
+from ingestion.watcher import DEBOUNCE_SECONDS, POLL_INTERVAL_SECONDS
+from pipeline.checkpoints import CheckpointStore
+from pipeline.dag import DEFAULT_WORKERS
+from pipeline.stages import (
+    DATA_DIR,
+    EXTRA_STAGES,
+    STAGES,
+    pipeline_context,
+    run_pipeline,
+    run_pipeline_dag,
+    run_stage,
+)
+from utils.instrumentation import INSTRUMENTATION_DIR, MEMORY_MODES, RECORDER
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
 )
 
-def main():
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="TalentPitch data pipeline")
+    parser.add_argument(
+        "stage",
+        nargs="?",
+        default="all",
+        choices=(*STAGES, *EXTRA_STAGES, "all", "watch"),
+        help="Stage to run; upstream stages restart from their last checkpoint (default: all). "
+        "'watch' keeps running and processes the data files as they change; "
+        "'fanout' writes one report per Flow from the metrics checkpoint",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With 'all', skip stages whose checkpoint is still current",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="With 'all', tasks run concurrently (1 runs the stages one after another); "
+        "with 'fanout', worker processes rendering the Flow reports",
+    )
+    parser.add_argument(
+        "--deliver",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Deliver the outbox after queuing the email (default: only for the 'send' stage)",
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory with the CSV files (default: data)")
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Directory for the database, checkpoints, artifacts, outbox and Flow reports "
+        "(default: the working directory)",
+    )
+    parser.add_argument("--checkpoints", default=None, help="Checkpoint directory (default: <output>/checkpoints)")
+    parser.add_argument(
+        "--flow-reports",
+        default=None,
+        help="With 'fanout', directory for flow_<id>.csv and flow_<id>.pdf (default: <output>/flow_reports)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEBOUNCE_SECONDS,
+        help="With 'watch', seconds without file changes before the reports are refreshed",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLL_INTERVAL_SECONDS,
+        help="With 'watch', polling interval in seconds when inotify is unavailable",
+    )
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="With 'watch', poll the data directory instead of using inotify",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record time, rows and memory of every stage, task and metric, and write "
+        f"{INSTRUMENTATION_DIR}/run_summary.json and a Prometheus file to the output directory",
+    )
+    parser.add_argument(
+        "--memory",
+        choices=MEMORY_MODES,
+        default="rss",
+        help="With --instrument, how peak memory is measured (tracemalloc is exact per stage but slower)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
-    Execute the complete data processing pipeline.
+    Execute the data processing pipeline, or one of its stages.
+
+    Stages (each one checkpoints its output to disk):
+    1. ingest: load and validate CSV files from the data directory
+    2. persist: initialize the database, save the validated data and the
+       inverted skill index
+    3. metrics: compute all metrics
+    4. report: generate the CSV and PDF reports, reusing the artifacts of
+       unchanged metrics from the artifact store
+    5. send: queue the reports email in the outbox (and deliver it with --deliver)
 
-    Full workflow:
-    1. Load and validate CSV files from the data directory
-    2. Compute all metrics and generate reports (CSV + PDF)
-    3. Initialize the database schema
-    4. Save validated data to the database
+    `fanout` (run on demand, not part of `all`) writes one CSV and one PDF
+    report per Flow from the metrics checkpoint, rendered by --workers processes.
 
-    Logs are written at each major step with timestamps.
+    A single stage reads its input from the last good checkpoint of the
+    upstream stage, so e.g. a failed email can be retried with `send` without
+    ingesting again. `all` runs the stages as a DAG: tables are validated as
+    soon as their references are, and persistence overlaps with metrics and
+    reporting; per-task timings and the critical path are logged at the end.
+
+    `watch` runs until interrupted: appended rows are ingested incrementally
+    into in-memory state as the data files change, and the checkpoints,
+    database and reports are refreshed once the files stop changing.
+
+    Logs are written at each major step with timestamps. With --instrument,
+    wall and CPU time, rows and peak memory of every stage, task and metric
+    are written as a JSON run summary and a Prometheus text file (also when
+    the run fails).
 
     Raises:
         Exception: Propagates exceptions from data loading, processing, or database operations
     """
-    logging.info("Starting data process")
-    data_cleaned = load_data()
-    init_db()
-    save_data(data_cleaned)
-    save_metrics_csv_pdf(data_cleaned)
+    args = parse_args(argv)
+    deliver = args.deliver if args.deliver is not None else args.stage == "send"
+    ctx = pipeline_context(args.data_dir, args.output_dir, deliver)
+    if args.checkpoints is not None:
+        ctx = ctx._replace(checkpoints=CheckpointStore(args.checkpoints))
+    if args.flow_reports is not None:
+        ctx = ctx._replace(flow_reports_dir=Path(args.flow_reports))
+
+    if args.instrument:
+        RECORDER.enable(args.memory)
+
+    logging.info(f"Starting data process ({args.stage})")
+    try:
+        if args.stage == "watch":
+            from pipeline.watch import run_watch
+
+            try:
+                run_watch(ctx, interval=args.interval, debounce=args.debounce, polling=args.polling)
+            except KeyboardInterrupt:
+                logging.info("Watch stopped")
+        elif args.stage == "all" and (args.resume or args.workers <= 1):
+            run_pipeline(ctx, resume=args.resume)
+        elif args.stage == "all":
+            run_pipeline_dag(ctx, max_workers=args.workers)
+        elif args.stage == "fanout":
+            run_stage(ctx, "fanout", processes=args.workers)
+        else:
+            run_stage(ctx, args.stage)
+    finally:
+        if args.instrument:
+            RECORDER.disable()
+            summary_path, _ = RECORDER.write(Path(args.output_dir or ".") / INSTRUMENTATION_DIR)
+            logging.info(f"Run instrumentation written to {summary_path.parent}")
     logging.info("Data process completed")
 
 
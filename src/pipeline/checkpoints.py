@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+CHECKPOINT_DIR = "checkpoints"
+MANIFEST = "manifest.json"
+
+
+class Checkpoint(NamedTuple):
+    """Completed output of one pipeline stage."""
+
+    stage: str
+    run_id: str
+    upstream: str | None
+    created_at: float
+    meta: dict
+    path: Path
+
+
+class CheckpointStore:
+    """
+    On-disk outputs of the pipeline stages, one directory per stage.
+
+    A stage writes its tables (pickled DataFrames, so dtypes round-trip exactly)
+    and blobs into a temporary directory, which is renamed into place together
+    with its manifest only once the stage succeeded. A crash mid-stage therefore
+    leaves the previous good checkpoint untouched. Replacing a checkpoint takes
+    two renames (current -> .old, new -> current); if a crash falls between
+    them, get() returns the .old checkpoint, so a stage that had a checkpoint
+    never ends up without one. Every checkpoint records the
+    run id of the checkpoint it was computed from, so stale downstream outputs
+    can be told apart from current ones.
+    """
+
+    def __init__(self, root: str | Path = CHECKPOINT_DIR) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _stage_dir(self, stage: str) -> Path:
+        return self.root / stage
+
+    def save(
+        self,
+        stage: str,
+        tables: dict[str, pd.DataFrame] | None = None,
+        blobs: dict[str, bytes] | None = None,
+        upstream: Checkpoint | None = None,
+        meta: dict | None = None,
+    ) -> Checkpoint:
+        """
+        Atomically replace the checkpoint of a stage.
+
+        Args:
+            stage: Stage name
+            tables: DataFrames to store, by name
+            blobs: Raw bytes to store, by file name
+            upstream: Checkpoint the output was computed from
+            meta: Extra JSON-serializable information
+
+        Returns:
+            The new Checkpoint
+        """
+        tmp = self.root / f".{stage}.{uuid.uuid4().hex}.tmp"
+        tmp.mkdir()
+        tables = tables or {}
+        for i, df in enumerate(tables.values()):
+            df.to_pickle(tmp / f"table_{i}.pkl")
+        for name, data in (blobs or {}).items():
+            (tmp / name).write_bytes(data)
+        manifest = {
+            "stage": stage,
+            "run_id": uuid.uuid4().hex,
+            "upstream": upstream.run_id if upstream else None,
+            "created_at": time.time(),
+            "tables": list(tables),
+            "blobs": list(blobs or {}),
+            "meta": meta or {},
+        }
+        (tmp / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=1))
+
+        target = self._stage_dir(stage)
+        old = None
+        if target.exists():
+            old = self.root / f".{stage}.{uuid.uuid4().hex}.old"
+            os.replace(target, old)
+        os.replace(tmp, target)
+        for superseded in self._old_dirs(stage):  # also the ones orphaned by an earlier crash
+            shutil.rmtree(superseded, ignore_errors=True)
+        return self.get(stage)
+
+    def _old_dirs(self, stage: str) -> list[Path]:
+        return list(self.root.glob(f".{stage}.*.old"))
+
+    def _read(self, stage: str, path: Path) -> Checkpoint | None:
+        try:
+            manifest = json.loads((path / MANIFEST).read_text())
+        except FileNotFoundError:
+            return None
+        return Checkpoint(
+            stage, manifest["run_id"], manifest["upstream"], manifest["created_at"], manifest["meta"], path
+        )
+
+    def get(self, stage: str) -> Checkpoint | None:
+        """
+        Last good checkpoint of a stage, or None.
+
+        Falls back to the newest checkpoint moved aside by a save that crashed
+        before renaming its replacement into place.
+        """
+        checkpoint = self._read(stage, self._stage_dir(stage))
+        if checkpoint is not None:
+            return checkpoint
+        previous = [checkpoint for path in self._old_dirs(stage) if (checkpoint := self._read(stage, path))]
+        return max(previous, key=lambda checkpoint: checkpoint.created_at, default=None)
+
+    def is_current(self, stage: str, upstream: Checkpoint | None) -> bool:
+        """Whether the stage has a checkpoint computed from the given upstream checkpoint."""
+        checkpoint = self.get(stage)
+        if checkpoint is None:
+            return False
+        return checkpoint.upstream == (upstream.run_id if upstream else None)
+
+    def load_tables(self, checkpoint: Checkpoint) -> dict[str, pd.DataFrame]:
+        manifest = json.loads((checkpoint.path / MANIFEST).read_text())
+        return {
+            name: pd.read_pickle(checkpoint.path / f"table_{i}.pkl")
+            for i, name in enumerate(manifest["tables"])
+        }
+
+    def load_blob(self, checkpoint: Checkpoint, name: str) -> bytes:
+        return (checkpoint.path / name).read_bytes()
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, NamedTuple, Sequence
+
+from utils.instrumentation import measure
+
+DEFAULT_WORKERS = 4
+
+
+class Task(NamedTuple):
+    """Unit of work of a DAG; func receives the results of its dependencies by name."""
+
+    name: str
+    func: Callable[[dict[str, Any]], Any]
+    deps: Sequence[str] = ()
+
+
+class TaskTiming(NamedTuple):
+    """When a task ran, in seconds since the start of the DAG."""
+
+    name: str
+    start: float
+    end: float
+    thread: str
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+class DagReport(NamedTuple):
+    """Results and timings of a DAG run."""
+
+    results: dict[str, Any]
+    timings: dict[str, TaskTiming]
+    wall_seconds: float
+    critical_path: list[str]
+    critical_seconds: float
+
+    def summary(self) -> str:
+        """Human readable table of the task timings and the critical path."""
+        lines = [f"{'Task':<28} {'Start':>8} {'Seconds':>8}  Thread"]
+        for timing in sorted(self.timings.values(), key=lambda timing: timing.start):
+            marker = "*" if timing.name in self.critical_path else " "
+            lines.append(
+                f"{marker}{timing.name:<27} {timing.start:>8.2f} {timing.seconds:>8.2f}  {timing.thread}"
+            )
+        lines.append(
+            f"Wall time {self.wall_seconds:.2f}s, critical path {self.critical_seconds:.2f}s "
+            f"({' -> '.join(self.critical_path)})"
+        )
+        return "\n".join(lines)
+
+
+def topological_order(tasks: Sequence[Task]) -> list[str]:
+    """
+    Task names in dependency order.
+
+    Raises:
+        ValueError: On duplicate names, unknown dependencies or cycles
+    """
+    by_name = {task.name: task for task in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("Duplicate task names")
+    for task in tasks:
+        unknown = set(task.deps) - set(by_name)
+        if unknown:
+            raise ValueError(f"Task '{task.name}' depends on unknown tasks {sorted(unknown)}")
+
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join([*path, name])}")
+        state[name] = "visiting"
+        for dep in by_name[name].deps:
+            visit(dep, [*path, name])
+        state[name] = "done"
+        order.append(name)
+
+    for task in tasks:
+        visit(task.name, [])
+    return order
+
+
+def critical_path(tasks: Sequence[Task], timings: dict[str, TaskTiming]) -> tuple[list[str], float]:
+    """Chain of dependent tasks with the largest total duration."""
+    by_name = {task.name: task for task in tasks}
+    best: dict[str, tuple[float, str | None]] = {}
+    for name in topological_order(tasks):
+        previous = max(by_name[name].deps, key=lambda dep: best[dep][0], default=None)
+        base = best[previous][0] if previous is not None else 0.0
+        best[name] = (base + timings[name].seconds, previous)
+
+    if not best:
+        return [], 0.0
+    name = max(best, key=lambda name: best[name][0])
+    total = best[name][0]
+    path = []
+    while name is not None:
+        path.append(name)
+        name = best[name][1]
+    return path[::-1], total
+
+
+def run_dag(tasks: Sequence[Task], max_workers: int = DEFAULT_WORKERS) -> DagReport:
+    """
+    Run tasks on a thread pool, each one as soon as all its dependencies finished.
+
+    Threads (not processes) let tasks share the in-memory DataFrames; pandas,
+    NumPy, zlib and SQLite release the GIL for most of their work. If a task
+    fails, no new task is started, running ones are waited for and the error
+    is raised.
+
+    Args:
+        tasks: Tasks of the DAG
+        max_workers: Maximum number of tasks running at the same time
+
+    Returns:
+        DagReport with every result, per-task timings and the critical path
+    """
+    topological_order(tasks)
+    by_name = {task.name: task for task in tasks}
+    waiting = {task.name: set(task.deps) for task in tasks}
+    dependents: dict[str, list[str]] = {name: [] for name in by_name}
+    for task in tasks:
+        for dep in set(task.deps):
+            dependents[dep].append(task.name)
+
+    results: dict[str, Any] = {}
+    timings: dict[str, TaskTiming] = {}
+    origin = time.perf_counter()
+
+    def execute(task: Task) -> Any:
+        start = time.perf_counter() - origin
+        with measure(task.name, "task"):
+            result = task.func({dep: results[dep] for dep in task.deps})
+        end = time.perf_counter() - origin
+        timings[task.name] = TaskTiming(task.name, start, end, threading.current_thread().name)
+        logging.info(f"Task '{task.name}' completed in {end - start:.2f}s")
+        return result
+
+    running: dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as pool:
+
+        def submit_ready(names):
+            for name in names:
+                if not waiting[name]:
+                    running[pool.submit(execute, by_name[name])] = name
+
+        submit_ready(list(by_name))
+        error = None
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                results[name] = future.result()
+                if error is None:
+                    for dependent in dependents[name]:
+                        waiting[dependent].discard(name)
+                    submit_ready(dependents[name])
+        if error is not None:
+            raise error
+
+    wall = time.perf_counter() - origin
+    path, path_seconds = critical_path(tasks, timings)
+    return DagReport(results, timings, wall, path, path_seconds)
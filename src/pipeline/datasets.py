@@ -0,0 +1,230 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+from utils.schemas import FIELDS_FILES
+
+RUNS_DIR = "runs"
+SUMMARY_FILE = "summary.json"
+LOG_FILE = "pipeline.log"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# Value column summed over the Flows of every dataset for the combined summary
+SUMMARY_TOTALS = {
+    "Total Aplicaciones": "Total Aplicaciones",
+    "Votos Totales": "Votos Totales",
+    "Compartidos": "Compartidos",
+    "Visualizaciones Totales": "Visualizaciones Totales",
+}
+
+
+class DatasetResult(NamedTuple):
+    """Outcome of the pipeline run of one dataset."""
+
+    name: str
+    data_dir: str
+    output_dir: str
+    ok: bool
+    seconds: float
+    rows: dict[str, int] = {}
+    totals: dict[str, int] = {}
+    report_key: str | None = None
+    error: str | None = None
+
+
+class BatchSummary(NamedTuple):
+    """Results of every dataset of a batch run, in dataset name order."""
+
+    results: list[DatasetResult]
+    seconds: float
+
+    @property
+    def failed(self) -> list[str]:
+        return [result.name for result in self.results if not result.ok]
+
+    def totals(self) -> dict[str, int]:
+        """Rows per table and metric totals added over the successful datasets."""
+        combined: dict[str, int] = {}
+        for result in self.results:
+            for name, value in {**result.rows, **result.totals}.items():
+                combined[name] = combined.get(name, 0) + value
+        return combined
+
+    def to_dict(self) -> dict:
+        return {
+            "seconds": round(self.seconds, 3),
+            "datasets": [result._asdict() for result in self.results],
+            "failed": self.failed,
+            "totals": self.totals(),
+        }
+
+    def table(self) -> str:
+        """Human readable table of the datasets."""
+        lines = [f"{'Dataset':<20} {'Status':<7} {'Seconds':>8} {'Rows':>10} {'Aplicaciones':>13}"]
+        for result in self.results:
+            lines.append(
+                f"{result.name:<20} {'ok' if result.ok else 'failed':<7} {result.seconds:>8.2f} "
+                f"{sum(result.rows.values()):>10} {result.totals.get('Total Aplicaciones', 0):>13}"
+            )
+        lines.append(f"{len(self.results)} datasets in {self.seconds:.2f}s, {len(self.failed)} failed")
+        return "\n".join(lines)
+
+
+def discover_datasets(root: str | Path) -> dict[str, Path]:
+    """
+    Datasets under a directory: every subdirectory with at least one table CSV.
+
+    Args:
+        root: Directory with one subdirectory per dataset (e.g. data/co, data/mx)
+
+    Returns:
+        Dictionary mapping dataset names (subdirectory names) to their directories
+    """
+    return {
+        path.name: path
+        for path in sorted(Path(root).iterdir())
+        if path.is_dir() and any((path / f"{name}.csv").exists() for name in FIELDS_FILES)
+    }
+
+
+def metric_totals(metrics: dict) -> dict[str, int]:
+    totals = {}
+    for name, column in SUMMARY_TOTALS.items():
+        if name in metrics and column in metrics[name].columns:
+            totals[name] = int(metrics[name][column].sum())
+    return totals
+
+
+def run_dataset(
+    name: str, data_dir: str | Path, output_dir: str | Path, workers: int = 1, deliver: bool = False
+) -> DatasetResult:
+    """
+    Run the whole pipeline on one dataset, writing every output under output_dir.
+
+    Runs in a worker process of run_datasets: the dataset gets its own
+    database, checkpoints, artifacts, outbox and log file, and a failure is
+    returned in the result instead of raised.
+
+    Args:
+        name: Dataset name
+        data_dir: Directory with the CSV files of the dataset
+        output_dir: Directory for every output of the dataset
+        workers: Concurrent tasks of the pipeline DAG (1 runs the stages in order)
+        deliver: Deliver the reports email
+
+    Returns:
+        DatasetResult
+    """
+    from pipeline.stages import pipeline_context, run_pipeline, run_pipeline_dag
+
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(output_dir / LOG_FILE, mode="w", encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    root_logger.setLevel(logging.INFO)
+    ctx = pipeline_context(data_dir, output_dir, deliver)
+    try:
+        if workers > 1:
+            run_pipeline_dag(ctx, max_workers=workers)
+        else:
+            run_pipeline(ctx)
+        metrics = ctx.checkpoints.get("metrics")
+        return DatasetResult(
+            name,
+            str(data_dir),
+            str(output_dir),
+            True,
+            time.perf_counter() - start,
+            rows=ctx.checkpoints.get("ingest").meta["rows"],
+            totals=metric_totals(ctx.checkpoints.load_tables(metrics)),
+            report_key=ctx.checkpoints.get("report").meta["report_key"],
+        )
+    except Exception as e:
+        logging.exception(f"Dataset {name} failed")
+        return DatasetResult(
+            name, str(data_dir), str(output_dir), False, time.perf_counter() - start, error=f"{type(e).__name__}: {e}"
+        )
+    finally:
+        ctx.outbox.close()
+        root_logger.removeHandler(handler)
+        handler.close()
+
+
+def run_datasets(
+    datasets: dict[str, Path],
+    output_root: str | Path = RUNS_DIR,
+    processes: int | None = None,
+    workers: int = 1,
+    deliver: bool = False,
+) -> BatchSummary:
+    """
+    Run the pipeline on several datasets concurrently, one process per dataset.
+
+    Worker processes are spawned (not forked), so no engine, cache or open
+    file is shared between datasets. Every dataset writes to
+    output_root/<name>/ and the combined summary to output_root/summary.json.
+
+    Args:
+        datasets: Dictionary mapping dataset names to their data directories
+        output_root: Directory for the per-dataset outputs and the summary
+        processes: Datasets processed at the same time (CPU count if None)
+        workers: Concurrent tasks within each dataset pipeline
+        deliver: Deliver the reports email of every dataset
+
+    Returns:
+        BatchSummary
+    """
+    start = time.perf_counter()
+    output_root = Path(output_root).resolve()
+    output_root.mkdir(parents=True, exist_ok=True)
+    processes = max(1, min(processes or os.cpu_count() or 1, len(datasets) or 1))
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = {
+            pool.submit(run_dataset, name, Path(data_dir).resolve(), output_root / name, workers, deliver): name
+            for name, data_dir in datasets.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            status = "completed" if result.ok else f"failed ({result.error})"
+            logging.info(f"Dataset {result.name} {status} in {result.seconds:.2f}s")
+            results.append(result)
+
+    summary = BatchSummary(sorted(results, key=lambda result: result.name), time.perf_counter() - start)
+    (output_root / SUMMARY_FILE).write_text(json.dumps(summary.to_dict(), indent=2, ensure_ascii=False))
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the pipeline on every dataset under a directory")
+    parser.add_argument("root", help="Directory with one subdirectory of CSV files per dataset")
+    parser.add_argument("--output", default=RUNS_DIR, help="Output directory (default: runs)")
+    parser.add_argument("--processes", type=int, default=None, help="Datasets processed at the same time")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent tasks within each dataset")
+    parser.add_argument("--deliver", action="store_true", help="Deliver the reports email of every dataset")
+    args = parser.parse_args(argv)
+
+    datasets = discover_datasets(args.root)
+    if not datasets:
+        logging.error(f"No datasets found under {args.root}")
+        return 1
+    summary = run_datasets(datasets, args.output, args.processes, args.workers, args.deliver)
+    print(summary.table())
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    sys.exit(main())
@@ -0,0 +1,380 @@
+import logging
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from delivery.outbox import OUTBOX_PATH, Outbox
+from pipeline.checkpoints import CHECKPOINT_DIR, Checkpoint, CheckpointStore
+from pipeline.dag import DEFAULT_WORKERS, DagReport, Task, run_dag
+from reporting.cache import ARTIFACTS_DIR, ArtifactStore
+from utils.instrumentation import measure
+from utils.schemas import FIELDS_FILES, FIELDS_FK
+
+DATA_DIR = "data"
+FLOW_REPORTS_DIR = "flow_reports"
+STAGES = ("ingest", "persist", "metrics", "report", "send")
+# Stages run on demand only, never as part of 'all'
+EXTRA_STAGES = ("fanout",)
+UPSTREAM = {
+    "ingest": None,
+    "persist": "ingest",
+    "metrics": "ingest",
+    "report": "metrics",
+    "send": "report",
+    "fanout": "metrics",
+}
+DELIVERY_TIMEOUT_SECONDS = 60.0
+
+
+class PipelineContext(NamedTuple):
+    """Locations and services shared by the pipeline stages."""
+
+    checkpoints: CheckpointStore
+    store: ArtifactStore
+    outbox: Outbox
+    data_dir: Path = Path(DATA_DIR)
+    deliver: bool = False
+    database: Path | None = None  # default database of db.database if None
+    flow_reports_dir: Path = Path(FLOW_REPORTS_DIR)
+
+
+def pipeline_context(
+    data_dir: str | Path = DATA_DIR, output_dir: str | Path | None = None, deliver: bool = False
+) -> PipelineContext:
+    """
+    Context reading one dataset and writing every output under one directory.
+
+    Args:
+        data_dir: Directory with the CSV files
+        output_dir: Directory for the database, checkpoints, artifacts, outbox
+                    and Flow reports (the current layout in the working
+                    directory if None)
+        deliver: Deliver the outbox after queuing the email
+
+    Returns:
+        PipelineContext
+    """
+    if output_dir is None:
+        return PipelineContext(
+            CheckpointStore(CHECKPOINT_DIR), ArtifactStore(ARTIFACTS_DIR), Outbox(OUTBOX_PATH), Path(data_dir), deliver
+        )
+    from db.database import DATABASE_PATH
+
+    output_dir = Path(output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return PipelineContext(
+        CheckpointStore(output_dir / CHECKPOINT_DIR),
+        ArtifactStore(output_dir / ARTIFACTS_DIR),
+        Outbox(output_dir / OUTBOX_PATH),
+        Path(data_dir),
+        deliver,
+        output_dir / DATABASE_PATH,
+        output_dir / FLOW_REPORTS_DIR,
+    )
+
+
+def database_engine(ctx: PipelineContext):
+    """SQLAlchemy engine of the database the pipeline persists to."""
+    from db.database import engine, get_engine
+
+    return get_engine(ctx.database) if ctx.database is not None else engine
+
+
+def table_rows(data: dict) -> dict[str, int]:
+    """Number of rows of every table (stored in the ingest checkpoint metadata)."""
+    return {name: len(df) for name, df in data.items()}
+
+
+def source_signature(data_dir: Path) -> dict[str, list[int] | None]:
+    """Size and modification time of every input CSV (None if missing)."""
+    signature = {}
+    for name_file in FIELDS_FILES:
+        path = data_dir / f"{name_file}.csv"
+        stat = path.stat() if path.exists() else None
+        signature[name_file] = [stat.st_size, stat.st_mtime_ns] if stat else None
+    return signature
+
+
+def upstream_checkpoint(ctx: PipelineContext, stage: str) -> Checkpoint | None:
+    """
+    Checkpoint a stage consumes: the last good one of its upstream stage, which
+    is computed (recursively) only when it does not exist yet.
+    """
+    upstream = UPSTREAM[stage]
+    if upstream is None:
+        return None
+    checkpoint = ctx.checkpoints.get(upstream)
+    if checkpoint is None:
+        logging.info(f"No checkpoint for stage '{upstream}', running it first")
+        checkpoint = STAGE_FUNCTIONS[upstream](ctx)
+    return checkpoint
+
+
+def run_ingest(ctx: PipelineContext) -> Checkpoint:
+    from ingestion.loader import load_data
+
+    data = load_data(ctx.data_dir)
+    return ctx.checkpoints.save(
+        "ingest", tables=data, meta={"sources": source_signature(ctx.data_dir), "rows": table_rows(data)}
+    )
+
+
+def run_persist(ctx: PipelineContext) -> Checkpoint:
+    from db.database import init_db
+    from db.save import save_data
+    from processing.skill_index import SkillIndex
+
+    upstream = upstream_checkpoint(ctx, "persist")
+    data = ctx.checkpoints.load_tables(upstream)
+    bind = init_db(database_engine(ctx))
+    save_data(data, bind=bind, skill_index=SkillIndex.build(data), version=upstream.run_id)
+    return ctx.checkpoints.save("persist", upstream=upstream)
+
+
+def run_metrics(ctx: PipelineContext) -> Checkpoint:
+    from processing.metrics import get_all_metrics_as_dict
+
+    upstream = upstream_checkpoint(ctx, "metrics")
+    metrics = get_all_metrics_as_dict(ctx.checkpoints.load_tables(upstream))
+    return ctx.checkpoints.save("metrics", tables=metrics, upstream=upstream)
+
+
+def run_report(ctx: PipelineContext) -> Checkpoint:
+    from reporting.reports import build_reports
+
+    upstream = upstream_checkpoint(ctx, "report")
+    key, csv_bytes, pdf_bytes = build_reports(ctx.checkpoints.load_tables(upstream), ctx.store)
+    return ctx.checkpoints.save(
+        "report",
+        blobs={"metrics.csv": csv_bytes, "metrics_report.pdf": pdf_bytes},
+        upstream=upstream,
+        meta={"report_key": key},
+    )
+
+
+def run_send(ctx: PipelineContext) -> Checkpoint:
+    from delivery.sender import send_outbox
+    from reporting.reports import enqueue_reports_email
+
+    upstream = upstream_checkpoint(ctx, "send")
+    key = enqueue_reports_email(
+        ctx.outbox,
+        ctx.checkpoints.load_blob(upstream, "metrics.csv"),
+        ctx.checkpoints.load_blob(upstream, "metrics_report.pdf"),
+        upstream.meta["report_key"],
+    )
+    if ctx.deliver:
+        send_outbox(ctx.outbox, timeout=DELIVERY_TIMEOUT_SECONDS)
+    return ctx.checkpoints.save(
+        "send", upstream=upstream, meta={"idempotency_key": key, "status": ctx.outbox.status(key)}
+    )
+
+
+def run_fanout(ctx: PipelineContext, processes: int | None = None) -> Checkpoint:
+    """
+    Write one CSV and one PDF report per Flow to ctx.flow_reports_dir.
+
+    Reads the tables of the ingest checkpoint and the metrics computed from
+    them; stale metrics (older than the ingested data) are recomputed first.
+
+    Args:
+        ctx: Pipeline context
+        processes: Worker processes rendering the reports (this process if None or 1)
+    """
+    from reporting.fanout import fan_out_flow_reports
+
+    upstream = upstream_checkpoint(ctx, "fanout")
+    ingest = ctx.checkpoints.get("ingest")
+    if upstream.upstream != ingest.run_id:
+        logging.info("Metrics checkpoint is older than the ingested data, recomputing it")
+        upstream = run_metrics(ctx)
+    summary = fan_out_flow_reports(
+        ctx.checkpoints.load_tables(ingest),
+        ctx.flow_reports_dir,
+        metrics=ctx.checkpoints.load_tables(upstream),
+        processes=processes,
+    )
+    return ctx.checkpoints.save(
+        "fanout",
+        upstream=upstream,
+        meta={"reports": summary.reports, "output_dir": str(summary.output_dir), "seconds": summary.seconds},
+    )
+
+
+STAGE_FUNCTIONS: dict[str, Callable[..., Checkpoint]] = {
+    "ingest": run_ingest,
+    "persist": run_persist,
+    "metrics": run_metrics,
+    "report": run_report,
+    "send": run_send,
+    "fanout": run_fanout,
+}
+
+
+def is_current(ctx: PipelineContext, stage: str) -> bool:
+    """
+    Whether the checkpoint of a stage is up to date: computed from the current
+    checkpoint of an upstream stage that is itself up to date (for ingest, from
+    unchanged input files) and, for the send stage, actually delivered when
+    delivery is requested.
+    """
+    upstream = UPSTREAM[stage]
+    if upstream and not is_current(ctx, upstream):
+        return False
+    parent = ctx.checkpoints.get(upstream) if upstream else None
+    if not ctx.checkpoints.is_current(stage, parent):
+        return False
+    checkpoint = ctx.checkpoints.get(stage)
+    if stage == "ingest":
+        return checkpoint.meta.get("sources") == source_signature(ctx.data_dir)
+    if stage == "send" and ctx.deliver:
+        return ctx.outbox.status(checkpoint.meta["idempotency_key"]) == "sent"
+    return True
+
+
+def run_stage(ctx: PipelineContext, stage: str, **options) -> Checkpoint:
+    """
+    Run one stage, restarting from the checkpoints of its upstream stages.
+
+    Extra keyword options are passed on to the stage function (e.g. the
+    worker processes of 'fanout').
+    """
+    start = time.perf_counter()
+    with measure(stage, "stage") as span:
+        checkpoint = STAGE_FUNCTIONS[stage](ctx, **options)
+        if "rows" in checkpoint.meta:
+            span.rows_out = sum(checkpoint.meta["rows"].values())
+    logging.info(f"Stage '{stage}' completed in {time.perf_counter() - start:.2f}s")
+    return checkpoint
+
+
+def run_pipeline(ctx: PipelineContext, resume: bool = False) -> dict[str, Checkpoint]:
+    """
+    Run every stage in order.
+
+    Args:
+        ctx: Pipeline context
+        resume: Skip the stages whose checkpoint is still current, so a rerun
+            after a late failure restarts at the failed stage
+
+    Returns:
+        Dictionary mapping stage names to their checkpoints
+    """
+    checkpoints = {}
+    for stage in STAGES:
+        if resume and is_current(ctx, stage):
+            logging.info(f"Stage '{stage}' is up to date, skipping")
+            checkpoints[stage] = ctx.checkpoints.get(stage)
+        else:
+            checkpoints[stage] = run_stage(ctx, stage)
+    return checkpoints
+
+
+def pipeline_tasks(ctx: PipelineContext) -> list[Task]:
+    """
+    The full pipeline as a DAG of fine-grained tasks.
+
+    - read:<table> reads every CSV independently; validate:<table> starts as
+      soon as its file and the tables its foreign keys reference are validated
+    - persist (database and skill index) runs alongside metrics and reporting,
+      which only read the in-memory tables
+    - the CSV and the PDF (with its charts) are rendered concurrently
+    Every stage still writes the same checkpoints as run_stage.
+    """
+    from db.database import init_db
+    from db.save import save_data
+    from ingestion.loader import read_source, validate_table
+    from processing.metrics import get_all_metrics_as_dict
+    from processing.skill_index import SkillIndex
+    from reporting.reports import ReportBuild
+
+    tables = list(FIELDS_FILES)
+    validated = [f"validate:{name}" for name in tables]
+
+    def read(name):
+        return lambda inputs: read_source(name, ctx.data_dir)
+
+    def validate(name):
+        def run(inputs):
+            df_file = inputs[f"read:{name}"]
+            if df_file is None:
+                return None
+            refs = {ref: inputs[f"validate:{ref}"] for ref in FIELDS_FK.get(name, {}).values()}
+            return validate_table(name, df_file, {ref: df for ref, df in refs.items() if df is not None})
+
+        return run
+
+    def data_of(inputs):
+        return {name: inputs[f"validate:{name}"] for name in tables if inputs[f"validate:{name}"] is not None}
+
+    def ingest(inputs):
+        data = data_of(inputs)
+        return ctx.checkpoints.save(
+            "ingest", tables=data, meta={"sources": source_signature(ctx.data_dir), "rows": table_rows(data)}
+        )
+
+    def persist(inputs):
+        data = data_of(inputs)
+        bind = init_db(database_engine(ctx))
+        save_data(data, bind=bind, skill_index=SkillIndex.build(data), version=inputs["ingest"].run_id)
+        return ctx.checkpoints.save("persist", upstream=inputs["ingest"])
+
+    def metrics(inputs):
+        return ReportBuild(get_all_metrics_as_dict(data_of(inputs)), ctx.store)
+
+    def metrics_checkpoint(inputs):
+        return ctx.checkpoints.save("metrics", tables=inputs["metrics"].metrics, upstream=inputs["ingest"])
+
+    def report_csv(inputs):
+        return inputs["metrics"].csv()
+
+    def report_pdf(inputs):
+        return inputs["metrics"].pdf()
+
+    def report(inputs):
+        key, csv_bytes, pdf_bytes = inputs["metrics"].finish(inputs["report:csv"], inputs["report:pdf"])
+        return ctx.checkpoints.save(
+            "report",
+            blobs={"metrics.csv": csv_bytes, "metrics_report.pdf": pdf_bytes},
+            upstream=inputs["metrics:checkpoint"],
+            meta={"report_key": key},
+        )
+
+    def send(inputs):
+        return run_send(ctx)
+
+    return [
+        *(Task(f"read:{name}", read(name)) for name in tables),
+        *(
+            Task(
+                f"validate:{name}",
+                validate(name),
+                (f"read:{name}", *(f"validate:{ref}" for ref in FIELDS_FK.get(name, {}).values())),
+            )
+            for name in tables
+        ),
+        Task("ingest", ingest, validated),
+        Task("persist", persist, (*validated, "ingest")),
+        Task("metrics", metrics, validated),
+        Task("metrics:checkpoint", metrics_checkpoint, ("metrics", "ingest")),
+        Task("report:csv", report_csv, ("metrics",)),
+        Task("report:pdf", report_pdf, ("metrics",)),
+        Task("report", report, ("metrics", "report:csv", "report:pdf", "metrics:checkpoint")),
+        Task("send", send, ("report",)),
+    ]
+
+
+def run_pipeline_dag(ctx: PipelineContext, max_workers: int = DEFAULT_WORKERS) -> DagReport:
+    """
+    Run the whole pipeline with independent tasks executing concurrently.
+
+    Args:
+        ctx: Pipeline context
+        max_workers: Maximum number of tasks running at the same time
+
+    Returns:
+        DagReport with the per-task timings and the critical path
+    """
+    report = run_dag(pipeline_tasks(ctx), max_workers)
+    logging.info("Pipeline timings:\n" + report.summary())
+    return report
@@ -0,0 +1,333 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from ingestion.loader import read_file_tail, validate_table
+from ingestion.watcher import DEBOUNCE_SECONDS, POLL_INTERVAL_SECONDS, file_signature, open_watcher
+from pipeline.checkpoints import Checkpoint
+from pipeline.stages import PipelineContext, database_engine, run_send, table_rows
+from processing.aggregates import build_metric_aggregates, finalize_aggregates, update_aggregates
+from processing.skills import SkillDictionary
+from utils.instrumentation import instrument
+from utils.schemas import FIELDS_FILES, FIELDS_FK
+
+MAX_DELAY_SECONDS = 60.0
+SETTLE_SECONDS = 0.2
+TAIL_CHECK_BYTES = 4096
+INDEX_TABLES = {"users", "resumes", "resumes_exhibited", "profiles"}
+
+
+class SourceFile:
+    """Raw rows of one CSV file and how far it was read."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.raw = pd.DataFrame()
+        self.offset = 0
+        self.signature: tuple[int, int] | None = None
+        self.tail = b""
+        # Key indexes of the raw rows, to tell plain appends from updates
+        self.ids: set = set()
+        self.emails: set = set()
+
+    def is_append(self, signature: tuple[int, int]) -> bool:
+        """Whether the file only grew since the last read (the bytes before the offset are unchanged)."""
+        if self.offset == 0 or signature[0] < self.offset:
+            return False
+        with open(self.path, "rb") as file:
+            file.seek(self.offset - len(self.tail))
+            return file.read(len(self.tail)) == self.tail
+
+    def read(self, signature: tuple[int, int]) -> tuple[str, pd.DataFrame]:
+        """
+        Read the new rows of the file.
+
+        Returns:
+            Tuple (kind, rows): ("append", appended rows) when the file only
+            grew with rows of new ids and emails, otherwise ("reload", rows
+            read) and the whole file has to be validated again
+        """
+        kind = "append" if self.is_append(signature) else "reload"
+        rows, offset = read_file_tail(self.path, self.offset if kind == "append" else 0)
+        if kind == "reload":
+            self.raw, self.ids, self.emails = rows, set(), set()
+        elif not rows.empty:
+            if self.collides(rows):
+                kind = "reload"
+            self.raw = pd.concat([self.raw, rows], ignore_index=True)
+        self.add_keys(rows)
+        with open(self.path, "rb") as file:
+            file.seek(max(offset - TAIL_CHECK_BYTES, 0))
+            self.tail = file.read(offset - file.tell())
+        self.offset, self.signature = offset, signature
+        return kind, rows
+
+    def add_keys(self, rows: pd.DataFrame) -> None:
+        for column, keys in (("id", self.ids), ("email", self.emails)):
+            if column in rows.columns:
+                keys.update(rows[column].dropna())
+
+    def collides(self, rows: pd.DataFrame) -> bool:
+        """Whether rows repeat an id or email already read (an update, not an append)."""
+        for column, keys in (("id", self.ids), ("email", self.emails)):
+            if column in rows.columns and any(value in keys for value in rows[column].dropna()):
+                return True
+        return False
+
+
+class BatchResult(NamedTuple):
+    """What one batch of file changes updated."""
+
+    appended: dict[str, int]
+    reloaded: list[str]
+    metrics: list[str]
+    seconds: float
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.reloaded or any(self.appended.values()))
+
+
+class WarmState:
+    """
+    Validated tables, per-metric partial aggregates and the skill dictionary,
+    kept in memory between batches of file changes.
+
+    Data files are expected to grow by appending rows, or to be replaced as a
+    whole. Appended rows are validated on their own (against the warm key
+    indexes and referenced tables) and folded into the aggregates of the
+    metrics that read their table; a rewritten file, or appended rows that
+    update an existing id or email, revalidate that table and its dependent
+    tables from memory and rebuild only the aggregates that read them.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+        self.sources = {name: SourceFile(self.data_dir / f"{name}.csv") for name in FIELDS_FILES}
+        self.data: dict[str, pd.DataFrame] = {}
+        self.aggregates = build_metric_aggregates()
+        self.metrics: dict[str, pd.DataFrame] = {}
+        self.skill_dictionary = SkillDictionary()
+        # Changes not yet persisted to the database
+        self.replace_db = True
+        self.new_rows: dict[str, list[pd.DataFrame]] = {}
+        self.index_dirty = True
+
+    def load(self) -> BatchResult:
+        """Read and validate every data file and compute every metric."""
+        return self.apply(set(FIELDS_FILES))
+
+    def revalidate(self, name: str) -> None:
+        self.data[name] = validate_table(name, self.sources[name].raw, self.data)
+
+    @instrument("apply", kind="watch")
+    def apply(self, tables: set[str]) -> BatchResult:
+        """
+        Ingest the changes of some data files and refresh the affected metrics.
+
+        Args:
+            tables: Names of the tables whose file changed
+
+        Returns:
+            BatchResult with the appended rows per table, the revalidated
+            tables and the refreshed metrics
+        """
+        start = time.perf_counter()
+        appended: dict[str, pd.DataFrame] = {}
+        reloaded: list[str] = []
+        grown: set[str] = set()
+
+        for name in FIELDS_FILES:  # referenced tables first, as in load_data
+            source = self.sources[name]
+            had_rejects = name in self.data and len(self.data[name]) < len(source.raw)
+            kind, rows = None, None
+            if name in tables:
+                signature = file_signature(source.path)
+                if signature is None:
+                    logging.warning(f"File {name} not found, keeping its last contents")
+                elif signature != source.signature:
+                    kind, rows = source.read(signature)
+
+            # Rows rejected for a missing reference may be valid once the referenced table grows
+            refs = set(FIELDS_FK.get(name, {}).values())
+            if kind == "reload" or (name in self.data and (refs & set(reloaded) or (refs & grown and had_rejects))):
+                self.revalidate(name)
+                reloaded.append(name)
+            elif kind == "append" and not rows.empty:
+                new_rows = validate_table(name, rows, self.data)
+                self.data[name] = pd.concat([self.data[name], new_rows], ignore_index=True)
+                appended[name] = new_rows
+                if not new_rows.empty:
+                    grown.add(name)
+
+        metrics = self.refresh_metrics(appended, set(reloaded))
+        if reloaded:
+            self.replace_db = True
+        for name, rows in appended.items():
+            self.new_rows.setdefault(name, []).append(rows)
+        if (set(reloaded) | set(appended)) & INDEX_TABLES:
+            self.index_dirty = True
+        return BatchResult(
+            {name: len(rows) for name, rows in appended.items()},
+            reloaded,
+            metrics,
+            time.perf_counter() - start,
+        )
+
+    def refresh_metrics(self, appended: dict[str, pd.DataFrame], reloaded: set[str]) -> list[str]:
+        """Fold appended rows into the warm aggregates and rebuild the ones reading reloaded tables."""
+        dirty = []
+        fresh = None
+        for name, aggregate in self.aggregates.items():
+            tables = set(aggregate.tables)
+            if tables & reloaded:
+                fresh = fresh or build_metric_aggregates()
+                update_aggregates(
+                    {name: fresh[name]}, {table: self.data[table] for table in tables if table in self.data}
+                )
+                self.aggregates[name] = fresh[name]
+                dirty.append(name)
+            elif tables & set(appended):
+                for table in tables & set(appended):
+                    aggregate.update(table, appended[table])
+                dirty.append(name)
+        if dirty or not self.metrics:
+            self.metrics = finalize_aggregates(self.aggregates, self.metrics or None, set(dirty))
+        return dirty
+
+    def source_signature(self) -> dict[str, list[int] | None]:
+        """Signature of the file contents held in memory (same format as stages.source_signature)."""
+        return {
+            name: list(source.signature) if source.signature else None
+            for name, source in self.sources.items()
+        }
+
+    def persist(self, version: str, bind=None) -> None:
+        """Write the pending changes, the refreshed skill index and the data version in one transaction."""
+        from db.database import init_db
+        from db.save import save_data
+        from processing.skill_index import SkillIndex
+
+        bind = init_db(bind)
+        if self.replace_db:
+            data = self.data
+        else:
+            data = {name: pd.concat(rows, ignore_index=True) for name, rows in self.new_rows.items()}
+        index = None
+        if self.index_dirty and "resumes" in self.data and "resumes_exhibited" in self.data:
+            index = SkillIndex.build(self.data, self.skill_dictionary)
+        save_data(data, replace=self.replace_db, bind=bind, skill_index=index, version=version)
+        self.replace_db, self.new_rows, self.index_dirty = False, {}, False
+
+
+@instrument("flush", kind="watch")
+def flush(ctx: PipelineContext, state: WarmState, persist: bool = True) -> Checkpoint:
+    """
+    Checkpoint the warm state and regenerate the reports, as the pipeline stages would.
+
+    Args:
+        ctx: Pipeline context
+        state: Warm state to checkpoint
+        persist: Also write the changes to the database
+
+    Returns:
+        Checkpoint of the report stage
+    """
+    from reporting.reports import build_reports
+
+    start = time.perf_counter()
+    ingest = ctx.checkpoints.save(
+        "ingest", tables=state.data, meta={"sources": state.source_signature(), "rows": table_rows(state.data)}
+    )
+    if persist:
+        state.persist(ingest.run_id, database_engine(ctx))
+        ctx.checkpoints.save("persist", upstream=ingest)
+    metrics = ctx.checkpoints.save("metrics", tables=state.metrics, upstream=ingest)
+    key, csv_bytes, pdf_bytes = build_reports(state.metrics, ctx.store)
+    report = ctx.checkpoints.save(
+        "report",
+        blobs={"metrics.csv": csv_bytes, "metrics_report.pdf": pdf_bytes},
+        upstream=metrics,
+        meta={"report_key": key},
+    )
+    if ctx.deliver:
+        run_send(ctx)
+    logging.info(f"Reports refreshed ({key[:12]}) in {time.perf_counter() - start:.2f}s")
+    return report
+
+
+def run_watch(
+    ctx: PipelineContext,
+    interval: float = POLL_INTERVAL_SECONDS,
+    debounce: float = DEBOUNCE_SECONDS,
+    max_delay: float = MAX_DELAY_SECONDS,
+    polling: bool = False,
+    persist: bool = True,
+    stop: threading.Event | None = None,
+) -> WarmState:
+    """
+    Process the data files as they land until stopped.
+
+    Every batch of changed files is ingested right away into the warm state;
+    the checkpoints, database and reports are refreshed once no file changed
+    for debounce seconds (or max_delay seconds after the first pending change,
+    so a steady stream of files still produces reports).
+
+    Args:
+        ctx: Pipeline context (ctx.deliver also queues and sends the email)
+        interval: Polling interval in seconds when inotify is unavailable
+        debounce: Quiet period before the reports are refreshed
+        max_delay: Longest time a change waits for its report
+        polling: Poll the directory even if inotify is available
+        persist: Write the changes to the database
+        stop: Event that ends the loop (runs until interrupted if None)
+
+    Returns:
+        The warm state when stopped
+    """
+    stop = stop or threading.Event()
+    state = WarmState(ctx.data_dir)
+    watcher = open_watcher(ctx.data_dir, interval, polling)
+    try:
+        result = state.load()
+        logging.info(f"Loaded {sum(len(df) for df in state.data.values())} rows in {result.seconds:.2f}s")
+        flush(ctx, state, persist)
+        first_change = last_change = None
+        while not stop.is_set():
+            now = time.monotonic()
+            timeout = interval if last_change is None else max(
+                min(last_change + debounce, first_change + max_delay) - now, 0
+            )
+            changed = watcher.changes(min(timeout, interval))
+            while changed and not stop.is_set():
+                more = watcher.changes(SETTLE_SECONDS)
+                if not more:
+                    break
+                changed |= more
+            if changed:
+                try:
+                    result = state.apply(changed)
+                except Exception as e:
+                    logging.error(f"Error ingesting {sorted(changed)}, reloading every file: {e}")
+                    state = WarmState(ctx.data_dir)
+                    result = state.load()
+                if result.changed:
+                    logging.info(
+                        f"Ingested {result.appended} appended rows, reloaded {result.reloaded}, "
+                        f"refreshed {len(result.metrics)} metrics in {result.seconds:.2f}s"
+                    )
+                    last_change = time.monotonic()
+                    first_change = first_change or last_change
+            now = time.monotonic()
+            if last_change is not None and (
+                now - last_change >= debounce or now - first_change >= max_delay
+            ):
+                flush(ctx, state, persist)
+                first_change = last_change = None
+    finally:
+        watcher.close()
+    return state
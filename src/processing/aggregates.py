@@ -0,0 +1,502 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from processing.cohorts import build_cohorts, retention_rates
+from processing.funnel import build_funnel
+from processing.keys import PAIR_KEY_SPAN, key_flows, pair_keys, resume_owners
+from processing.metrics import calculate_conversion_rate, group_by_age
+from processing.rankings import flow_rankings
+from processing.skills import SkillDictionary, rank_skill_counts
+from processing.timeseries import PERIOD_COLUMNS, day_to_period, period_labels, to_day_codes
+
+
+def combine_totals(left: pd.Series | None, right: pd.Series | None) -> pd.Series | None:
+    """Add two per-key totals Series, keeping the integer dtype of counts."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return pd.concat([left, right]).groupby(level=0).sum()
+
+
+def union_keys(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Union of two sorted unique key arrays."""
+    return np.union1d(left, right)
+
+
+def empty_keys() -> np.ndarray:
+    return np.empty(0, dtype=np.int64)
+
+
+class PartialAggregate:
+    """
+    Mergeable partial state of one metric.
+
+    Protocol: the constructor creates the initial (empty) state, update() folds a
+    chunk of one of the input tables into it, merge() combines two partial states
+    (e.g. computed on different partitions) and finalize() produces the same
+    DataFrame as the eager metric. The state only grows with the number of
+    distinct keys (flows, users, skills, periods), never with the number of rows.
+    """
+
+    tables: tuple[str, ...] = ()
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: "PartialAggregate") -> "PartialAggregate":
+        raise NotImplementedError
+
+    def finalize(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class GroupTotal(PartialAggregate):
+    """Count or sum of a column per key (e.g. applications or votes per Flow)."""
+
+    def __init__(
+        self, table: str, key: str, column: str, how: str, columns: tuple[str, str]
+    ) -> None:
+        self.tables = (table,)
+        self.key = key
+        self.column = column
+        self.how = how
+        self.columns = columns
+        self.totals: pd.Series | None = None
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        grouped = chunk.groupby(self.key)[self.column]
+        totals = grouped.count() if self.how == "count" else grouped.sum()
+        self.totals = combine_totals(self.totals, totals)
+
+    def merge(self, other: "GroupTotal") -> "GroupTotal":
+        self.totals = combine_totals(self.totals, other.totals)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        if self.totals is None:
+            return pd.DataFrame(columns=list(self.columns))
+        result = self.totals.sort_index().reset_index()
+        result.columns = list(self.columns)
+        return result
+
+
+class DistinctPerFlow(PartialAggregate):
+    """Distinct users per Flow, kept as sorted unique (flow, user) keys."""
+
+    def __init__(self, table: str, columns: tuple[str, str]) -> None:
+        self.tables = (table,)
+        self.columns = columns
+        self.keys = empty_keys()
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        chunk = chunk.dropna(subset=["model_id", "user_id"])
+        self.keys = union_keys(
+            self.keys, pair_keys(chunk["model_id"].to_numpy(), chunk["user_id"].to_numpy())
+        )
+
+    def merge(self, other: "DistinctPerFlow") -> "DistinctPerFlow":
+        self.keys = union_keys(self.keys, other.keys)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        flow_ids, counts = np.unique(key_flows(self.keys), return_counts=True)
+        return pd.DataFrame({self.columns[0]: flow_ids, self.columns[1]: counts})
+
+
+class ResumeOwners:
+    """Resume id -> owner user id pairs collected from resumes chunks."""
+
+    def __init__(self) -> None:
+        self.ids: list[np.ndarray] = []
+        self.user_ids: list[np.ndarray] = []
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.ids.append(chunk["id"].to_numpy(dtype=np.int64))
+        self.user_ids.append(chunk["user_id"].to_numpy(dtype=np.int64))
+
+    def merge(self, other: "ResumeOwners") -> None:
+        self.ids.extend(other.ids)
+        self.user_ids.extend(other.user_ids)
+
+    def owners(self, resume_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Owner user id of each resume id (see processing.keys.resume_owners)."""
+        resumes_df = pd.DataFrame(
+            {
+                "id": np.concatenate(self.ids) if self.ids else empty_keys(),
+                "user_id": np.concatenate(self.user_ids) if self.ids else empty_keys(),
+            }
+        )
+        return resume_owners(resumes_df, resume_ids)
+
+
+class ApplicationKeys:
+    """Distinct (flow, resume) keys of resumes_exhibited plus resume owners."""
+
+    def __init__(self) -> None:
+        self.keys = empty_keys()
+        self.resume_owners = ResumeOwners()
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        if table == "resumes":
+            self.resume_owners.update(chunk)
+        else:
+            self.keys = union_keys(
+                self.keys,
+                pair_keys(chunk["model_id"].to_numpy(), chunk["resume_id"].to_numpy()),
+            )
+
+    def merge(self, other: "ApplicationKeys") -> None:
+        self.keys = union_keys(self.keys, other.keys)
+        self.resume_owners.merge(other.resume_owners)
+
+    def flows(self) -> np.ndarray:
+        return key_flows(self.keys)
+
+    def user_keys(self) -> np.ndarray:
+        """Sorted unique (flow, applicant user) keys."""
+        users, found = self.resume_owners.owners(self.keys % PAIR_KEY_SPAN)
+        return pair_keys(self.flows()[found], users[found])
+
+
+class UniqueParticipants(PartialAggregate):
+    """Distinct applicant users per Flow (resume owners of resumes_exhibited)."""
+
+    tables = ("resumes", "resumes_exhibited")
+
+    def __init__(self) -> None:
+        self.applications = ApplicationKeys()
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        self.applications.update(table, chunk)
+
+    def merge(self, other: "UniqueParticipants") -> "UniqueParticipants":
+        self.applications.merge(other.applications)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        flow_ids = np.unique(self.applications.flows())
+        user_keys = self.applications.user_keys()
+        counts = np.bincount(
+            np.searchsorted(flow_ids, key_flows(user_keys)), minlength=len(flow_ids)
+        )
+        return pd.DataFrame(
+            {"ID Flow": flow_ids, "Participantes Únicos": counts.astype(np.int64)}
+        )
+
+
+class AgeHistogram(PartialAggregate):
+    """Users per age range (same bins as group_by_age)."""
+
+    tables = ("users",)
+
+    def __init__(self) -> None:
+        self.counts: pd.DataFrame | None = None
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        self.merge_counts(group_by_age(chunk))
+
+    def merge_counts(self, counts: pd.DataFrame) -> None:
+        if self.counts is None:
+            self.counts = counts
+        else:
+            self.counts = self.counts.assign(
+                Cantidad=self.counts["Cantidad"] + counts["Cantidad"]
+            )
+
+    def merge(self, other: "AgeHistogram") -> "AgeHistogram":
+        if other.counts is not None:
+            self.merge_counts(other.counts)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        if self.counts is None:
+            return group_by_age(pd.DataFrame({"birth_date": []}))
+        return self.counts
+
+
+class SkillCounter(PartialAggregate):
+    """Skill occurrences over resumes.skills indexed by an interned dictionary."""
+
+    tables = ("resumes",)
+
+    def __init__(self, top_n: int | None = None) -> None:
+        self.dictionary = SkillDictionary()
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.top_n = top_n
+
+    def add_counts(self, codes: np.ndarray, counts: np.ndarray) -> None:
+        if len(self.dictionary) > len(self.counts):
+            self.counts = np.concatenate(
+                [self.counts, np.zeros(len(self.dictionary) - len(self.counts), np.int64)]
+            )
+        np.add.at(self.counts, codes, counts)
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        encoded = self.dictionary.encode(chunk["skills"])
+        counts = encoded.counts(minlength=len(self.dictionary))
+        self.add_counts(np.arange(len(counts)), counts)
+
+    def merge(self, other: "SkillCounter") -> "SkillCounter":
+        codes = np.array(
+            [self.dictionary.intern(skill) for skill in other.dictionary.skills],
+            dtype=np.int64,
+        )
+        self.add_counts(codes, other.counts)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        return rank_skill_counts(self.counts, self.dictionary, self.top_n)
+
+
+class PeriodHistogram(PartialAggregate):
+    """Rows of an event table per period code (month, ISO week, ...)."""
+
+    def __init__(self, table: str, granularity: str, value_name: str) -> None:
+        self.tables = (table,)
+        self.granularity = granularity
+        self.value_name = value_name
+        self.totals: pd.Series | None = None
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        days, _ = to_day_codes(chunk["created_at"])
+        codes, counts = np.unique(day_to_period(days, self.granularity), return_counts=True)
+        self.totals = combine_totals(self.totals, pd.Series(counts, index=codes))
+
+    def merge(self, other: "PeriodHistogram") -> "PeriodHistogram":
+        self.totals = combine_totals(self.totals, other.totals)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        totals = (
+            self.totals.sort_index()
+            if self.totals is not None
+            else pd.Series(dtype=np.int64)
+        )
+        return pd.DataFrame(
+            {
+                PERIOD_COLUMNS[self.granularity]: period_labels(
+                    totals.index.to_numpy(dtype=np.int64), self.granularity
+                ),
+                self.value_name: totals.to_numpy(dtype=np.int64),
+            }
+        )
+
+
+class FunnelAggregate(PartialAggregate):
+    """Distinct viewer, applicant and voter keys plus share counts per Flow."""
+
+    tables = ("views", "votes", "shares", "resumes", "resumes_exhibited")
+
+    def __init__(self) -> None:
+        self.viewers = empty_keys()
+        self.voted = empty_keys()
+        self.shares: pd.Series | None = None
+        self.applications = ApplicationKeys()
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        if table in ("resumes", "resumes_exhibited"):
+            self.applications.update(table, chunk)
+        elif table == "shares":
+            self.shares = combine_totals(self.shares, chunk["model_id"].value_counts())
+        else:
+            keys = pair_keys(chunk["model_id"].to_numpy(), chunk["user_id"].to_numpy())
+            if table == "views":
+                self.viewers = union_keys(self.viewers, keys)
+            else:
+                self.voted = union_keys(self.voted, keys)
+
+    def merge(self, other: "FunnelAggregate") -> "FunnelAggregate":
+        self.viewers = union_keys(self.viewers, other.viewers)
+        self.voted = union_keys(self.voted, other.voted)
+        self.shares = combine_totals(self.shares, other.shares)
+        self.applications.merge(other.applications)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        shares = self.shares.sort_index() if self.shares is not None else pd.Series()
+        return build_funnel(
+            self.viewers,
+            self.applications.user_keys(),
+            self.voted,
+            shares.index.to_numpy(dtype=np.int64),
+            shares.to_numpy(dtype=np.int64),
+        )
+
+
+class CohortAggregate(PartialAggregate):
+    """Signup periods and distinct (user, activity period) keys for retention."""
+
+    tables = ("users", "votes", "views", "shares", "resumes", "resumes_exhibited")
+
+    def __init__(self, granularity: str = "month") -> None:
+        self.granularity = granularity
+        self.user_ids: list[np.ndarray] = []
+        self.signup_periods: list[np.ndarray] = []
+        self.activity = empty_keys()
+        self.applications = empty_keys()
+        self.resume_owners = ResumeOwners()
+
+    def update(self, table: str, chunk: pd.DataFrame) -> None:
+        if table == "resumes":
+            self.resume_owners.update(chunk)
+            return
+
+        days, valid = to_day_codes(chunk["created_at"])
+        periods = day_to_period(days, self.granularity)
+        if table == "users":
+            self.user_ids.append(chunk["id"].to_numpy(dtype=np.int64)[valid])
+            self.signup_periods.append(periods)
+        elif table == "resumes_exhibited":
+            resumes = chunk["resume_id"].to_numpy()[valid]
+            self.applications = union_keys(self.applications, pair_keys(resumes, periods))
+        else:
+            users = chunk["user_id"].to_numpy()[valid]
+            self.activity = union_keys(self.activity, pair_keys(users, periods))
+
+    def merge(self, other: "CohortAggregate") -> "CohortAggregate":
+        self.user_ids.extend(other.user_ids)
+        self.signup_periods.extend(other.signup_periods)
+        self.activity = union_keys(self.activity, other.activity)
+        self.applications = union_keys(self.applications, other.applications)
+        self.resume_owners.merge(other.resume_owners)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        owners, found = self.resume_owners.owners(self.applications // PAIR_KEY_SPAN)
+        application_periods = (self.applications % PAIR_KEY_SPAN)[found]
+        event_users = np.concatenate([self.activity // PAIR_KEY_SPAN, owners[found]])
+        event_periods = np.concatenate(
+            [self.activity % PAIR_KEY_SPAN, application_periods]
+        )
+        cohorts = build_cohorts(
+            np.concatenate(self.user_ids) if self.user_ids else empty_keys(),
+            np.concatenate(self.signup_periods) if self.user_ids else empty_keys(),
+            event_users,
+            event_periods,
+            self.granularity,
+        )
+        return retention_rates(cohorts)
+
+
+def build_metric_aggregates() -> dict[str, PartialAggregate]:
+    """
+    Create one empty partial aggregate per metric of get_all_metrics_as_dict.
+
+    'Tasa de Conversión' is derived from the finalized participants and
+    applications, so it has no aggregate of its own.
+    """
+    return {
+        "Participantes Únicos": UniqueParticipants(),
+        "Total Aplicaciones": GroupTotal(
+            "resumes_exhibited", "model_id", "id", "count", ("ID Flow", "Total Aplicaciones")
+        ),
+        "Votos Totales": GroupTotal(
+            "votes", "model_id", "value", "sum", ("ID Flow", "Votos Totales")
+        ),
+        "Compartidos": GroupTotal(
+            "shares", "model_id", "id", "count", ("ID Flow", "Compartidos")
+        ),
+        "Visualizaciones Únicas": DistinctPerFlow(
+            "views", ("ID Flow", "Visualizaciones Únicas")
+        ),
+        "Visualizaciones Totales": GroupTotal(
+            "views", "model_id", "id", "count", ("ID Flow", "Visualizaciones Totales")
+        ),
+        "Distribución por Género": GroupTotal(
+            "users", "gender", "id", "count", ("Género", "Cantidad")
+        ),
+        "Distribución por Edad": AgeHistogram(),
+        "Embudo de Conversión": FunnelAggregate(),
+        "Top Skills": SkillCounter(),
+        "Métricas por Mes": PeriodHistogram(
+            "resumes_exhibited", "month", "Total Aplicaciones"
+        ),
+        "Métricas por Semana": PeriodHistogram(
+            "resumes_exhibited", "week", "Total Aplicaciones"
+        ),
+        "Retención por Cohorte": CohortAggregate(),
+    }
+
+
+def iter_chunks(source: pd.DataFrame | Iterable[pd.DataFrame] | None):
+    """Yield the chunks of a table source (a DataFrame is a single chunk)."""
+    if source is None:
+        return
+    if isinstance(source, pd.DataFrame):
+        yield source
+    else:
+        yield from source
+
+
+def update_aggregates(
+    aggregates: dict[str, PartialAggregate],
+    sources: dict[str, pd.DataFrame | Iterable[pd.DataFrame]],
+) -> dict[str, PartialAggregate]:
+    """
+    Stream every table of sources once through the aggregates that use it.
+
+    Args:
+        aggregates: Dictionary from build_metric_aggregates
+        sources: Dictionary mapping table names to a DataFrame or an iterable of
+                 DataFrame chunks (CSV readers, database cursors, ...)
+
+    Returns:
+        The same aggregates, updated in place
+    """
+    for table, source in sources.items():
+        consumers = [agg for agg in aggregates.values() if table in agg.tables]
+        for chunk in iter_chunks(source):
+            for aggregate in consumers:
+                aggregate.update(table, chunk)
+    return aggregates
+
+
+def finalize_aggregates(
+    aggregates: dict[str, PartialAggregate],
+    cached: dict[str, pd.DataFrame] | None = None,
+    dirty: set[str] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Produce the metrics dictionary (same keys and order as get_all_metrics_as_dict).
+
+    Args:
+        aggregates: Updated (and possibly merged) partial aggregates
+        cached: Previously finalized metrics
+        dirty: Metrics updated since cached was finalized; the others are
+               taken from cached (the derived metrics are always recomputed)
+
+    Returns:
+        Dictionary mapping metric names to their respective DataFrames
+    """
+    metrics = {}
+    for name, aggregate in aggregates.items():
+        if name == "Embudo de Conversión":
+            metrics["Tasa de Conversión"] = calculate_conversion_rate(
+                metrics["Participantes Únicos"], metrics["Total Aplicaciones"]
+            )
+        if cached is not None and dirty is not None and name not in dirty and name in cached:
+            metrics[name] = cached[name]
+        else:
+            metrics[name] = aggregate.finalize()
+        if name == "Top Skills":
+            metrics["Top Flows"] = flow_rankings(metrics)
+    return metrics
+
+
+def stream_all_metrics(
+    sources: dict[str, pd.DataFrame | Iterable[pd.DataFrame]],
+) -> dict[str, pd.DataFrame]:
+    """
+    Compute all metrics over chunked inputs with bounded memory.
+
+    Args:
+        sources: Dictionary mapping table names to a DataFrame or an iterable of
+                 DataFrame chunks
+
+    Returns:
+        Dictionary mapping metric names to their respective DataFrames
+    """
+    return finalize_aggregates(update_aggregates(build_metric_aggregates(), sources))
@@ -0,0 +1,245 @@
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import instrument
+
+
+class GroupMetric(NamedTuple):
+    """
+    Backend-independent definition of a grouped metric.
+
+    how is 'count' (non-null values), 'sum' or 'nunique'. When join is set as
+    (table, left_on, right_on), column is read from the joined table through a
+    left join.
+    """
+
+    table: str
+    key: str
+    column: str
+    how: str
+    columns: tuple[str, str]
+    join: tuple[str, str, str] | None = None
+
+    def source_columns(self) -> list[str]:
+        if self.join:
+            return [self.key, self.join[1]]
+        return [self.key, self.column]
+
+    def join_columns(self) -> list[str]:
+        return [self.join[2], self.column]
+
+
+GROUP_METRICS = {
+    "Participantes Únicos": GroupMetric(
+        "resumes_exhibited",
+        "model_id",
+        "user_id",
+        "nunique",
+        ("ID Flow", "Participantes Únicos"),
+        join=("resumes", "resume_id", "id"),
+    ),
+    "Total Aplicaciones": GroupMetric(
+        "resumes_exhibited", "model_id", "id", "count", ("ID Flow", "Total Aplicaciones")
+    ),
+    "Votos Totales": GroupMetric(
+        "votes", "model_id", "value", "sum", ("ID Flow", "Votos Totales")
+    ),
+    "Compartidos": GroupMetric(
+        "shares", "model_id", "id", "count", ("ID Flow", "Compartidos")
+    ),
+    "Visualizaciones Únicas": GroupMetric(
+        "views", "model_id", "user_id", "nunique", ("ID Flow", "Visualizaciones Únicas")
+    ),
+    "Visualizaciones Totales": GroupMetric(
+        "views", "model_id", "id", "count", ("ID Flow", "Visualizaciones Totales")
+    ),
+    "Distribución por Género": GroupMetric(
+        "users", "gender", "id", "count", ("Género", "Cantidad")
+    ),
+}
+
+
+def to_pandas_result(result: pd.DataFrame, metric: GroupMetric) -> pd.DataFrame:
+    """Normalize a backend result to the pandas metric shape and dtypes."""
+    result.columns = list(metric.columns)
+    value = result[metric.columns[1]]
+    if metric.how != "sum" or pd.api.types.is_integer_dtype(value):
+        result[metric.columns[1]] = value.astype(np.int64)
+    key = result[metric.columns[0]]
+    if pd.api.types.is_object_dtype(key):
+        result[metric.columns[0]] = key.astype(str)
+    return result.reset_index(drop=True)
+
+
+class PandasBackend:
+    """Eager pandas execution (reference backend)."""
+
+    name = "pandas"
+
+    def read(self, source, columns: list[str]) -> pd.DataFrame:
+        if isinstance(source, (str, Path)):
+            return pd.read_csv(source, usecols=columns)
+        return source[columns]
+
+    def compute(self, metrics: dict[str, GroupMetric], data: dict) -> dict[str, pd.DataFrame]:
+        results = {}
+        for name, metric in metrics.items():
+            df = self.read(data[metric.table], metric.source_columns())
+            if metric.join:
+                right = self.read(data[metric.join[0]], metric.join_columns())
+                df = df.merge(
+                    right, left_on=metric.join[1], right_on=metric.join[2], how="left"
+                )
+            grouped = df.groupby(metric.key)[metric.column]
+            result = getattr(grouped, metric.how)().reset_index()
+            results[name] = to_pandas_result(result, metric)
+        return results
+
+
+class PolarsBackend:
+    """
+    Lazy, multi-threaded Polars execution.
+
+    CSV paths are scanned lazily, so only the referenced columns are read
+    (projection pushdown) and null-key filters are pushed into the scan. All
+    metric queries are optimized and collected together with collect_all, which
+    also shares common subplans between them.
+    """
+
+    name = "polars"
+
+    def __init__(self) -> None:
+        try:
+            import polars
+        except ImportError as e:
+            raise ImportError("The polars backend requires the 'polars' package") from e
+        self.pl = polars
+
+    def scan(self, source, columns: list[str]):
+        if isinstance(source, (str, Path)):
+            return self.pl.scan_csv(source).select(columns)
+        return self.pl.from_pandas(source[columns]).lazy()
+
+    def query(self, metric: GroupMetric, data: dict):
+        pl = self.pl
+        lazy = self.scan(data[metric.table], metric.source_columns())
+        if metric.join:
+            right = self.scan(data[metric.join[0]], metric.join_columns())
+            lazy = lazy.join(
+                right, left_on=metric.join[1], right_on=metric.join[2], how="left"
+            )
+
+        column = pl.col(metric.column)
+        expressions = {
+            "count": column.count(),
+            "sum": column.sum(),
+            "nunique": column.drop_nulls().n_unique(),
+        }
+        return (
+            lazy.filter(pl.col(metric.key).is_not_null())
+            .group_by(metric.key)
+            .agg(expressions[metric.how].alias(metric.columns[1]))
+            .sort(metric.key)
+        )
+
+    def compute(self, metrics: dict[str, GroupMetric], data: dict) -> dict[str, pd.DataFrame]:
+        queries = [self.query(metric, data) for metric in metrics.values()]
+        frames = self.pl.collect_all(queries)
+        return {
+            name: to_pandas_result(frame.to_pandas(), metric)
+            for (name, metric), frame in zip(metrics.items(), frames)
+        }
+
+
+class ArrowBackend:
+    """
+    pyarrow.compute execution over Arrow tables (multi-threaded kernels).
+
+    CSV paths are read with only the referenced columns.
+    """
+
+    name = "arrow"
+
+    AGGREGATIONS = {"count": "count", "sum": "sum", "nunique": "count_distinct"}
+
+    def __init__(self) -> None:
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.csv
+        except ImportError as e:
+            raise ImportError("The arrow backend requires the 'pyarrow' package") from e
+        self.pa = pyarrow
+
+    def read(self, source, columns: list[str]):
+        pa = self.pa
+        if isinstance(source, (str, Path)):
+            return pa.csv.read_csv(
+                source, convert_options=pa.csv.ConvertOptions(include_columns=columns)
+            )
+        return pa.Table.from_pandas(source[columns], preserve_index=False)
+
+    def compute(self, metrics: dict[str, GroupMetric], data: dict) -> dict[str, pd.DataFrame]:
+        pa = self.pa
+        results = {}
+        for name, metric in metrics.items():
+            table = self.read(data[metric.table], metric.source_columns())
+            if metric.join:
+                right = self.read(data[metric.join[0]], metric.join_columns())
+                table = table.join(
+                    right,
+                    keys=metric.join[1],
+                    right_keys=metric.join[2],
+                    join_type="left outer",
+                )
+            table = table.filter(pa.compute.is_valid(table[metric.key]))
+            grouped = table.group_by(metric.key).aggregate(
+                [(metric.column, self.AGGREGATIONS[metric.how])]
+            )
+            grouped = grouped.sort_by(metric.key).select(
+                [metric.key, f"{metric.column}_{self.AGGREGATIONS[metric.how]}"]
+            )
+            results[name] = to_pandas_result(grouped.to_pandas(), metric)
+        return results
+
+
+BACKENDS = {
+    "pandas": PandasBackend,
+    "polars": PolarsBackend,
+    "arrow": ArrowBackend,
+}
+
+
+def get_backend(name: str):
+    """
+    Instantiate a metrics backend by name.
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If the backend's optional dependency is not installed
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name}, expected one of {list(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+@instrument("Métricas Agrupadas", kind="metric")
+def compute_group_metrics(
+    data: dict, backend: str = "pandas", metrics: dict[str, GroupMetric] | None = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Compute the grouped metrics (GROUP_METRICS) on the selected backend.
+
+    Args:
+        data: Dictionary mapping table names to DataFrames or CSV paths
+        backend: 'pandas', 'polars' or 'arrow'
+        metrics: Metric definitions to compute (defaults to GROUP_METRICS)
+
+    Returns:
+        Dictionary mapping metric names to pandas DataFrames with the same
+        columns and dtypes as the eager metric functions
+    """
+    return get_backend(backend).compute(metrics or GROUP_METRICS, data)
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from processing.keys import lookup_sorted, resume_owners
+from processing.timeseries import PERIOD_COLUMNS, day_to_period, period_labels, to_day_codes
+from utils.instrumentation import instrument
+
+ACTIVITY_TABLES = ("votes", "views", "shares", "resumes_exhibited")
+
+
+def activity_events(
+    data: dict[str, pd.DataFrame], granularity: str = "month"
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Collect (user_id, period code) pairs of every activity table.
+
+    Applications are attributed to the resume owner through resumes.user_id.
+
+    Args:
+        data: Dictionary of DataFrames by table name
+        granularity: 'day', 'week', 'month' or 'quarter'
+
+    Returns:
+        Tuple (user_ids, periods) of int64 arrays, one entry per event
+    """
+    user_ids, periods = [], []
+    for table in ACTIVITY_TABLES:
+        df = data.get(table)
+        if df is None or df.empty:
+            continue
+        days, valid = to_day_codes(df["created_at"])
+
+        if table == "resumes_exhibited":
+            users, found = resume_owners(data["resumes"], df["resume_id"].to_numpy()[valid])
+            users, days = users[found], days[found]
+        else:
+            users = df["user_id"].to_numpy(dtype=np.int64)[valid]
+
+        user_ids.append(users)
+        periods.append(day_to_period(days, granularity))
+
+    if not user_ids:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(user_ids), np.concatenate(periods)
+
+
+@instrument("Actividad por Cohorte", kind="metric")
+def cohort_activity(
+    data: dict[str, pd.DataFrame],
+    granularity: str = "month",
+    max_periods: int | None = None,
+) -> pd.DataFrame:
+    """
+    Count active users per signup cohort and periods since signup.
+
+    Users are grouped by the period of users.created_at. A user is active in a
+    period when they have at least one vote, view, share or application in it.
+    Events are mapped to cohorts with a binary search over sorted user ids and
+    deduplicated as (user, offset) pairs with a sort, so the cost is linear in
+    the number of events (plus the sort) and no cross joins are built.
+
+    Args:
+        data: Dictionary containing 'users' and the activity tables
+        granularity: 'day', 'week', 'month' or 'quarter'
+        max_periods: Maximum offset (in periods) to report (all if None)
+
+    Returns:
+        DataFrame with columns: 'Cohorte', 'Usuarios', '<Periodo> 0', ..., '<Periodo> N'
+    """
+    users_df = data["users"]
+    signup_days, valid = to_day_codes(users_df["created_at"])
+    user_ids = users_df["id"].to_numpy(dtype=np.int64)[valid]
+    event_users, event_periods = activity_events(data, granularity)
+    return build_cohorts(
+        user_ids,
+        day_to_period(signup_days, granularity),
+        event_users,
+        event_periods,
+        granularity,
+        max_periods,
+    )
+
+
+def build_cohorts(
+    user_ids: np.ndarray,
+    signup_periods: np.ndarray,
+    event_users: np.ndarray,
+    event_periods: np.ndarray,
+    granularity: str = "month",
+    max_periods: int | None = None,
+) -> pd.DataFrame:
+    """
+    Build the cohort activity table from signup periods and activity events.
+
+    Args:
+        user_ids: Ids of the users with a known signup period
+        signup_periods: Signup period code of each user
+        event_users: User id of each activity event
+        event_periods: Period code of each activity event
+        granularity: 'day', 'week', 'month' or 'quarter'
+        max_periods: Maximum offset (in periods) to report (all if None)
+
+    Returns:
+        DataFrame with columns: 'Cohorte', 'Usuarios', '<Periodo> 0', ..., '<Periodo> N'
+    """
+    order = np.argsort(user_ids)
+    user_ids, signup_periods = user_ids[order], signup_periods[order]
+    cohort_codes, user_cohorts = np.unique(signup_periods, return_inverse=True)
+    cohort_sizes = np.bincount(user_cohorts, minlength=len(cohort_codes))
+
+    positions, known = lookup_sorted(user_ids, event_users)
+    positions, event_periods = positions[known], event_periods[known]
+
+    offsets = event_periods - signup_periods[positions]
+    in_range = offsets >= 0
+    if max_periods is not None:
+        in_range &= offsets <= max_periods
+    positions, offsets = positions[in_range], offsets[in_range]
+
+    n_offsets = (
+        max_periods + 1
+        if max_periods is not None
+        else int(offsets.max()) + 1 if offsets.size else 1
+    )
+    pairs = np.unique(positions * n_offsets + offsets)
+    pair_cohorts = user_cohorts[pairs // n_offsets]
+    active = np.bincount(
+        pair_cohorts * n_offsets + pairs % n_offsets,
+        minlength=len(cohort_codes) * n_offsets,
+    ).reshape(len(cohort_codes), n_offsets)
+
+    period_name = PERIOD_COLUMNS[granularity]
+    result = pd.DataFrame(
+        active, columns=[f"{period_name} {offset}" for offset in range(n_offsets)]
+    )
+    result.insert(0, "Usuarios", cohort_sizes)
+    result.insert(0, "Cohorte", period_labels(cohort_codes, granularity))
+    return result
+
+
+@instrument("Retención por Cohorte", kind="metric")
+def retention_rates(cohort_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert active user counts per cohort into retention percentages.
+
+    Args:
+        cohort_df: DataFrame from cohort_activity
+
+    Returns:
+        DataFrame with the same columns, period columns as % of 'Usuarios'
+    """
+    rates = cohort_df.copy()
+    period_columns = rates.columns[2:]
+    sizes = rates["Usuarios"].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = rates[period_columns].to_numpy(dtype=np.float64) / sizes[:, None] * 100
+    rates[period_columns] = np.round(np.nan_to_num(values), 2)
+    return rates
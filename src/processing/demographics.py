@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from processing.funnel import application_keys
+from processing.keys import PAIR_KEY_SPAN, lookup_sorted
+
+AGE_EDGES = (0, 18, 26, 56)
+
+DIMENSION_COLUMNS = {
+    "age": "Rango Edad",
+    "gender": "Género",
+    "country": "País",
+    "city": "Ciudad",
+}
+
+
+def exact_ages(birth_dates, reference: pd.Timestamp | None = None) -> np.ndarray:
+    """
+    Compute exact ages in completed years, vectorized.
+
+    A year is only counted once the birthday has been reached in the reference
+    year (month/day comparison), unlike a plain difference of calendar years.
+
+    Args:
+        birth_dates: Series or array of birth dates (strings or timestamps)
+        reference: Date at which ages are computed (defaults to today)
+
+    Returns:
+        float64 array of ages with NaN for missing or unparseable dates
+    """
+    reference = pd.Timestamp.now() if reference is None else pd.Timestamp(reference)
+    parsed = pd.to_datetime(pd.Series(birth_dates), errors="coerce")
+    years = parsed.dt.year.to_numpy(dtype=np.float64)
+    month_day = (parsed.dt.month * 100 + parsed.dt.day).to_numpy(dtype=np.float64)
+    before_birthday = month_day > reference.month * 100 + reference.day
+    return reference.year - years - before_birthday
+
+
+def age_labels(edges=AGE_EDGES) -> list[str]:
+    """
+    Labels of the age ranges defined by edges.
+
+    With edges (0, 18, 26, 56): '<18', '18-25', '26-55', '56+'.
+    """
+    labels = []
+    for lower, upper in zip(edges, edges[1:]):
+        labels.append(f"<{upper}" if lower == 0 else f"{lower}-{upper - 1}")
+    labels.append(f"{edges[-1]}+")
+    return labels
+
+
+def age_bins(ages: np.ndarray, edges=AGE_EDGES) -> np.ndarray:
+    """
+    Assign each age to its range with np.digitize in one pass.
+
+    Args:
+        ages: float array of ages (NaN allowed)
+        edges: Increasing lower bounds of the age ranges
+
+    Returns:
+        int64 range index per age; -1 for missing ages or ages below edges[0]
+    """
+    bins = np.digitize(ages, edges) - 1
+    return np.where(np.isnan(ages), -1, bins).astype(np.int64)
+
+
+def age_distribution(
+    users_df: pd.DataFrame, edges=AGE_EDGES, reference: pd.Timestamp | None = None
+) -> pd.DataFrame:
+    """
+    Count users per age range without modifying users_df.
+
+    Args:
+        users_df: DataFrame containing user records with 'birth_date' column
+        edges: Increasing lower bounds of the age ranges
+        reference: Date at which ages are computed (defaults to today)
+
+    Returns:
+        DataFrame with columns: 'Rango Edad', 'Cantidad'
+    """
+    bins = age_bins(exact_ages(users_df["birth_date"], reference), edges)
+    counts = np.bincount(bins[bins >= 0], minlength=len(edges))
+    return pd.DataFrame({"Rango Edad": age_labels(edges), "Cantidad": counts})
+
+
+def dimension_codes(
+    users_df: pd.DataFrame, dimension: str, edges, reference
+) -> tuple[np.ndarray, np.ndarray]:
+    """Integer codes (-1 for missing) and category labels of one dimension."""
+    if dimension == "age":
+        bins = age_bins(exact_ages(users_df["birth_date"], reference), edges)
+        return bins, np.array(age_labels(edges), dtype=object)
+    codes, categories = pd.factorize(users_df[dimension], sort=True)
+    return codes.astype(np.int64), np.asarray(categories, dtype=object)
+
+
+def demographic_crosstab(
+    data: dict[str, pd.DataFrame],
+    dimensions=("age", "gender"),
+    per_flow: bool = False,
+    edges=AGE_EDGES,
+    reference: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """
+    Count users for every combination of demographic dimensions in one pass.
+
+    Each dimension is encoded as integer codes, the codes are combined into a
+    single mixed-radix code and counted with one bincount. Users with a missing
+    value in any dimension are left out, like a pandas groupby.
+
+    Args:
+        data: Dictionary containing 'users' and, for per_flow, 'resumes' and
+              'resumes_exhibited' DataFrames
+        dimensions: Any of 'age', 'gender', 'country', 'city'
+        per_flow: Count applicants of each Flow (distinct flow/user pairs)
+        edges: Increasing lower bounds of the age ranges
+        reference: Date at which ages are computed (defaults to today)
+
+    Returns:
+        DataFrame with columns: ['ID Flow'], one per dimension (e.g. 'Rango Edad',
+        'Género') and 'Cantidad', only for non-empty combinations
+    """
+    users_df = data["users"]
+    encoded = [dimension_codes(users_df, dim, edges, reference) for dim in dimensions]
+    sizes = [len(categories) for _, categories in encoded]
+
+    combined = np.zeros(len(users_df), dtype=np.int64)
+    valid = np.ones(len(users_df), dtype=bool)
+    for (codes, _), size in zip(encoded, sizes):
+        combined = combined * size + np.maximum(codes, 0)
+        valid &= codes >= 0
+
+    n_cells = int(np.prod(sizes)) if sizes else 1
+    if per_flow:
+        keys = application_keys(data)
+        user_ids = users_df["id"].to_numpy(dtype=np.int64)
+        order = np.argsort(user_ids)
+        positions, found = lookup_sorted(user_ids[order], keys % PAIR_KEY_SPAN)
+        rows = order[positions[found]]
+        flow_ids, flow_codes = np.unique(keys[found] // PAIR_KEY_SPAN, return_inverse=True)
+        keep = valid[rows]
+        cells = flow_codes[keep] * n_cells + combined[rows][keep]
+        counts = np.bincount(cells, minlength=len(flow_ids) * n_cells)
+    else:
+        counts = np.bincount(combined[valid], minlength=n_cells)
+
+    nonzero = np.flatnonzero(counts)
+    result = {}
+    remainder = nonzero
+    columns = []
+    for dim, (_, categories), size in reversed(list(zip(dimensions, encoded, sizes))):
+        columns.append((DIMENSION_COLUMNS[dim], categories[remainder % size]))
+        remainder = remainder // size
+    if per_flow:
+        result["ID Flow"] = flow_ids[remainder]
+    for name, values in reversed(columns):
+        result[name] = values
+    result["Cantidad"] = counts[nonzero].astype(np.int64)
+    return pd.DataFrame(result)
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from processing.keys import key_flows, pair_keys, resume_owners
+from utils.instrumentation import instrument
+
+FUNNEL_COLUMNS = [
+    "ID Flow",
+    "Vistas Únicas",
+    "Vieron y Aplicaron",
+    "Aplicantes que Votaron",
+    "Compartidos",
+    "Conversión Vista-Aplicación",
+]
+
+
+def table_keys(df: pd.DataFrame | None) -> np.ndarray:
+    """Sorted unique (flow, user) keys of an event table with model_id/user_id."""
+    if df is None or df.empty:
+        return np.empty(0, dtype=np.int64)
+    return pair_keys(df["model_id"].to_numpy(), df["user_id"].to_numpy())
+
+
+def application_keys(data: dict[str, pd.DataFrame]) -> np.ndarray:
+    """Sorted unique (flow, applicant) keys from resumes_exhibited and resumes."""
+    df = data.get("resumes_exhibited")
+    if df is None or df.empty:
+        return np.empty(0, dtype=np.int64)
+    users, found = resume_owners(data["resumes"], df["resume_id"].to_numpy())
+    return pair_keys(df["model_id"].to_numpy()[found], users[found])
+
+
+def count_per_flow(keys: np.ndarray, flow_ids: np.ndarray) -> np.ndarray:
+    """Number of keys of each flow in flow_ids (sorted)."""
+    return np.bincount(
+        np.searchsorted(flow_ids, key_flows(keys)), minlength=len(flow_ids)
+    ).astype(np.int64)
+
+
+@instrument("Embudo de Conversión", kind="metric")
+def engagement_funnel(data: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Compute the per-Flow engagement funnel views -> applications -> votes -> shares.
+
+    Each stage is a sorted array of packed (flow_id, user_id) keys and stages are
+    chained with merge-style intersections (np.intersect1d on sorted unique keys),
+    so the total cost is O(n log n) in the number of events:
+
+    - Vistas Únicas: users who viewed the Flow
+    - Vieron y Aplicaron: viewers who applied to the Flow with one of their resumes
+    - Aplicantes que Votaron: viewers-applicants who cast votes in the Flow. A
+      vote only records the Flow and the voter (votes.model_id references
+      flows), so the votes an applicant received cannot be derived
+    - Compartidos: shares of the Flow
+
+    Args:
+        data: Dictionary containing 'views', 'resumes', 'resumes_exhibited',
+              'votes' and 'shares' DataFrames
+
+    Returns:
+        DataFrame with columns: 'ID Flow', 'Vistas Únicas', 'Vieron y Aplicaron',
+        'Aplicantes que Votaron', 'Compartidos', 'Conversión Vista-Aplicación' (%)
+    """
+    shares_df = data.get("shares")
+    share_flows = (
+        shares_df["model_id"].to_numpy(dtype=np.int64)
+        if shares_df is not None and not shares_df.empty
+        else np.empty(0, dtype=np.int64)
+    )
+    share_flow_ids, share_counts = np.unique(share_flows, return_counts=True)
+    return build_funnel(
+        table_keys(data.get("views")),
+        application_keys(data),
+        table_keys(data.get("votes")),
+        share_flow_ids,
+        share_counts,
+    )
+
+
+def build_funnel(
+    viewers: np.ndarray,
+    applicants: np.ndarray,
+    voted: np.ndarray,
+    share_flow_ids: np.ndarray,
+    share_counts: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Chain the funnel stages from sorted unique (flow, user) keys.
+
+    Args:
+        viewers: Keys of users who viewed each Flow
+        applicants: Keys of users who applied to each Flow
+        voted: Keys of users who voted in each Flow
+        share_flow_ids: Sorted Flow ids with shares
+        share_counts: Number of shares of each Flow in share_flow_ids
+
+    Returns:
+        DataFrame with the FUNNEL_COLUMNS
+    """
+    viewed_applied = np.intersect1d(viewers, applicants, assume_unique=True)
+    applied_voted = np.intersect1d(viewed_applied, voted, assume_unique=True)
+
+    flow_ids = np.unique(
+        np.concatenate([key_flows(viewers), key_flows(applicants), share_flow_ids])
+    )
+    unique_viewers = count_per_flow(viewers, flow_ids)
+    viewers_applied = count_per_flow(viewed_applied, flow_ids)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conversion = np.where(
+            unique_viewers > 0, viewers_applied / unique_viewers * 100, 0.0
+        )
+    shares = np.zeros(len(flow_ids), dtype=np.int64)
+    shares[np.searchsorted(flow_ids, share_flow_ids)] = share_counts
+
+    return pd.DataFrame(
+        {
+            "ID Flow": flow_ids,
+            "Vistas Únicas": unique_viewers,
+            "Vieron y Aplicaron": viewers_applied,
+            "Aplicantes que Votaron": count_per_flow(applied_voted, flow_ids),
+            "Compartidos": shares,
+            "Conversión Vista-Aplicación": np.round(conversion, 2),
+        },
+        columns=FUNNEL_COLUMNS,
+    )
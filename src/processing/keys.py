@@ -0,0 +1,66 @@
+import numpy as np
+
+PAIR_KEY_SPAN = np.int64(1) << 32
+
+
+def lookup_sorted(
+    sorted_keys: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the positions of values in a sorted key array.
+
+    Args:
+        sorted_keys: Sorted unique keys
+        values: Values to look up
+
+    Returns:
+        Tuple (positions, found) where positions is only meaningful where found
+    """
+    if sorted_keys.size == 0:
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, values), len(sorted_keys) - 1)
+    return positions, sorted_keys[positions] == values
+
+
+def resume_owners(resumes_df, resume_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Map resume ids to their owner user ids with a binary search.
+
+    Args:
+        resumes_df: DataFrame with 'id' and 'user_id' columns
+        resume_ids: Resume ids to map
+
+    Returns:
+        Tuple (user_ids, found) where user_ids is only meaningful where found
+    """
+    ids = resumes_df["id"].to_numpy(dtype=np.int64)
+    order = np.argsort(ids)
+    owners = resumes_df["user_id"].to_numpy(dtype=np.int64)[order]
+    positions, found = lookup_sorted(ids[order], np.asarray(resume_ids, dtype=np.int64))
+    if owners.size == 0:
+        return np.zeros(len(positions), dtype=np.int64), found
+    return owners[positions], found
+
+
+def pair_keys(flows: np.ndarray, users: np.ndarray) -> np.ndarray:
+    """
+    Pack (flow_id, user_id) pairs into sorted unique int64 keys.
+
+    Ids must be non-negative and lower than 2**32.
+
+    Args:
+        flows: Flow id of each pair
+        users: User id of each pair
+
+    Returns:
+        Sorted unique keys flow_id * 2**32 + user_id
+    """
+    keys = np.asarray(flows, dtype=np.int64) * PAIR_KEY_SPAN + np.asarray(
+        users, dtype=np.int64
+    )
+    return np.unique(keys)
+
+
+def key_flows(keys: np.ndarray) -> np.ndarray:
+    """Flow id of each packed (flow_id, user_id) key."""
+    return keys // PAIR_KEY_SPAN
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from processing.funnel import application_keys
+from processing.keys import PAIR_KEY_SPAN, lookup_sorted, resume_owners
+from processing.rankings import top_k_indices
+from processing.skills import SkillDictionary, encode_skill_columns
+
+MATCH_COLUMNS = ["ID Flow", "ID Usuario", "Similitud"]
+
+# Professional skills only: profile tools and spoken languages are not matched
+MATCH_SKILL_COLUMNS = {
+    "resumes": ["skills"],
+    "profiles": ["skills"],
+}
+
+
+def incidence_matrix(rows: np.ndarray, columns: np.ndarray, shape: tuple[int, int]):
+    """Binary CSR matrix (float32) with a 1 at every (row, column) pair."""
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=shape
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix
+
+
+def normalize_rows(matrix):
+    """Scale every row of a CSR matrix to unit L2 norm (empty rows stay empty)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags((1.0 / norms).astype(np.float32)) @ matrix
+
+
+def user_skill_pairs(
+    data: dict[str, pd.DataFrame],
+    dictionary: SkillDictionary,
+    columns: dict[str, list[str]] = MATCH_SKILL_COLUMNS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (user id, skill code) pairs from the given skill columns (MATCH_SKILL_COLUMNS).
+
+    Resume skills are attributed to the resume owner through resumes.user_id.
+    """
+    users, codes = [], []
+    for (table, _), encoded in encode_skill_columns(data, dictionary, columns).items():
+        row_ids = encoded.row_ids.astype(np.int64)[encoded.row_positions()]
+        if table == "resumes":
+            owners, found = resume_owners(data["resumes"], row_ids)
+            users.append(owners[found])
+            codes.append(encoded.codes[found])
+        else:
+            users.append(row_ids)
+            codes.append(encoded.codes)
+    if not users:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(users), np.concatenate(codes).astype(np.int64)
+
+
+class SkillMatcher:
+    """
+    Candidate-Flow matching on sparse skill matrices.
+
+    users is a users x skills binary CSR matrix and applicants a Flows x users
+    CSR matrix of who applied where. The Flow skill profile is the product
+    applicants @ users (how many applicants have each skill), so no pandas
+    merges are needed. Memory is proportional to the number of non-zeros,
+    e.g. 1M users with ~10 skills each take about 80 MB.
+    """
+
+    def __init__(
+        self,
+        dictionary: SkillDictionary,
+        user_ids: np.ndarray,
+        users,
+        flow_ids: np.ndarray,
+        applicants,
+    ) -> None:
+        self.dictionary = dictionary
+        self.user_ids = user_ids
+        self.users = users.tocsr()
+        self.flow_ids = flow_ids
+        self.applicants = applicants.tocsr()
+        self.flows = (self.applicants @ self.users).tocsr()
+
+    @classmethod
+    def build(
+        cls,
+        data: dict[str, pd.DataFrame],
+        dictionary: SkillDictionary | None = None,
+        columns: dict[str, list[str]] = MATCH_SKILL_COLUMNS,
+    ) -> "SkillMatcher":
+        """
+        Build the users x skills and Flows x skills matrices.
+
+        Args:
+            data: Dictionary containing 'resumes', 'resumes_exhibited' and
+                  optionally 'profiles' DataFrames
+            dictionary: SkillDictionary to extend (a new one is created if omitted)
+            columns: Skill columns matched by table name (resume and profile
+                     skills by default)
+
+        Returns:
+            SkillMatcher ready to rank candidates
+        """
+        dictionary = dictionary if dictionary is not None else SkillDictionary()
+        pair_users, pair_codes = user_skill_pairs(data, dictionary, columns)
+
+        keys = application_keys(data)
+        app_flows, app_users = keys // PAIR_KEY_SPAN, keys % PAIR_KEY_SPAN
+        user_ids = np.unique(np.concatenate([pair_users, app_users]))
+        flow_ids = np.unique(app_flows)
+
+        users = incidence_matrix(
+            np.searchsorted(user_ids, pair_users),
+            pair_codes,
+            (len(user_ids), len(dictionary)),
+        )
+        applicants = incidence_matrix(
+            np.searchsorted(flow_ids, app_flows),
+            np.searchsorted(user_ids, app_users),
+            (len(flow_ids), len(user_ids)),
+        )
+        return cls(dictionary, user_ids, users, flow_ids, applicants)
+
+    def flow_skills(self, top_n: int | None = None) -> pd.DataFrame:
+        """
+        Applicants per skill of every Flow, most common skills first.
+
+        Returns:
+            DataFrame with columns: 'ID Flow', 'Skill', 'Aplicantes'
+        """
+        frames = []
+        skills = self.dictionary.skills
+        for row, flow_id in enumerate(self.flow_ids):
+            start, end = self.flows.indptr[row], self.flows.indptr[row + 1]
+            codes, counts = self.flows.indices[start:end], self.flows.data[start:end]
+            order = top_k_indices([counts], top_n)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "ID Flow": flow_id,
+                        "Skill": skills[codes[order]],
+                        "Aplicantes": counts[order].astype(np.int64),
+                    }
+                )
+            )
+        if not frames:
+            return pd.DataFrame(columns=["ID Flow", "Skill", "Aplicantes"])
+        return pd.concat(frames, ignore_index=True)
+
+    def top_candidates(
+        self,
+        k: int = 10,
+        flow_ids=None,
+        exclude_applicants: bool = True,
+        batch_size: int = 64,
+    ) -> pd.DataFrame:
+        """
+        Rank candidates for each Flow by skill overlap with its applicants.
+
+        The similarity is the cosine between the user's skill vector and the
+        Flow's skill profile. Scores are computed batch_size Flows at a time as
+        one sparse product (Flows x skills) @ (skills x users); only users
+        sharing at least one skill get a score, and the top k of each Flow are
+        selected with a partial sort.
+
+        Args:
+            k: Candidates per Flow
+            flow_ids: Flows to rank (all Flows with applicants if None)
+            exclude_applicants: Skip users who already applied to the Flow
+            batch_size: Flows scored per sparse product
+
+        Returns:
+            DataFrame with columns: 'ID Flow', 'ID Usuario', 'Similitud', sorted by
+            Flow then similarity descending (ties by lowest user id)
+        """
+        rows = np.arange(len(self.flow_ids))
+        if flow_ids is not None:
+            rows, found = lookup_sorted(self.flow_ids, np.asarray(flow_ids, dtype=np.int64))
+            rows = rows[found]
+
+        users_t = normalize_rows(self.users).T.tocsr()
+        profiles = normalize_rows(self.flows)
+        out_flows, out_users, out_scores = [], [], []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            scores = (profiles[batch] @ users_t).tocsr()
+            scores.sort_indices()
+            for position, row in enumerate(batch):
+                begin, end = scores.indptr[position], scores.indptr[position + 1]
+                candidates = scores.indices[begin:end]
+                values = scores.data[begin:end]
+                if exclude_applicants:
+                    applied = self.applicants.indices[
+                        self.applicants.indptr[row] : self.applicants.indptr[row + 1]
+                    ]
+                    keep = ~np.isin(candidates, applied, assume_unique=True)
+                    candidates, values = candidates[keep], values[keep]
+                best = top_k_indices([values], k)
+                out_flows.append(np.full(len(best), self.flow_ids[row]))
+                out_users.append(self.user_ids[candidates[best]])
+                out_scores.append(values[best])
+
+        if not out_flows:
+            return pd.DataFrame(columns=MATCH_COLUMNS)
+        return pd.DataFrame(
+            {
+                "ID Flow": np.concatenate(out_flows).astype(np.int64),
+                "ID Usuario": np.concatenate(out_users).astype(np.int64),
+                "Similitud": np.round(np.concatenate(out_scores).astype(np.float64), 4),
+            }
+        )
@@ -1,6 +1,16 @@
 import pandas as pd
 
+from processing.backends import compute_group_metrics
+from processing.cohorts import cohort_activity, retention_rates
+from processing.demographics import AGE_EDGES, age_distribution
+from processing.funnel import engagement_funnel
+from processing.rankings import flow_rankings
+from processing.skills import SkillDictionary, skill_counts
+from processing.timeseries import EventTimeline, aggregate_events
+from utils.instrumentation import instrument
 
+
+@instrument("Participantes Únicos", kind="metric")
 def unique_participants(data: dict[str, pd.DataFrame]) -> pd.DataFrame:
     """
     Count unique participants (users) by Flow.
@@ -26,6 +36,7 @@ def unique_participants(data: dict[str, pd.DataFrame]) -> pd.DataFrame:
     return unique_participants
 
 
+@instrument("Total Aplicaciones", kind="metric")
 def application_total(df_resumes_exhibited: pd.DataFrame) -> pd.DataFrame:
     """
     Count total applications (resumes) submitted by Flow.
@@ -45,6 +56,7 @@ def application_total(df_resumes_exhibited: pd.DataFrame) -> pd.DataFrame:
     return total_applications
 
 
+@instrument("Votos Totales", kind="metric")
 def total_votes(df_votes: pd.DataFrame) -> pd.DataFrame:
     """
     Sum total votes received by Flow.
@@ -62,6 +74,7 @@ def total_votes(df_votes: pd.DataFrame) -> pd.DataFrame:
     return total_votes_flow
 
 
+@instrument("Compartidos", kind="metric")
 def total_shared(df_shares: pd.DataFrame) -> pd.DataFrame:
     """
     Count total shares by Flow.
@@ -79,6 +92,7 @@ def total_shared(df_shares: pd.DataFrame) -> pd.DataFrame:
     return total_shared
 
 
+@instrument("Visualizaciones Únicas", kind="metric")
 def unique_views(df_views: pd.DataFrame) -> pd.DataFrame:
     """
     Count unique users who viewed each Flow.
@@ -96,6 +110,7 @@ def unique_views(df_views: pd.DataFrame) -> pd.DataFrame:
     return unique_views
 
 
+@instrument("Visualizaciones Totales", kind="metric")
 def total_views(df_views: pd.DataFrame) -> pd.DataFrame:
     """
     Count total views by Flow.
@@ -113,6 +128,7 @@ def total_views(df_views: pd.DataFrame) -> pd.DataFrame:
     return total_views
 
 
+@instrument("Distribución por Género", kind="metric")
 def group_by_gender(user_df: pd.DataFrame):
     """
     Group users by gender to count.
@@ -128,35 +144,26 @@ def group_by_gender(user_df: pd.DataFrame):
     return fitered_gender
 
 
-def group_by_age(user_df: pd.DataFrame) -> pd.DataFrame:
+@instrument("Distribución por Edad", kind="metric")
+def group_by_age(user_df: pd.DataFrame, edges=AGE_EDGES) -> pd.DataFrame:
     """
     Group users by age ranges based on birth_date.
 
-    Age ranges: <18, 18-25, 26-55, 56+
+    Ages are exact (birthday reached this year) and ranges are assigned in one
+    np.digitize pass; user_df is not modified. Default ranges: <18, 18-25,
+    26-55, 56+
 
     Args:
         user_df: DataFrame containing user records with 'birth_date' column
+        edges: Increasing lower bounds of the age ranges
 
     Returns:
         DataFrame with columns: 'Rango Edad', 'Cantidad'
     """
-    year_current = pd.Timestamp.now().year
-    user_df["birth_date"] = pd.to_datetime(user_df["birth_date"], errors="coerce")
-    user_df["age"] = year_current - user_df["birth_date"].dt.year
-
-    young = user_df[user_df["age"].between(0, 17)].shape[0]
-    young_adults = user_df[user_df["age"].between(18, 25)].shape[0]
-    adults = user_df[user_df["age"].between(26, 55)].shape[0]
-    older_adults = user_df[user_df["age"] >= 56].shape[0]
-    group_ages = pd.DataFrame(
-        {
-            "Rango Edad": ["<18", "18-25", "26-55", "56+"],
-            "Cantidad": [young, young_adults, adults, older_adults],
-        },
-    )
-    return group_ages
+    return age_distribution(user_df, edges)
 
 
+@instrument("Tasa de Conversión", kind="metric")
 def calculate_conversion_rate(
     participants_df: pd.DataFrame, applications_df: pd.DataFrame
 ) -> pd.DataFrame:
@@ -177,78 +184,73 @@ def calculate_conversion_rate(
     return conversion_df
 
 
-def top_skills(resumes_df: pd.DataFrame) -> pd.DataFrame:
+@instrument("Top Skills", kind="metric")
+def top_skills(
+    resumes_df: pd.DataFrame,
+    top_n: int | None = None,
+    dictionary: SkillDictionary | None = None,
+) -> pd.DataFrame:
     """
     Extract the most common skills from resumes.
 
-    Skills are cleaned and converted to lowercase. Handles list format: "['skill1', 'skill2']"
+    Each stringified list ("['skill1', 'skill2']") is parsed once and interned into
+    a shared SkillDictionary; counts come from a bincount over the skill codes.
 
     Args:
         resumes_df: DataFrame containing resume records with 'skills' column
+        top_n: Maximum number of skills to return (all skills if None)
+        dictionary: SkillDictionary to reuse across skill columns (optional)
 
     Returns:
         DataFrame with columns: 'Skill', 'Cantidad' (sorted by count descending)
     """
-    skills_clean = (
-        resumes_df["skills"]
-        .str.replace("[", "")
-        .str.replace("]", "")
-        .str.replace("'", "")
-    )
-    skills_list = skills_clean.str.split(",")
-    skills_exploded = skills_list.explode()
-    skills_exploded = skills_exploded.str.strip().str.lower()
+    dictionary = dictionary if dictionary is not None else SkillDictionary()
+    encoded = dictionary.encode(resumes_df["skills"])
+    return skill_counts(encoded, dictionary, top_n)
 
-    top_skills = skills_exploded.value_counts().reset_index()
-    top_skills.columns = ["Skill", "Cantidad"]
-    return top_skills
 
-
-def metrics_per_month(df_resumes_exhibited: pd.DataFrame) -> pd.DataFrame:
+@instrument("Métricas por Mes", kind="metric")
+def metrics_per_month(
+    df_resumes_exhibited: pd.DataFrame, timeline: EventTimeline | None = None
+) -> pd.DataFrame:
     """
     Add application metrics by month (YYYY-MM format).
 
     Args:
         df_resumes_exhibited: DataFrame containing resume exhibition records with 'created_at' column
+        timeline: Already parsed EventTimeline of df_resumes_exhibited (optional)
 
     Returns:
         DataFrame with columns: 'Mes' (YYYY-MM), 'Total Aplicaciones'
     """
-    df_metric_month = df_resumes_exhibited.copy()
-    df_metric_month["created_at"] = pd.to_datetime(
-        df_metric_month["created_at"], errors="coerce"
-    )
-    df_metric_month["year_month"] = (
-        df_metric_month["created_at"].dt.to_period("M").astype(str)
-    )
-    monthly_metrics = df_metric_month.groupby("year_month")["id"].count().reset_index()
-    monthly_metrics.columns = ["Mes", "Total Aplicaciones"]
+    timeline = timeline if timeline is not None else EventTimeline(df_resumes_exhibited)
+    return aggregate_events(timeline, "month", "Total Aplicaciones")
 
-    return monthly_metrics
 
-
-def metrics_per_week(df_resumes_exhibited: pd.DataFrame) -> pd.DataFrame:
+@instrument("Métricas por Semana", kind="metric")
+def metrics_per_week(
+    df_resumes_exhibited: pd.DataFrame, timeline: EventTimeline | None = None
+) -> pd.DataFrame:
     """
-    Add application metrics by week (YYYY-WNN format).
+    Add application metrics by ISO week (YYYY-WNN format).
 
     Args:
         df_resumes_exhibited: DataFrame containing resume exhibition records with 'created_at' column
+        timeline: Already parsed EventTimeline of df_resumes_exhibited (optional)
 
     Returns:
         DataFrame with columns: 'Semana' (YYYY-WNN), 'Total Aplicaciones'
     """
-    df_metric_week = df_resumes_exhibited.copy()
-    df_metric_week["created_at"] = pd.to_datetime(
-        df_metric_week["created_at"], errors="coerce"
-    )
-    df_metric_week["year_week"] = df_metric_week["created_at"].dt.strftime("%Y-W%U")
-    weekly_metrics = df_metric_week.groupby("year_week")["id"].count().reset_index()
-    weekly_metrics.columns = ["Semana", "Total Aplicaciones"]
-
-    return weekly_metrics
+    timeline = timeline if timeline is not None else EventTimeline(df_resumes_exhibited)
+    return aggregate_events(timeline, "week", "Total Aplicaciones")
 
 
-def get_all_metrics_as_dict(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:  
+def get_all_metrics_as_dict(
+    data: dict[str, pd.DataFrame],
+    backend: str = "pandas",
+    sample_fraction: float | None = None,
+    seed: int = 0,
+) -> dict[str, pd.DataFrame]:
     """
     Compute all available metrics:
     - Participantes Únicos
@@ -260,36 +262,109 @@ def get_all_metrics_as_dict(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataF
     - Distribución por Género
     - Distribución por Edad
     - Tasa de Conversión
+    - Embudo de Conversión
     - Top Skills
+    - Top Flows (by applications, votes and views)
     - Métricas por Mes
     - Métricas por Semana
+    - Retención por Cohorte
+
+    When any table is given as an iterable of DataFrame chunks (e.g. from
+    loader.load_data_chunks) instead of a DataFrame, the metrics are computed out
+    of core with mergeable partial aggregates (processing.aggregates), producing
+    the same results with memory bounded by the number of distinct keys.
+
+    With backend='polars' or 'arrow', the grouped per-Flow and gender metrics
+    (processing.backends.GROUP_METRICS) run on that engine and are converted back
+    to the same pandas frames.
+
+    With sample_fraction set, the metrics are a fast preview estimated from a
+    reproducible, Flow-stratified sample of the event tables
+    (processing.sampling.preview_metrics), with an extra 'Intervalos de
+    Confianza' frame for the per-Flow estimates.
+
+    Args:
+        data: Dictionary containing DataFrames (or iterables of DataFrame chunks)
+              by table name: 'resumes', 'resumes_exhibited', 'votes', 'shares',
+              'views', 'users'
+        backend: Execution backend for the grouped metrics ('pandas', 'polars', 'arrow')
+        sample_fraction: Preview sampling rate in (0, 1] (exact metrics if None)
+        seed: Seed of the preview sample
+
+    Returns:
+        Dictionary mapping metric names to their respective DataFrames
+
+    Raises:
+        ValueError: If chunked tables are combined with a backend other than
+                    pandas or with sample_fraction
+    """
+    if not all(isinstance(df, pd.DataFrame) for df in data.values()):
+        from processing.aggregates import stream_all_metrics
+
+        if backend != "pandas":
+            raise ValueError(f"Backend {backend} needs DataFrames, chunked tables are streamed with pandas only")
+        if sample_fraction is not None:
+            # The stratified sample needs every Flow's events up front, which streaming avoids loading
+            raise ValueError("sample_fraction needs DataFrames, chunked tables are always computed exactly")
+
+        return stream_all_metrics(data)
+
+    if sample_fraction is not None:
+        from processing.sampling import preview_metrics
+
+        return preview_metrics(data, sample_fraction, seed, backend=backend)
+
+    return compute_metrics(data, backend)
+
+
+def compute_metrics(
+    data: dict[str, pd.DataFrame],
+    backend: str = "pandas",
+    cohort_users: pd.DataFrame | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Compute all metrics of get_all_metrics_as_dict from in-memory DataFrames.
 
     Args:
-        data: Dictionary containing DataFrames by table name:
-              'resumes', 'resumes_exhibited', 'votes', 'shares', 'views', 'users'
+        data: Dictionary containing DataFrames by table name
+        backend: Execution backend for the grouped metrics ('pandas', 'polars', 'arrow')
+        cohort_users: Users whose retention is measured (data['users'] if None)
 
     Returns:
         Dictionary mapping metric names to their respective DataFrames
     """
     metrics = {}
 
-    metrics["Participantes Únicos"] = unique_participants(data)
-    metrics["Total Aplicaciones"] = application_total(data["resumes_exhibited"])
-    metrics["Votos Totales"] = total_votes(data["votes"])
-    metrics["Compartidos"] = total_shared(data["shares"])
-    metrics["Visualizaciones Únicas"] = unique_views(data["views"])
-    metrics["Visualizaciones Totales"] = total_views(data["views"])
-    metrics["Distribución por Género"] = group_by_gender(data["users"])
+    if backend == "pandas":
+        metrics["Participantes Únicos"] = unique_participants(data)
+        metrics["Total Aplicaciones"] = application_total(data["resumes_exhibited"])
+        metrics["Votos Totales"] = total_votes(data["votes"])
+        metrics["Compartidos"] = total_shared(data["shares"])
+        metrics["Visualizaciones Únicas"] = unique_views(data["views"])
+        metrics["Visualizaciones Totales"] = total_views(data["views"])
+        metrics["Distribución por Género"] = group_by_gender(data["users"])
+    else:
+        metrics.update(compute_group_metrics(data, backend))
     metrics["Distribución por Edad"] = group_by_age(data["users"])
 
     metrics["Tasa de Conversión"] = calculate_conversion_rate(
         metrics["Participantes Únicos"],
         metrics["Total Aplicaciones"]
     )
+    metrics["Embudo de Conversión"] = engagement_funnel(data)
 
     metrics["Top Skills"] = top_skills(data["resumes"])
-    metrics["Métricas por Mes"] = metrics_per_month(data["resumes_exhibited"])
-    metrics["Métricas por Semana"] = metrics_per_week(data["resumes_exhibited"])
+    metrics["Top Flows"] = flow_rankings(metrics)
+    applications_timeline = EventTimeline(data["resumes_exhibited"])
+    metrics["Métricas por Mes"] = metrics_per_month(
+        data["resumes_exhibited"], applications_timeline
+    )
+    metrics["Métricas por Semana"] = metrics_per_week(
+        data["resumes_exhibited"], applications_timeline
+    )
+    if cohort_users is not None:
+        data = {**data, "users": cohort_users}
+    metrics["Retención por Cohorte"] = retention_rates(cohort_activity(data))
 
     return metrics
 
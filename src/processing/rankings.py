@@ -0,0 +1,166 @@
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import instrument
+
+REPORT_TOP_K = 20
+
+FLOW_RANKING_COLUMNS = [
+    "ID Flow",
+    "Total Aplicaciones",
+    "Votos Totales",
+    "Visualizaciones Totales",
+]
+
+
+def sort_keys(values, ascending: bool) -> np.ndarray:
+    """Float keys where smaller sorts first (NaN and missing values always last)."""
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.number):
+        values = pd.factorize(values, sort=True)[0].astype(np.float64)
+        values[values < 0] = np.nan
+    keys = values.astype(np.float64) if ascending else -values.astype(np.float64)
+    return np.where(np.isnan(keys), np.inf, keys)
+
+
+def top_k_indices(
+    keys: Sequence,
+    k: int | None,
+    ascending: bool | Sequence[bool] = False,
+    with_ties: bool = False,
+) -> np.ndarray:
+    """
+    Positions of the top k rows ranked by one or more keys, without a full sort.
+
+    The k-th value of the first key is found with np.argpartition (O(n)); only
+    the rows reaching it are sorted with np.lexsort on all keys. Rows equal on
+    every key keep their original order.
+
+    Args:
+        keys: Ranking keys (arrays of the same length), most significant first
+        k: Number of rows to return (all rows if None)
+        ascending: Sort direction, one per key or shared by all keys
+        with_ties: Also return the rows tied with the k-th row on every key
+
+    Returns:
+        int64 array of row positions in rank order
+    """
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(keys)
+    sortable = [sort_keys(values, asc) for values, asc in zip(keys, ascending)]
+    n = len(sortable[0])
+
+    candidates = np.arange(n)
+    if k is not None and k < n:
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        primary = sortable[0]
+        threshold = primary[np.argpartition(primary, k - 1)[k - 1]]
+        candidates = np.flatnonzero(primary <= threshold)
+
+    order = candidates[
+        np.lexsort([key[candidates] for key in reversed(sortable)])
+    ].astype(np.int64)
+    if k is None or k >= len(order):
+        return order
+    if not with_ties:
+        return order[:k]
+
+    last = order[k - 1]
+    tied = np.ones(len(order) - k, dtype=bool)
+    for key in sortable:
+        tied &= key[order[k:]] == key[last]
+    return np.concatenate([order[:k], order[k:][np.logical_and.accumulate(tied)]])
+
+
+def top_k(
+    df: pd.DataFrame,
+    by: str | Sequence[str],
+    k: int | None,
+    ascending: bool | Sequence[bool] = False,
+    with_ties: bool = False,
+) -> pd.DataFrame:
+    """
+    Select the top k rows of df ordered by the given columns.
+
+    Args:
+        df: DataFrame to rank
+        by: Column or columns to rank by, most significant first
+        k: Number of rows to return (all rows, sorted, if None)
+        ascending: Sort direction, one per column or shared by all columns
+        with_ties: Also return the rows tied with the k-th row
+
+    Returns:
+        DataFrame with the selected rows in rank order and a fresh index
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    positions = top_k_indices(
+        [df[column].to_numpy() for column in by], k, ascending, with_ties
+    )
+    return df.iloc[positions].reset_index(drop=True)
+
+
+class TopKAccumulator:
+    """
+    Bounded top-k over a stream of chunks or partial results.
+
+    Only the current top k rows (plus the rows tied with the k-th) are kept, so
+    memory is O(k) whatever the number of chunks. Rows must already be final
+    per key (e.g. one row per Flow), as produced by a finalized aggregate or by
+    disjoint partitions.
+    """
+
+    def __init__(
+        self,
+        by: str | Sequence[str],
+        k: int,
+        ascending: bool | Sequence[bool] = False,
+        with_ties: bool = False,
+    ) -> None:
+        self.by = by
+        self.k = k
+        self.ascending = ascending
+        self.with_ties = with_ties
+        self.rows: pd.DataFrame | None = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        rows = chunk if self.rows is None else pd.concat([self.rows, chunk])
+        self.rows = top_k(rows, self.by, self.k, self.ascending, with_ties=True)
+
+    def merge(self, other: "TopKAccumulator") -> "TopKAccumulator":
+        if other.rows is not None:
+            self.update(other.rows)
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        if self.rows is None:
+            return pd.DataFrame()
+        return top_k(self.rows, self.by, self.k, self.ascending, self.with_ties)
+
+
+@instrument("Top Flows", kind="metric")
+def flow_rankings(metrics: dict[str, pd.DataFrame], k: int | None = None) -> pd.DataFrame:
+    """
+    Rank Flows by applications, then votes, then views.
+
+    Ties on all three keys are broken by the lowest 'ID Flow'.
+
+    Args:
+        metrics: Dictionary with the 'Total Aplicaciones', 'Votos Totales' and
+                 'Visualizaciones Totales' metrics
+        k: Number of Flows to return (all if None; the PDF report shows REPORT_TOP_K)
+
+    Returns:
+        DataFrame with columns: 'ID Flow', 'Total Aplicaciones', 'Votos Totales',
+        'Visualizaciones Totales'
+    """
+    flows = None
+    for name in FLOW_RANKING_COLUMNS[1:]:
+        df = metrics[name][["ID Flow", name]]
+        flows = df if flows is None else flows.merge(df, on="ID Flow", how="outer")
+    flows = flows.sort_values("ID Flow").fillna(0)
+    for name in FLOW_RANKING_COLUMNS[1:]:
+        flows[name] = flows[name].astype(metrics[name][name].dtype)
+    return top_k(flows, FLOW_RANKING_COLUMNS[1:], k)
@@ -0,0 +1,253 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from processing.backends import GROUP_METRICS
+from processing.keys import resume_owners
+from processing.metrics import calculate_conversion_rate, compute_metrics
+from processing.rankings import flow_rankings
+from processing.timeseries import EventTimeline, aggregate_events
+
+SAMPLED_TABLES = ("resumes_exhibited", "votes", "views", "shares")
+
+PER_FLOW_METRICS = [
+    name for name, metric in GROUP_METRICS.items() if metric.columns[0] == "ID Flow"
+]
+
+FUNNEL_COUNT_COLUMNS = [
+    "Vistas Únicas",
+    "Vieron y Aplicaron",
+    "Aplicantes que Votaron",
+    "Compartidos",
+]
+
+INTERVAL_COLUMNS = [
+    "Métrica",
+    "ID Flow",
+    "Estimación",
+    "Límite Inferior",
+    "Límite Superior",
+]
+
+
+def hash_uniform(ids: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    Map integer ids to reproducible pseudo-random numbers in [0, 1).
+
+    Uses the splitmix64 finalizer, so the same id and seed always give the same
+    number, whatever the chunking or row order of the input.
+    """
+    offset = np.uint64(seed * 0x9E3779B97F4A7C15 % 2**64)
+    x = np.asarray(ids).astype(np.uint64) + offset
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / 2.0**53
+
+
+def sampling_units(data: dict[str, pd.DataFrame], table: str) -> np.ndarray:
+    """
+    Sampling unit (user) of each row of an event table.
+
+    Applications belong to the resume owner; applications whose resume is
+    unknown are their own unit (negative ids) and missing users share unit -1.
+    """
+    df = data[table]
+    if table == "resumes_exhibited":
+        resume_ids = df["resume_id"].to_numpy(dtype=np.int64)
+        users, found = resume_owners(data["resumes"], resume_ids)
+        return np.where(found, users, -1 - resume_ids)
+    return pd.to_numeric(df["user_id"]).fillna(-1).to_numpy(dtype=np.int64)
+
+
+def flow_inclusion_rates(
+    data: dict[str, pd.DataFrame], fraction: float, min_flow_events: int
+) -> pd.Series:
+    """
+    Inclusion probability of each Flow (stratum).
+
+    Flows with fewer than min_flow_events events over the sampled tables are
+    kept whole; the others are sampled at fraction.
+    """
+    flows = [data[table]["model_id"] for table in SAMPLED_TABLES if table in data]
+    sizes = pd.concat(flows).value_counts() if flows else pd.Series(dtype=np.int64)
+    return pd.Series(np.where(sizes < min_flow_events, 1.0, fraction), index=sizes.index)
+
+
+def sample_events(
+    data: dict[str, pd.DataFrame],
+    fraction: float,
+    seed: int = 0,
+    min_flow_events: int = 100,
+) -> tuple[dict[str, pd.DataFrame], pd.Series]:
+    """
+    Draw a reproducible sample of the event tables, stratified by Flow.
+
+    Rows are kept when the hash of their user is below the inclusion rate of
+    their Flow. Sampling whole users (instead of rows) keeps each sampled
+    user's views, applications, votes and shares together, so distinct counts,
+    funnels and cohorts stay consistent, and the same user is kept in every
+    Flow sampled at the same rate. Dimension tables (users, resumes, ...) are
+    not sampled.
+
+    Args:
+        data: Dictionary of DataFrames by table name
+        fraction: Inclusion rate of the large Flows (0 < fraction <= 1)
+        seed: Seed of the hash function
+        min_flow_events: Flows with fewer events are kept whole
+
+    Returns:
+        Tuple (sample, rates): the sampled tables and the inclusion rate per Flow
+    """
+    rates = flow_inclusion_rates(data, fraction, min_flow_events)
+    sample = dict(data)
+    for table in SAMPLED_TABLES:
+        if table not in data:
+            continue
+        df = data[table]
+        flow_rates = df["model_id"].map(rates).to_numpy(dtype=np.float64)
+        keep = hash_uniform(sampling_units(data, table), seed) < flow_rates
+        sample[table] = df[keep]
+    return sample, rates
+
+
+def scale_per_flow(df: pd.DataFrame, rates: pd.Series, columns: list[str]) -> pd.DataFrame:
+    """Horvitz-Thompson estimates: divide per-Flow totals by the Flow's rate."""
+    scaled = df.copy()
+    flow_rates = df["ID Flow"].map(rates).fillna(1.0).to_numpy()
+    for column in columns:
+        values = df[column].to_numpy(dtype=np.float64) / flow_rates
+        if pd.api.types.is_integer_dtype(df[column]):
+            values = np.round(values).astype(df[column].dtype)
+        scaled[column] = values
+    return scaled
+
+
+def confidence_intervals(
+    sample: dict[str, pd.DataFrame], rates: pd.Series, confidence: float = 0.95
+) -> pd.DataFrame:
+    """
+    Normal confidence intervals of the per-Flow estimates.
+
+    Users are sampled independently with probability p (Poisson sampling of
+    clusters), so the variance of the Horvitz-Thompson total is estimated as
+    (1 - p) / p^2 * sum(y_u^2) over the sampled users, where y_u is the user's
+    contribution to the Flow (events, vote value, or 1 for distinct counts).
+
+    Args:
+        sample: Sampled tables from sample_events
+        rates: Inclusion rate per Flow from sample_events
+        confidence: Confidence level of the intervals
+
+    Returns:
+        DataFrame with columns: 'Métrica', 'ID Flow', 'Estimación',
+        'Límite Inferior', 'Límite Superior'
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    frames = []
+    for name in PER_FLOW_METRICS:
+        metric = GROUP_METRICS[name]
+        df = sample.get(metric.table)
+        if df is None:
+            continue
+        units = pd.DataFrame(
+            {"ID Flow": df[metric.key].to_numpy(), "unit": sampling_units(sample, metric.table)}
+        )
+        if metric.how == "nunique":
+            units = units[units["unit"] >= 0].drop_duplicates()
+            units["y"] = 1.0
+        elif metric.how == "sum":
+            units["y"] = df[metric.column].to_numpy(dtype=np.float64)
+        else:
+            units["y"] = df[metric.column].notna().to_numpy(dtype=np.float64)
+        per_unit = units.groupby(["ID Flow", "unit"])["y"].sum().reset_index()
+        per_unit["y2"] = per_unit["y"] ** 2
+        totals = per_unit.groupby("ID Flow")[["y", "y2"]].sum()
+
+        p = totals.index.map(rates).to_numpy(dtype=np.float64)
+        estimate = totals["y"].to_numpy() / p
+        margin = z * np.sqrt((1 - p) / p**2 * totals["y2"].to_numpy())
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Métrica": name,
+                    "ID Flow": totals.index.to_numpy(),
+                    "Estimación": np.round(estimate, 2),
+                    "Límite Inferior": np.round(np.maximum(estimate - margin, 0), 2),
+                    "Límite Superior": np.round(estimate + margin, 2),
+                }
+            )
+        )
+    if not frames:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def preview_metrics(
+    data: dict[str, pd.DataFrame],
+    fraction: float = 0.1,
+    seed: int = 0,
+    min_flow_events: int = 100,
+    confidence: float = 0.95,
+    backend: str = "pandas",
+) -> dict[str, pd.DataFrame]:
+    """
+    Estimate all metrics of get_all_metrics_as_dict from a sample of the events.
+
+    The event tables are sampled with sample_events and the metrics computed on
+    the sample. Per-Flow totals and distinct counts are scaled by the inverse
+    inclusion rate of their Flow, period totals are weighted per row, and
+    cohort retention is measured on the users sampled in every Flow. Ratios
+    (conversion rates) are ratio estimates from the scaled totals. Users, age,
+    gender and skill metrics do not depend on the events and are exact.
+
+    Args:
+        data: Dictionary containing DataFrames by table name
+        fraction: Inclusion rate of the large Flows (0 < fraction <= 1)
+        seed: Seed of the hash-based sample (same seed, same sample)
+        min_flow_events: Flows with fewer events are kept whole
+        confidence: Confidence level of the intervals
+        backend: Execution backend for the grouped metrics
+
+    Returns:
+        Dictionary with the same metrics as get_all_metrics_as_dict plus
+        'Intervalos de Confianza' for the per-Flow estimates
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be in (0, 1], got {fraction}")
+
+    sample, rates = sample_events(data, fraction, seed, min_flow_events)
+    # Retention is measured once, on the users sampled in every Flow
+    users = data["users"]
+    in_all_flows = hash_uniform(users["id"].to_numpy(dtype=np.int64), seed) < fraction
+    metrics = compute_metrics(sample, backend, cohort_users=users[in_all_flows])
+
+    for name in PER_FLOW_METRICS:
+        metrics[name] = scale_per_flow(metrics[name], rates, [name])
+    metrics["Tasa de Conversión"] = calculate_conversion_rate(
+        metrics["Participantes Únicos"], metrics["Total Aplicaciones"]
+    )
+    metrics["Embudo de Conversión"] = scale_per_flow(
+        metrics["Embudo de Conversión"], rates, FUNNEL_COUNT_COLUMNS
+    )
+    metrics["Top Flows"] = flow_rankings(metrics)
+
+    applications = sample["resumes_exhibited"]
+    weighted = applications.assign(
+        peso=1.0 / applications["model_id"].map(rates).to_numpy(dtype=np.float64)
+    )
+    timeline = EventTimeline(weighted)
+    for name, granularity in (("Métricas por Mes", "month"), ("Métricas por Semana", "week")):
+        totals = aggregate_events(timeline, granularity, "Total Aplicaciones", value_column="peso")
+        metrics[name] = totals.assign(
+            **{"Total Aplicaciones": np.round(totals["Total Aplicaciones"]).astype(np.int64)}
+        )
+
+    retention = metrics["Retención por Cohorte"]
+    retention["Usuarios"] = np.round(retention["Usuarios"] / fraction).astype(np.int64)
+
+    metrics["Intervalos de Confianza"] = confidence_intervals(sample, rates, confidence)
+    return metrics
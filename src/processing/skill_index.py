@@ -0,0 +1,278 @@
+import numpy as np
+import pandas as pd
+
+from processing.skills import SkillCodes, SkillDictionary
+
+POSTING_KINDS = ("resume", "user")
+POSTING_DTYPE = np.dtype("<i8")
+
+
+def build_postings(
+    codes: np.ndarray, ids: np.ndarray, n_codes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build sorted, deduplicated posting lists from (skill code, id) pairs.
+
+    Args:
+        codes: Skill code of each pair
+        ids: Entity id of each pair
+        n_codes: Size of the skill dictionary
+
+    Returns:
+        Tuple (offsets, ids) where ids[offsets[c]:offsets[c + 1]] is the sorted
+        posting list of skill code c
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    order = np.lexsort((ids, codes))
+    codes, ids = codes[order], ids[order]
+
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = (codes[1:] != codes[:-1]) | (ids[1:] != ids[:-1])
+    codes, ids = codes[keep], ids[keep]
+
+    offsets = np.searchsorted(codes, np.arange(n_codes + 1))
+    return offsets, ids
+
+
+def intersect_postings(postings: list[np.ndarray]) -> np.ndarray:
+    """Intersect sorted posting lists, starting from the shortest one."""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for posting in postings[1:]:
+        if result.size == 0:
+            break
+        result = np.intersect1d(result, posting, assume_unique=True)
+    return result
+
+
+def union_postings(postings: list[np.ndarray]) -> np.ndarray:
+    """Union of sorted posting lists as a sorted unique array."""
+    if not postings:
+        return np.empty(0, dtype=POSTING_DTYPE)
+    return np.unique(np.concatenate(postings))
+
+
+class SkillIndex:
+    """
+    Inverted index from skill codes to resume and user posting lists.
+
+    Posting lists are stored CSR-style as sorted int64 arrays. Applications
+    (resumes_exhibited) are kept sorted by resume id to count matches per Flow.
+    """
+
+    def __init__(
+        self,
+        dictionary: SkillDictionary,
+        postings: dict[str, tuple[np.ndarray, np.ndarray]],
+        resumes_df: pd.DataFrame,
+        resumes_exhibited_df: pd.DataFrame,
+    ) -> None:
+        self.dictionary = dictionary
+        self.postings = postings
+
+        resume_ids = resumes_df["id"].to_numpy(dtype=np.int64)
+        resume_users = resumes_df["user_id"].to_numpy(dtype=np.int64)
+        order = np.argsort(resume_ids)
+        self._resume_ids = resume_ids[order]
+        self._resume_users = resume_users[order]
+
+        app_resumes = resumes_exhibited_df["resume_id"].to_numpy(dtype=np.int64)
+        app_flows = resumes_exhibited_df["model_id"].to_numpy(dtype=np.int64)
+        order = np.argsort(app_resumes, kind="stable")
+        self._app_resumes = app_resumes[order]
+        self._app_flows = app_flows[order]
+
+    @classmethod
+    def build(
+        cls, data: dict[str, pd.DataFrame], dictionary: SkillDictionary | None = None
+    ) -> "SkillIndex":
+        """
+        Build the index from resume and profile skills.
+
+        Resume postings come from resumes.skills. User postings combine the
+        skills of each user's resumes with profiles.skills.
+
+        Args:
+            data: Dictionary containing 'resumes', 'resumes_exhibited' and
+                  optionally 'profiles' DataFrames
+            dictionary: SkillDictionary to extend (a new one is created if omitted)
+
+        Returns:
+            SkillIndex ready to query
+        """
+        dictionary = dictionary if dictionary is not None else SkillDictionary()
+        resumes_df = data["resumes"]
+        resume_codes = dictionary.encode(
+            resumes_df["skills"], row_ids=resumes_df["id"].to_numpy()
+        )
+        resume_positions = resume_codes.row_positions()
+
+        user_codes = [resume_codes.codes]
+        user_ids = [resumes_df["user_id"].to_numpy(dtype=np.int64)[resume_positions]]
+
+        profiles_df = data.get("profiles")
+        if profiles_df is not None and not profiles_df.empty:
+            profile_codes: SkillCodes = dictionary.encode(
+                profiles_df["skills"], row_ids=profiles_df["user_id"].to_numpy()
+            )
+            user_codes.append(profile_codes.codes)
+            user_ids.append(
+                profile_codes.row_ids.astype(np.int64)[profile_codes.row_positions()]
+            )
+
+        postings = {
+            "resume": build_postings(
+                resume_codes.codes,
+                resume_codes.row_ids.astype(np.int64)[resume_positions],
+                len(dictionary),
+            ),
+            "user": build_postings(
+                np.concatenate(user_codes), np.concatenate(user_ids), len(dictionary)
+            ),
+        }
+        return cls(dictionary, postings, resumes_df, data["resumes_exhibited"])
+
+    def posting(self, skill: str, kind: str = "resume") -> np.ndarray:
+        """Sorted ids of resumes or users having a skill (empty if unknown)."""
+        code = self.dictionary.code(skill)
+        offsets, ids = self.postings[kind]
+        if code is None or code >= len(offsets) - 1:
+            return np.empty(0, dtype=POSTING_DTYPE)
+        return ids[offsets[code] : offsets[code + 1]]
+
+    def match(self, all_of=(), any_of=(), kind: str = "resume") -> np.ndarray:
+        """
+        Ids matching every skill in all_of and at least one skill in any_of.
+
+        Args:
+            all_of: Skills that must all be present (intersection)
+            any_of: Skills of which at least one must be present (union)
+            kind: 'resume' or 'user'
+
+        Returns:
+            Sorted array of matching ids
+        """
+        if kind not in POSTING_KINDS:
+            raise ValueError(f"Unknown posting kind {kind}")
+
+        postings = []
+        if all_of:
+            postings.append(
+                intersect_postings([self.posting(skill, kind) for skill in all_of])
+            )
+        if any_of:
+            postings.append(union_postings([self.posting(skill, kind) for skill in any_of]))
+        if not postings:
+            return np.empty(0, dtype=POSTING_DTYPE)
+        return intersect_postings(postings)
+
+    def resumes(self, all_of=(), any_of=()) -> np.ndarray:
+        """Sorted resume ids matching the skill query."""
+        return self.match(all_of, any_of, kind="resume")
+
+    def users(self, all_of=(), any_of=()) -> np.ndarray:
+        """Sorted user ids matching the skill query."""
+        return self.match(all_of, any_of, kind="user")
+
+    def flow_counts(self, all_of=(), any_of=()) -> pd.DataFrame:
+        """
+        Count applications and unique participants per Flow for a skill query.
+
+        Args:
+            all_of: Skills that must all be present in the resume
+            any_of: Skills of which at least one must be present in the resume
+
+        Returns:
+            DataFrame with columns: 'ID Flow', 'Aplicaciones', 'Participantes'
+        """
+        matched = self.resumes(all_of, any_of)
+        starts = np.searchsorted(self._app_resumes, matched, side="left")
+        ends = np.searchsorted(self._app_resumes, matched, side="right")
+        lengths = ends - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+
+        flows = self._app_flows[positions]
+        resumes = self._app_resumes[positions]
+        users = self._resume_users[np.searchsorted(self._resume_ids, resumes)]
+
+        flow_ids, applications = np.unique(flows, return_counts=True)
+        pairs = np.unique(np.stack([flows, users]), axis=1)
+        _, participants = np.unique(pairs[0], return_counts=True)
+
+        return pd.DataFrame(
+            {
+                "ID Flow": flow_ids,
+                "Aplicaciones": applications,
+                "Participantes": participants,
+            }
+        )
+
+    def to_records(self) -> list[dict]:
+        """Rows for the skill_postings table (one per skill code and kind)."""
+        skills = self.dictionary.skills
+        records = []
+        for kind, (offsets, ids) in self.postings.items():
+            for code, skill in enumerate(skills):
+                posting = ids[offsets[code] : offsets[code + 1]]
+                records.append(
+                    {
+                        "code": code,
+                        "kind": kind,
+                        "skill": skill,
+                        "ids": posting.astype(POSTING_DTYPE).tobytes(),
+                    }
+                )
+        return records
+
+    @classmethod
+    def from_records(
+        cls,
+        records: pd.DataFrame,
+        resumes_df: pd.DataFrame,
+        resumes_exhibited_df: pd.DataFrame,
+    ) -> "SkillIndex":
+        """
+        Rebuild an index from skill_postings rows and the persisted tables.
+
+        Args:
+            records: DataFrame with columns 'code', 'kind', 'skill', 'ids'
+            resumes_df: DataFrame with 'id' and 'user_id' columns
+            resumes_exhibited_df: DataFrame with 'resume_id' and 'model_id' columns
+
+        Returns:
+            SkillIndex equivalent to the one that produced the records
+        """
+        records = records.sort_values(["kind", "code"])
+        skills = records.drop_duplicates("code").sort_values("code")["skill"]
+        dictionary = SkillDictionary(list(skills))
+
+        postings = {}
+        for kind, rows in records.groupby("kind"):
+            arrays = [np.frombuffer(blob, dtype=POSTING_DTYPE) for blob in rows["ids"]]
+            lengths = np.fromiter((len(array) for array in arrays), dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(lengths)))
+            ids = np.concatenate(arrays) if arrays else np.empty(0, POSTING_DTYPE)
+            postings[kind] = (offsets, ids)
+
+        return cls(dictionary, postings, resumes_df, resumes_exhibited_df)
+
+
+def load_skill_index(engine) -> SkillIndex:
+    """
+    Load the persisted skill index from the database.
+
+    Args:
+        engine: SQLAlchemy engine bound to the clean database
+
+    Returns:
+        SkillIndex built from skill_postings, resumes and resumes_exhibited
+    """
+    records = pd.read_sql_table("skill_postings", engine)
+    resumes_df = pd.read_sql_table("resumes", engine, columns=["id", "user_id"])
+    resumes_exhibited_df = pd.read_sql_table(
+        "resumes_exhibited", engine, columns=["resume_id", "model_id"]
+    )
+    return SkillIndex.from_records(records, resumes_df, resumes_exhibited_df)
@@ -0,0 +1,235 @@
+import ast
+
+import numpy as np
+import pandas as pd
+
+from processing.rankings import top_k_indices
+
+SKILL_COLUMNS = {
+    "resumes": ["skills"],
+    "profiles": ["skills", "tools", "languages"],
+}
+
+
+def parse_skill_list(raw) -> list[str]:
+    """
+    Parse a stringified Python list of skills into normalized skill names.
+
+    Values like "['Python', 'Power BI, DAX']" are parsed with ast.literal_eval, so
+    skills containing commas or quotes are preserved. Malformed values fall back to
+    a plain comma split. Skills are stripped and lowercased; empty ones are dropped.
+
+    Args:
+        raw: Raw cell value (string, list or null)
+
+    Returns:
+        List of normalized skill names (empty list for nulls)
+    """
+    if isinstance(raw, (list, tuple, set, np.ndarray)):
+        values = list(raw)
+    elif not isinstance(raw, str):
+        return []
+    else:
+        text = raw.strip()
+        try:
+            values = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            values = text.strip("[]").split(",")
+        if isinstance(values, str) or not isinstance(values, (list, tuple, set)):
+            values = [values]
+
+    skills = (str(value).strip().strip("'\"").strip().lower() for value in values)
+    return [skill for skill in skills if skill]
+
+
+class SkillCodes:
+    """
+    Compact CSR-style storage of skill codes per row.
+
+    The skills of row i are codes[offsets[i]:offsets[i + 1]], where codes index
+    into the SkillDictionary that produced them.
+    """
+
+    def __init__(self, row_ids: np.ndarray, offsets: np.ndarray, codes: np.ndarray):
+        self.row_ids = row_ids
+        self.offsets = offsets
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> np.ndarray:
+        return self.codes[self.offsets[position] : self.offsets[position + 1]]
+
+    def lengths(self) -> np.ndarray:
+        """Number of skills per row."""
+        return np.diff(self.offsets)
+
+    def row_positions(self) -> np.ndarray:
+        """Row position of every entry in codes (same length as codes)."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+
+    def counts(self, minlength: int = 0) -> np.ndarray:
+        """Occurrences of each skill code across all rows."""
+        return np.bincount(self.codes, minlength=minlength)
+
+
+class SkillDictionary:
+    """
+    Interned skill vocabulary shared by every skill-like column.
+
+    Each distinct normalized skill gets a stable integer code in order of first
+    appearance, so columns encoded with the same dictionary are directly comparable.
+    """
+
+    def __init__(self, skills: list[str] | None = None) -> None:
+        self._skills: list[str] = []
+        self._codes: dict[str, int] = {}
+        for skill in skills or []:
+            self.intern(skill)
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self._codes
+
+    @property
+    def skills(self) -> np.ndarray:
+        """Skill names indexed by code."""
+        return np.array(self._skills, dtype=object)
+
+    def intern(self, skill: str) -> int:
+        """Return the code of a skill, assigning a new one if unseen."""
+        code = self._codes.get(skill)
+        if code is None:
+            code = len(self._skills)
+            self._codes[skill] = code
+            self._skills.append(skill)
+        return code
+
+    def code(self, skill: str) -> int | None:
+        """Return the code of a skill (normalized like the tokenizer) or None."""
+        return self._codes.get(skill.strip().lower())
+
+    def to_categorical(self, codes: np.ndarray) -> pd.Categorical:
+        """Wrap an array of codes as a pandas Categorical over this vocabulary."""
+        return pd.Categorical.from_codes(codes, categories=pd.Index(self._skills))
+
+    def encode(self, values: pd.Series, row_ids=None) -> SkillCodes:
+        """
+        Tokenize a column of stringified skill lists into compact code arrays.
+
+        Every distinct raw value is parsed only once; rows sharing a value reuse
+        its codes through a vectorized gather.
+
+        Args:
+            values: Series of raw skill lists (e.g. resumes['skills'])
+            row_ids: Optional ids identifying each row (defaults to the Series index)
+
+        Returns:
+            SkillCodes with one entry per row of values
+        """
+        labels, uniques = pd.factorize(values, use_na_sentinel=True)
+
+        unique_codes = [
+            [self.intern(skill) for skill in parse_skill_list(raw)] for raw in uniques
+        ]
+        unique_lengths = np.fromiter(
+            (len(codes) for codes in unique_codes), dtype=np.int64, count=len(uniques)
+        )
+        unique_offsets = np.concatenate(([0], np.cumsum(unique_lengths)))
+        flat_codes = np.fromiter(
+            (code for codes in unique_codes for code in codes),
+            dtype=np.int32,
+            count=int(unique_offsets[-1]),
+        )
+
+        labels = np.where(labels >= 0, labels, len(uniques))
+        unique_lengths = np.append(unique_lengths, 0)
+        unique_offsets = np.append(unique_offsets, unique_offsets[-1])
+
+        lengths = unique_lengths[labels]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        gather = np.repeat(unique_offsets[labels] - offsets[:-1], lengths) + np.arange(
+            offsets[-1], dtype=np.int64
+        )
+        codes = flat_codes[gather]
+
+        if row_ids is None:
+            row_ids = values.index
+        return SkillCodes(np.asarray(row_ids), offsets, codes)
+
+
+def encode_skill_columns(
+    data: dict[str, pd.DataFrame],
+    dictionary: SkillDictionary | None = None,
+    columns: dict[str, list[str]] = SKILL_COLUMNS,
+) -> dict[tuple[str, str], SkillCodes]:
+    """
+    Encode every skill-like column (SKILL_COLUMNS) with one shared dictionary.
+
+    Resumes are keyed by 'id' and profiles by 'user_id'.
+
+    Args:
+        data: Dictionary of DataFrames by table name
+        dictionary: SkillDictionary to extend (a new one is created if omitted)
+        columns: Columns to encode by table name
+
+    Returns:
+        Dictionary mapping (table, column) to SkillCodes
+    """
+    dictionary = dictionary if dictionary is not None else SkillDictionary()
+    encoded = {}
+    for table, table_columns in columns.items():
+        df = data.get(table)
+        if df is None or df.empty:
+            continue
+        key = "id" if "id" in df.columns else "user_id"
+        for column in table_columns:
+            if column in df.columns:
+                encoded[(table, column)] = dictionary.encode(
+                    df[column], row_ids=df[key].to_numpy()
+                )
+    return encoded
+
+
+def skill_counts(
+    encoded: SkillCodes, dictionary: SkillDictionary, top_n: int | None = None
+) -> pd.DataFrame:
+    """
+    Count skill occurrences with a bincount and select the most frequent ones.
+
+    Args:
+        encoded: SkillCodes produced by dictionary
+        dictionary: SkillDictionary used to encode
+        top_n: Maximum number of skills to return (all skills if None)
+
+    Returns:
+        DataFrame with columns: 'Skill', 'Cantidad' (sorted by count descending)
+    """
+    return rank_skill_counts(encoded.counts(minlength=len(dictionary)), dictionary, top_n)
+
+
+def rank_skill_counts(
+    counts: np.ndarray, dictionary: SkillDictionary, top_n: int | None = None
+) -> pd.DataFrame:
+    """
+    Rank per-code skill counts.
+
+    Only the candidates reaching the top_n-th count (found with np.argpartition)
+    are sorted. Ties keep the order in which skills were first interned.
+
+    Args:
+        counts: Occurrences indexed by skill code
+        dictionary: SkillDictionary the codes belong to
+        top_n: Maximum number of skills to return (all skills if None)
+
+    Returns:
+        DataFrame with columns: 'Skill', 'Cantidad' (sorted by count descending)
+    """
+    candidates = np.flatnonzero(counts)
+    order = candidates[top_k_indices([counts[candidates]], top_n)]
+    return pd.DataFrame(
+        {"Skill": dictionary.skills[order], "Cantidad": counts[order].astype(np.int64)}
+    )
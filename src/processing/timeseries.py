@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+
+PERIOD_COLUMNS = {
+    "day": "Día",
+    "week": "Semana",
+    "month": "Mes",
+    "quarter": "Trimestre",
+}
+
+EVENT_TABLES = {
+    "resumes_exhibited": ("Aplicaciones", None),
+    "votes": ("Votos", "value"),
+    "views": ("Visualizaciones", None),
+    "shares": ("Compartidos", None),
+}
+
+
+def to_day_codes(timestamps) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert timestamps to integer days since 1970-01-01.
+
+    Args:
+        timestamps: Series or array of timestamps or date strings
+
+    Returns:
+        Tuple (days, valid) with int64 day codes of the parseable values and the
+        boolean mask of parseable positions
+    """
+    parsed = pd.to_datetime(pd.Series(timestamps), errors="coerce")
+    valid = parsed.notna().to_numpy()
+    days = parsed[valid].to_numpy().astype("datetime64[D]").astype(np.int64)
+    return days, valid
+
+
+def day_to_period(days: np.ndarray, granularity: str) -> np.ndarray:
+    """
+    Map day codes to integer period codes.
+
+    Weeks are ISO weeks (Monday start) counted from 1969-12-29; months and
+    quarters are counted from January 1970.
+
+    Args:
+        days: int64 days since 1970-01-01
+        granularity: 'day', 'week', 'month' or 'quarter'
+
+    Returns:
+        int64 period codes
+    """
+    if granularity == "day":
+        return days
+    if granularity == "week":
+        return (days + 3) // 7
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if granularity == "month":
+        return months
+    if granularity == "quarter":
+        return months // 3
+    raise ValueError(f"Unknown granularity {granularity}")
+
+
+def period_labels(codes: np.ndarray, granularity: str) -> np.ndarray:
+    """
+    Format period codes as report labels.
+
+    Labels: day 'YYYY-MM-DD', week 'YYYY-WNN' (ISO year and week), month
+    'YYYY-MM', quarter 'YYYY-QN'.
+
+    Args:
+        codes: int64 period codes from day_to_period
+        granularity: 'day', 'week', 'month' or 'quarter'
+
+    Returns:
+        Array of label strings
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    if granularity == "day":
+        return np.datetime_as_string(codes.astype("datetime64[D]"), unit="D")
+    if granularity == "month":
+        return np.datetime_as_string(codes.astype("datetime64[M]"), unit="M")
+    if granularity == "quarter":
+        return np.array(
+            [f"{1970 + code // 4}-Q{code % 4 + 1}" for code in codes], dtype=object
+        )
+    if granularity == "week":
+        thursdays = codes * 7
+        years = thursdays.astype("datetime64[D]").astype("datetime64[Y]")
+        weeks = (thursdays - years.astype("datetime64[D]").astype(np.int64)) // 7 + 1
+        return np.array(
+            [
+                f"{year + 1970}-W{week:02d}"
+                for year, week in zip(years.astype(np.int64), weeks)
+            ],
+            dtype=object,
+        )
+    raise ValueError(f"Unknown granularity {granularity}")
+
+
+class EventTimeline:
+    """
+    Timestamps of one event table parsed once into integer codes.
+
+    Period codes for every granularity are derived lazily from the day codes and
+    cached, so month, week and quarter aggregations share a single parse.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        time_column: str = "created_at",
+        flow_column: str = "model_id",
+    ) -> None:
+        self.days, self.valid = to_day_codes(df[time_column])
+        self.flows = (
+            df[flow_column].to_numpy()[self.valid] if flow_column in df.columns else None
+        )
+        self.df = df
+        self._periods: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def periods(self, granularity: str) -> np.ndarray:
+        """Period codes of the valid rows at the given granularity."""
+        if granularity not in self._periods:
+            self._periods[granularity] = day_to_period(self.days, granularity)
+        return self._periods[granularity]
+
+    def values(self, column: str) -> np.ndarray:
+        """Values of a column for the valid rows."""
+        return self.df[column].to_numpy()[self.valid]
+
+
+def group_periods(
+    timeline: EventTimeline,
+    granularity: str,
+    by_flow: bool = False,
+    value_column: str | None = None,
+) -> tuple[np.ndarray, np.ndarray | None, np.ndarray]:
+    """
+    Aggregate one timeline on integer keys.
+
+    Args:
+        timeline: EventTimeline of the event table
+        granularity: 'day', 'week', 'month' or 'quarter'
+        by_flow: Split the aggregation per Flow
+        value_column: Column to sum (rows are counted if None)
+
+    Returns:
+        Tuple (periods, flows, totals) sorted by flow then period; flows is None
+        when by_flow is False
+    """
+    periods = timeline.periods(granularity)
+    weights = timeline.values(value_column) if value_column else None
+
+    if by_flow:
+        keys = np.stack([timeline.flows.astype(np.int64), periods])
+        unique_keys, inverse = np.unique(keys, axis=1, return_inverse=True)
+        flows, periods_out = unique_keys[0], unique_keys[1]
+    else:
+        periods_out, inverse = np.unique(periods, return_inverse=True)
+        flows = None
+
+    totals = np.bincount(inverse.ravel(), weights=weights, minlength=len(periods_out))
+    if weights is None:
+        totals = totals.astype(np.int64)
+    return periods_out, flows, totals
+
+
+def aggregate_events(
+    timeline: EventTimeline,
+    granularity: str,
+    value_name: str,
+    by_flow: bool = False,
+    value_column: str | None = None,
+) -> pd.DataFrame:
+    """
+    Count (or sum) one event table per period, optionally per Flow.
+
+    Args:
+        timeline: EventTimeline of the event table
+        granularity: 'day', 'week', 'month' or 'quarter'
+        value_name: Name of the output value column
+        by_flow: Split the aggregation per Flow
+        value_column: Column to sum (rows are counted if None)
+
+    Returns:
+        DataFrame with columns: period label (e.g. 'Mes'), ['ID Flow'], value_name
+    """
+    periods, flows, totals = group_periods(timeline, granularity, by_flow, value_column)
+    result = {PERIOD_COLUMNS[granularity]: period_labels(periods, granularity)}
+    if by_flow:
+        result["ID Flow"] = flows
+    result[value_name] = totals
+    return pd.DataFrame(result)
+
+
+def build_timelines(data: dict[str, pd.DataFrame]) -> dict[str, EventTimeline]:
+    """
+    Parse the timestamps of every event table (EVENT_TABLES) once.
+
+    Args:
+        data: Dictionary of DataFrames by table name
+
+    Returns:
+        Dictionary mapping table name to its EventTimeline
+    """
+    return {
+        table: EventTimeline(data[table])
+        for table in EVENT_TABLES
+        if data.get(table) is not None and not data[table].empty
+    }
+
+
+def period_metrics(
+    timelines: dict[str, EventTimeline], granularity: str, by_flow: bool = False
+) -> pd.DataFrame:
+    """
+    Aggregate applications, votes, views and shares per period in one table.
+
+    Every table is aggregated on integer keys, aligned on the union of keys and
+    only then labeled.
+
+    Args:
+        timelines: Dictionary from build_timelines
+        granularity: 'day', 'week', 'month' or 'quarter'
+        by_flow: Split the aggregation per Flow
+
+    Returns:
+        DataFrame with columns: period label, ['ID Flow'], and one column per
+        event table ('Aplicaciones', 'Votos', 'Visualizaciones', 'Compartidos')
+    """
+    grouped = {
+        table: group_periods(timeline, granularity, by_flow, EVENT_TABLES[table][1])
+        for table, timeline in timelines.items()
+    }
+
+    rows = 2 if by_flow else 1
+    table_keys = [
+        np.stack([flows, periods]) if by_flow else periods[np.newaxis, :]
+        for periods, flows, _ in grouped.values()
+    ]
+    all_keys = (
+        np.concatenate(table_keys, axis=1) if table_keys else np.empty((rows, 0), np.int64)
+    )
+    keys, inverse = np.unique(all_keys.astype(np.int64), axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    bounds = np.cumsum([0] + [key.shape[1] for key in table_keys])
+    positions = {
+        table: inverse[bounds[i] : bounds[i + 1]] for i, table in enumerate(grouped)
+    }
+
+    result = {PERIOD_COLUMNS[granularity]: period_labels(keys[-1], granularity)}
+    if by_flow:
+        result["ID Flow"] = keys[0]
+    for table, (value_name, value_column) in EVENT_TABLES.items():
+        column = np.zeros(keys.shape[1], dtype=np.float64 if value_column else np.int64)
+        if table in grouped:
+            column[positions[table]] = grouped[table][2]
+        result[value_name] = column
+    return pd.DataFrame(result)
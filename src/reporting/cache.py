@@ -0,0 +1,216 @@
+import hashlib
+import os
+import struct
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from reporting.charts import ChartSpec, RenderedChart, render_charts
+
+ARTIFACTS_DIR = "artifacts"
+KEEP_REPORTS = 10
+
+
+def digest(*parts) -> str:
+    """Hex BLAKE2b digest of the given parts (bytes or str)."""
+    hasher = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """
+    Content fingerprint of a DataFrame (column names, dtypes and values).
+
+    Values are hashed with pandas' vectorized row hashing, so fingerprinting is
+    linear in the size of the frame and independent of the index.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return digest(
+        "|".join(map(str, df.columns)), "|".join(map(str, df.dtypes)), row_hashes.tobytes()
+    )
+
+
+def fingerprint_metrics(metrics: dict[str, pd.DataFrame]) -> dict[str, str]:
+    """Fingerprint of every metric DataFrame, by metric name."""
+    return {name: fingerprint_frame(df) for name, df in metrics.items()}
+
+
+def report_key(fingerprints: dict[str, str], version: str) -> str:
+    """Key of a whole report: every section fingerprint plus the template version."""
+    return digest(version, *(f"{name}={fp}" for name, fp in fingerprints.items()))
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of report artifacts on the local filesystem.
+
+    Blobs live in objects/<hash[:2]>/<hash>, named by the hash of their content,
+    so identical artifacts are stored once. Logical names (e.g. a report key)
+    point to blobs through small files in refs/. Every write goes to a temporary
+    file followed by an atomic rename.
+
+    Reading or writing a name stamps its ref with the current time, and every
+    report build records when it started in reports/. collect keeps the refs
+    stamped since the build of the oldest of the last N reports started, which
+    covers every artifact those builds used, and removes older refs and the
+    blobs no ref points to.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        (self.root / "refs").mkdir(parents=True, exist_ok=True)
+        (self.root / "reports").mkdir(parents=True, exist_ok=True)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _touch(self, path: Path) -> None:
+        # Stamped with time.time_ns explicitly: filesystem timestamps come from a coarser clock
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def _ref_path(self, name: str) -> Path:
+        return self.root / "refs" / digest(name)
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.root / "objects" / content_hash[:2] / content_hash
+
+    def put(self, name: str, data: bytes) -> str:
+        """Store data under a logical name and return its content hash."""
+        content_hash = digest(data)
+        path = self._object_path(content_hash)
+        if not path.exists():
+            self._write(path, data)
+        ref = self._ref_path(name)
+        self._write(ref, content_hash.encode("ascii"))
+        self._touch(ref)
+        return content_hash
+
+    def get(self, name: str) -> bytes | None:
+        """Bytes stored under a logical name, or None if missing."""
+        ref = self._ref_path(name)
+        try:
+            content_hash = ref.read_text()
+            data = self._object_path(content_hash).read_bytes()
+            self._touch(ref)
+            return data
+        except FileNotFoundError:
+            return None
+
+    def __contains__(self, name: str) -> bool:
+        ref = self._ref_path(name)
+        try:
+            self._touch(ref)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def add_report(self, key: str, started_ns: int) -> None:
+        """Record that the report key was built (or reused) by a build started at started_ns."""
+        self._write(self.root / "reports" / key, str(started_ns).encode("ascii"))
+
+    def collect(self, keep: int = KEEP_REPORTS) -> int:
+        """
+        Remove the artifacts not used by the last keep reports.
+
+        Args:
+            keep: Most recent reports (by build start) whose artifacts are kept
+
+        Returns:
+            Number of blobs removed
+        """
+        if keep < 1:
+            raise ValueError(f"keep must be at least 1, got {keep}")
+        reports = sorted(
+            (
+                (int(path.read_text()), path)
+                for path in (self.root / "reports").iterdir()
+                if not path.name.startswith(".")
+            ),
+            reverse=True,
+        )
+        if len(reports) <= keep:
+            return 0
+        cutoff = reports[keep - 1][0]
+        for _, path in reports[keep:]:
+            path.unlink(missing_ok=True)
+
+        live = set()
+        for ref in (self.root / "refs").iterdir():
+            if ref.name.startswith("."):
+                continue
+            if ref.stat().st_mtime_ns < cutoff:
+                ref.unlink(missing_ok=True)
+            else:
+                live.add(ref.read_text())
+        removed = 0
+        for blob in (self.root / "objects").glob("*/*"):
+            if not blob.name.startswith(".") and blob.name not in live:
+                blob.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def mark(self, name: str) -> None:
+        """Record a marker (e.g. 'sent:<report key>')."""
+        self.put(name, b"")
+
+
+def cached_csv_report(
+    metrics: dict[str, pd.DataFrame], fingerprints: dict[str, str], store: ArtifactStore
+) -> bytes:
+    """
+    Build the CSV report (same format as create_csv_report) section by section.
+
+    Each section is cached by its metric name and fingerprint, so only the
+    sections whose DataFrame changed are formatted again.
+    """
+    from reporting.documents import csv_section
+
+    sections = []
+    for title, df in metrics.items():
+        name = f"csv-section:{title}:{fingerprints[title]}"
+        section = store.get(name)
+        if section is None:
+            section = csv_section(title, df)
+            store.put(name, section)
+        sections.append(section)
+    return b"".join(sections)
+
+
+def encode_chart(chart: RenderedChart) -> bytes:
+    return struct.pack("<II", chart.width, chart.height) + chart.data
+
+
+def decode_chart(name: str, data: bytes) -> RenderedChart:
+    width, height = struct.unpack_from("<II", data)
+    return RenderedChart(name, width, height, data[8:])
+
+
+def cached_render_charts(
+    specs: list[ChartSpec],
+    store: ArtifactStore,
+    dpi: int,
+    processes: int | None = None,
+) -> list[RenderedChart]:
+    """
+    Render charts, reusing the stored raster of every unchanged chart.
+
+    A chart is keyed by its full spec (data, labels, colors) and DPI; only the
+    missing ones are rendered (optionally in a process pool) and stored.
+    """
+    names = [f"chart:{dpi}:{digest(repr(tuple(spec)))}" for spec in specs]
+    charts = [store.get(name) for name in names]
+    missing = [i for i, chart in enumerate(charts) if chart is None]
+    rendered = render_charts([specs[i] for i in missing], dpi, processes)
+    for i, chart in zip(missing, rendered):
+        store.put(names[i], encode_chart(chart))
+        charts[i] = encode_chart(chart)
+    return [decode_chart(spec.name, data) for spec, data in zip(specs, charts)]
@@ -0,0 +1,112 @@
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, NamedTuple, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from fpdf import FPDF
+    from matplotlib.figure import Figure
+
+DEFAULT_DPI = 100
+
+
+class ChartSpec(NamedTuple):
+    """Data and labels of a bar chart, picklable to render in worker processes."""
+
+    name: str
+    title: str
+    labels: Sequence
+    values: Sequence
+    xlabel: str
+    ylabel: str
+    color: str = "#4c72b0"
+
+
+class RenderedChart(NamedTuple):
+    """Chart pixels as Flate-compressed 8-bit RGB, ready to embed in a PDF."""
+
+    name: str
+    width: int
+    height: int
+    data: bytes
+
+
+def figure_to_chart(name: str, fig: "Figure", dpi: int = DEFAULT_DPI) -> RenderedChart:
+    """
+    Rasterize a figure with the Agg canvas into an in-memory RGB buffer.
+
+    Args:
+        name: Image name inside the PDF
+        fig: Figure to rasterize
+        dpi: Resolution of the raster
+
+    Returns:
+        RenderedChart with the compressed pixels
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig.set_dpi(dpi)
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    rgba = np.asarray(canvas.buffer_rgba())
+    height, width = rgba.shape[:2]
+    rgb = np.ascontiguousarray(rgba[:, :, :3])
+    return RenderedChart(name, width, height, zlib.compress(rgb.tobytes(), 6))
+
+
+def render_chart(spec: ChartSpec, dpi: int = DEFAULT_DPI) -> RenderedChart:
+    """
+    Draw a bar chart without pyplot (no global state, safe in any process).
+
+    Args:
+        spec: Chart data and labels
+        dpi: Resolution of the raster
+
+    Returns:
+        RenderedChart with the compressed pixels
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.add_subplot()
+    ax.bar([str(label) for label in spec.labels], spec.values, color=spec.color)
+    ax.set_title(spec.title)
+    ax.set_xlabel(spec.xlabel)
+    ax.set_ylabel(spec.ylabel)
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    return figure_to_chart(spec.name, fig, dpi)
+
+
+def render_charts(
+    specs: list[ChartSpec], dpi: int = DEFAULT_DPI, processes: int | None = None
+) -> list[RenderedChart]:
+    """
+    Render several charts, optionally in a process pool.
+
+    Args:
+        specs: Charts to render
+        dpi: Resolution of the rasters
+        processes: Worker processes (renders serially if None or 1)
+
+    Returns:
+        RenderedCharts in the same order as specs
+    """
+    if not processes or processes <= 1 or len(specs) <= 1:
+        return [render_chart(spec, dpi) for spec in specs]
+    chunksize = max(1, len(specs) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(render_chart, specs, [dpi] * len(specs), chunksize=chunksize))
+
+
+def add_chart(pdf: "FPDF", chart: RenderedChart, w: float = 170) -> None:
+    """
+    Place a rendered chart at the current position of the document.
+
+    The pixels are registered directly as a PDF image XObject (DeviceRGB,
+    FlateDecode), so no PNG file is written or parsed.
+    """
+    from reporting.tables import RawPDF
+
+    pdf.image(RawPDF(pdf).register_image(chart.name, chart.width, chart.height, chart.data), w=w)
@@ -0,0 +1,116 @@
+import io
+import sys
+
+import pandas as pd
+from fpdf import FPDF
+
+from reporting.charts import DEFAULT_DPI, RenderedChart, add_chart, figure_to_chart
+from reporting.export import write_csv_report
+from reporting.tables import FontMetrics, render_table
+
+TABLE_MAX_ROWS = 100
+
+
+class PDFReport(FPDF):
+    report_title = "Reporte de Métricas"
+
+    def header(self):
+        self.set_font("Arial", "B", 14)
+        self.cell(0, 10, self.report_title, 0, 1, "C")
+        self.ln(3)
+
+    def add_title(self, title):
+        self.set_font("Arial", "B", 12)
+        self.cell(0, 10, title, 0, 1)
+        self.ln(2)
+
+    def add_paragraph(self, text):
+        self.set_font("Arial", "", 10)
+        self.multi_cell(0, 6, text)
+        self.ln(2)
+
+    def add_table(self, df: pd.DataFrame, max_rows: int | None = TABLE_MAX_ROWS):
+        if df.empty:
+            self.add_paragraph("No hay datos disponibles.")
+            return
+
+        if not hasattr(self, "font_metrics"):
+            self.font_metrics = FontMetrics(self)
+        render_table(self, df, max_rows=max_rows, metrics=self.font_metrics)
+        self.ln(5)
+
+    def add_figure(self, fig, dpi: int = DEFAULT_DPI):
+        """Rasterize and add a figure, closing it if it was created with pyplot."""
+        chart = figure_to_chart(f"figure-{len(self.images)}", fig, dpi)
+        pyplot = sys.modules.get("matplotlib.pyplot")  # only pyplot figures need closing
+        if pyplot is not None:
+            pyplot.close(fig)
+        self.add_chart(chart)
+
+    def add_chart(self, chart: RenderedChart):
+        add_chart(self, chart, w=170)
+        self.ln(5)
+
+
+def transform_metrics(dataframes: dict):
+    def merge_metrics(df_main: pd.DataFrame, df_metric: pd.DataFrame):
+        return df_main.merge(df_metric, on="ID Flow", how="left")
+
+    kpis = dataframes["Participantes Únicos"]
+    kpis = merge_metrics(kpis, dataframes["Total Aplicaciones"])
+    kpis = merge_metrics(kpis, dataframes["Votos Totales"])
+    kpis = merge_metrics(kpis, dataframes["Compartidos"])
+    kpis = merge_metrics(kpis, dataframes["Visualizaciones Únicas"])
+    kpis = merge_metrics(kpis, dataframes["Visualizaciones Totales"])
+    kpis = merge_metrics(
+        kpis,
+        dataframes["Embudo de Conversión"][
+            [
+                "ID Flow",
+                "Vieron y Aplicaron",
+                "Aplicantes que Votaron",
+                "Conversión Vista-Aplicación",
+            ]
+        ],
+    )
+    kpis = kpis.fillna(0)
+    kpis["ID Flow"] = kpis["ID Flow"].astype(str)
+
+    kpis = kpis.rename(
+        columns={
+            "Participantes Únicos": "Participantes",
+            "Total Aplicaciones": "Aplicaciones",
+            "Votos Totales": "Votos",
+            "Visualizaciones Únicas": "V. Unicas",
+            "Visualizaciones Totales": "V. Totales",
+            "Vieron y Aplicaron": "V. y Aplic.",
+            "Aplicantes que Votaron": "Aplic. Votaron",
+            "Conversión Vista-Aplicación": "Conv. %",
+        }
+    )
+
+    return kpis
+
+
+def csv_section(title: str, df_metric: pd.DataFrame) -> bytes:
+    """One CSV report section: header line, table and blank separator lines."""
+    buffer = io.BytesIO()
+    write_csv_report({title: df_metric}, buffer)
+    return buffer.getvalue()
+
+
+def create_csv_report(data: dict[str, pd.DataFrame]):
+    """
+    Write multiple dataframes to a single CSV file with section headers.
+
+    Each metric is preceded by a header line "-- metric_name --" followed by
+    the dataframe content and blank lines for separation. The report is
+    encoded straight into a bytes buffer; use reporting.export.write_csv_report
+    to stream it to a file or socket instead.
+
+    Args:
+        data: Dictionary mapping metric names to their DataFrames
+    """
+    buffer = io.BytesIO()
+    write_csv_report(data, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,168 @@
+import gzip
+import io
+import re
+import unicodedata
+import zipfile
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+import pandas as pd
+
+EXPORT_CHUNK_ROWS = 50_000
+COMPRESSIONS = (None, "gzip", "zip")
+METRIC_FORMATS = ("jsonl", "parquet")
+
+MetricSource = pd.DataFrame | Iterable[pd.DataFrame]
+
+
+def metric_slug(title: str) -> str:
+    """File-name friendly form of a metric title ('Distribución por Género' -> 'distribucion_por_genero')."""
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", ascii_title.lower()).strip("_")
+
+
+def iter_chunks(source: MetricSource, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Split a metric into DataFrames of at most chunk_rows rows.
+
+    A DataFrame is sliced by position; any other iterable is assumed to already
+    yield DataFrame chunks (e.g. a chunked SQL query) and is passed through, so
+    a metric never has to be materialized in full. An empty metric yields one
+    empty chunk so its columns are still written.
+    """
+    if isinstance(source, pd.DataFrame):
+        if source.empty:
+            yield source
+            return
+        for start in range(0, len(source), chunk_rows):
+            yield source.iloc[start : start + chunk_rows]
+    else:
+        yield from source
+
+
+def _open_target(stack: ExitStack, target: str | Path | BinaryIO) -> BinaryIO:
+    if isinstance(target, (str, Path)):
+        return stack.enter_context(open(target, "wb"))
+    return target
+
+
+def _check_compression(compression: str | None) -> None:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {COMPRESSIONS}")
+
+
+def _compressed(stack: ExitStack, raw: BinaryIO, compression: str | None, member: str) -> BinaryIO:
+    if compression == "gzip":
+        return stack.enter_context(gzip.GzipFile(fileobj=raw, mode="wb", mtime=0))
+    if compression == "zip":
+        archive = stack.enter_context(zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED))
+        return stack.enter_context(archive.open(member, "w", force_zip64=True))
+    return raw
+
+
+def write_csv_report(
+    metrics: dict[str, MetricSource],
+    target: str | Path | BinaryIO,
+    compression: str | None = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> None:
+    """
+    Stream the CSV report (same layout as create_csv_report) to a file or stream.
+
+    Rows are encoded chunk by chunk straight into the target, so memory use is
+    bounded by chunk_rows regardless of the size of the metric tables.
+
+    Args:
+        metrics: Dictionary mapping metric names to DataFrames or iterables of chunks
+        target: Output path or writable binary stream (e.g. socket.makefile("wb"))
+        compression: None, "gzip" or "zip" (a single metrics.csv member)
+        chunk_rows: Rows encoded per write
+    """
+    _check_compression(compression)
+    with ExitStack() as stack:
+        raw = _open_target(stack, target)
+        stream = _compressed(stack, raw, compression, "metrics.csv")
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=True)
+        try:
+            for title, source in metrics.items():
+                text.write(f" -- {title} --\n")
+                for i, chunk in enumerate(iter_chunks(source, chunk_rows)):
+                    chunk.to_csv(text, index=False, header=i == 0)
+                text.write("\n\n")
+        finally:
+            # Detach so closing the wrapper never closes a caller-owned stream
+            text.flush()
+            text.detach()
+        stream.flush()
+
+
+def _write_jsonl(source: MetricSource, path: Path, compression: str | None, chunk_rows: int) -> None:
+    with ExitStack() as stack:
+        raw = _open_target(stack, path)
+        stream = _compressed(stack, raw, compression, path.name.removesuffix(".zip"))
+        for chunk in iter_chunks(source, chunk_rows):
+            if not chunk.empty:
+                lines = chunk.to_json(orient="records", lines=True, date_format="iso", force_ascii=False)
+                stream.write(lines.encode("utf-8"))
+                if not lines.endswith("\n"):
+                    stream.write(b"\n")
+
+
+def _write_parquet(source: MetricSource, path: Path, compression: str | None, chunk_rows: int) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in iter_chunks(source, chunk_rows):
+            schema = writer.schema if writer is not None else None
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=compression or "none")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_metrics(
+    metrics: dict[str, MetricSource],
+    output_dir: str | Path,
+    fmt: str = "jsonl",
+    compression: str | None = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> dict[str, Path]:
+    """
+    Write one file per metric for downstream tools.
+
+    Args:
+        metrics: Dictionary mapping metric names to DataFrames or iterables of chunks
+        output_dir: Directory for the files (created if missing)
+        fmt: "jsonl" (JSON Lines) or "parquet" (one row group per chunk)
+        compression: For JSON Lines None, "gzip" or "zip"; for Parquet a Parquet
+            codec such as "gzip", "snappy" or "zstd"
+        chunk_rows: Rows converted per write
+
+    Returns:
+        Dictionary mapping metric names to the written paths
+    """
+    if fmt not in METRIC_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {METRIC_FORMATS}")
+    if fmt == "jsonl":
+        _check_compression(compression)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {}
+    for title, source in metrics.items():
+        if fmt == "parquet":
+            path = output_dir / f"{metric_slug(title)}.parquet"
+            _write_parquet(source, path, compression, chunk_rows)
+        else:
+            suffix = {None: "", "gzip": ".gz", "zip": ".zip"}[compression]
+            path = output_dir / f"{metric_slug(title)}.jsonl{suffix}"
+            _write_jsonl(source, path, compression, chunk_rows)
+        paths[title] = path
+    return paths
+
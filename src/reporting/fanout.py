@@ -0,0 +1,187 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from processing.demographics import demographic_crosstab
+from processing.matching import SkillMatcher
+from processing.metrics import get_all_metrics_as_dict
+from processing.rankings import REPORT_TOP_K
+from processing.timeseries import EventTimeline, aggregate_events
+from reporting.charts import DEFAULT_DPI, ChartSpec, render_chart
+from reporting.documents import PDFReport, create_csv_report, transform_metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FanOutSummary(NamedTuple):
+    """Outcome of a per-Flow report fan-out."""
+
+    reports: int
+    seconds: float
+    reports_per_second: float
+    output_dir: Path
+
+
+def flow_report_tables(
+    data: dict[str, pd.DataFrame], metrics: dict[str, pd.DataFrame] | None = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Build every per-Flow table of the Flow reports, all Flows at once.
+
+    Args:
+        data: Dictionary of DataFrames by table name
+        metrics: Output of get_all_metrics_as_dict (computed if None)
+
+    Returns:
+        Dictionary mapping section names to DataFrames with an 'ID Flow' column
+    """
+    metrics = metrics if metrics is not None else get_all_metrics_as_dict(data)
+    kpis = transform_metrics(metrics)
+    kpis["ID Flow"] = kpis["ID Flow"].astype(np.int64)
+    return {
+        "KPIs": kpis,
+        "Embudo de Conversión": metrics["Embudo de Conversión"],
+        "Aplicaciones por Mes": aggregate_events(
+            EventTimeline(data["resumes_exhibited"]), "month", "Total Aplicaciones", by_flow=True
+        )[["ID Flow", "Mes", "Total Aplicaciones"]],
+        "Skills de Aplicantes": SkillMatcher.build(data).flow_skills(top_n=REPORT_TOP_K),
+        "Edad y Género": demographic_crosstab(data, ("age", "gender"), per_flow=True),
+    }
+
+
+class FlowPartition:
+    """
+    Row positions of every per-Flow table, grouped by 'ID Flow' once.
+
+    Each table is sorted by Flow a single time; the rows of a Flow are then a
+    contiguous slice of that order, so extracting a Flow never scans or filters
+    the full tables.
+    """
+
+    def __init__(self, tables: dict[str, pd.DataFrame]) -> None:
+        self.tables = tables
+        self.groups = {}
+        flow_ids = []
+        for name, df in tables.items():
+            keys = df["ID Flow"].to_numpy(dtype=np.int64)
+            order = np.argsort(keys, kind="stable")
+            flows, starts = np.unique(keys[order], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.groups[name] = (flows, starts, ends, order)
+            flow_ids.append(flows)
+        self.flow_ids = np.unique(np.concatenate(flow_ids)) if flow_ids else np.empty(0, np.int64)
+
+    def tables_for(self, flow_id: int) -> dict[str, pd.DataFrame]:
+        """Rows of every table belonging to one Flow."""
+        result = {}
+        for name, (flows, starts, ends, order) in self.groups.items():
+            position = np.searchsorted(flows, flow_id)
+            if position < len(flows) and flows[position] == flow_id:
+                rows = order[starts[position] : ends[position]]
+            else:
+                rows = order[:0]
+            result[name] = self.tables[name].iloc[rows].reset_index(drop=True)
+        return result
+
+
+def generate_flow_pdf(flow_id: int, tables: dict[str, pd.DataFrame], dpi: int = DEFAULT_DPI) -> bytes:
+    """
+    Render the PDF report of one Flow.
+
+    Args:
+        flow_id: Flow of the report
+        tables: Tables of the Flow from FlowPartition.tables_for
+        dpi: Resolution of the charts
+
+    Returns:
+        PDF document as bytes
+    """
+    pdf = PDFReport()
+    pdf.report_title = f"Reporte del Flow {flow_id}"
+    pdf.set_auto_page_break(auto=True, margin=10)
+    pdf.add_page()
+
+    for name, df in tables.items():
+        pdf.add_title(name)
+        df = df.drop(columns="ID Flow")
+        if name == "Aplicaciones por Mes" and not df.empty:
+            pdf.add_chart(
+                render_chart(
+                    ChartSpec(
+                        f"flow-{flow_id}-mes",
+                        "Aplicaciones por Mes",
+                        df["Mes"].tolist(),
+                        df["Total Aplicaciones"].tolist(),
+                        "Mes",
+                        "Total Aplicaciones",
+                    ),
+                    dpi,
+                )
+            )
+        else:
+            pdf.add_table(df)
+    return pdf.output(dest="S").encode("latin1")
+
+
+def write_flow_report(
+    flow_id: int, tables: dict[str, pd.DataFrame], output_dir: Path, dpi: int = DEFAULT_DPI
+) -> tuple[Path, Path]:
+    """Write flow_<id>.csv and flow_<id>.pdf to output_dir."""
+    csv_path = output_dir / f"flow_{flow_id}.csv"
+    pdf_path = output_dir / f"flow_{flow_id}.pdf"
+    csv_path.write_bytes(create_csv_report(tables))
+    pdf_path.write_bytes(generate_flow_pdf(flow_id, tables, dpi))
+    return csv_path, pdf_path
+
+
+def fan_out_flow_reports(
+    data: dict[str, pd.DataFrame],
+    output_dir: str | Path,
+    metrics: dict[str, pd.DataFrame] | None = None,
+    flow_ids=None,
+    processes: int | None = None,
+    dpi: int = DEFAULT_DPI,
+) -> FanOutSummary:
+    """
+    Write one CSV and one PDF report per Flow.
+
+    The per-Flow tables are computed once for all Flows and partitioned with
+    FlowPartition; each worker only receives the small tables of its Flow.
+
+    Args:
+        data: Dictionary of DataFrames by table name
+        output_dir: Directory for flow_<id>.csv and flow_<id>.pdf (created if missing)
+        metrics: Output of get_all_metrics_as_dict (computed if None)
+        flow_ids: Flows to report (all Flows if None)
+        processes: Worker processes (renders in this process if None or 1)
+        dpi: Resolution of the charts
+
+    Returns:
+        FanOutSummary with the number of reports and the throughput
+    """
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    partition = FlowPartition(flow_report_tables(data, metrics))
+    flows = partition.flow_ids if flow_ids is None else np.asarray(flow_ids, dtype=np.int64)
+    tasks = [partition.tables_for(flow_id) for flow_id in flows]
+    args = (list(flows), tasks, [output_dir] * len(flows), [dpi] * len(flows))
+
+    if not processes or processes <= 1:
+        for flow_args in zip(*args):
+            write_flow_report(*flow_args)
+    else:
+        chunksize = max(1, len(flows) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            list(pool.map(write_flow_report, *args, chunksize=chunksize))
+
+    seconds = time.perf_counter() - start
+    rate = len(flows) / seconds if seconds > 0 else 0.0
+    logger.info(f"Wrote {len(flows)} Flow reports to {output_dir} ({rate:.1f} reports/s)")
+    return FanOutSummary(len(flows), seconds, rate, output_dir)
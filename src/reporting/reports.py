@@ -1,90 +1,39 @@
-import io
-import tempfile
+import time
+
 import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime
-from fpdf import FPDF
 
+from delivery.outbox import Attachment, Outbox
 from processing.metrics import get_all_metrics_as_dict
-from utils.sengrid import sendgrid_service
-from config import settings
-
-
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font("Arial", "B", 14)
-        self.cell(0, 10, "Reporte de Métricas", 0, 1, "C")
-        self.ln(3)
-
-    def add_title(self, title):
-        self.set_font("Arial", "B", 12)
-        self.cell(0, 10, title, 0, 1)
-        self.ln(2)
-
-    def add_paragraph(self, text):
-        self.set_font("Arial", "", 10)
-        self.multi_cell(0, 6, text)
-        self.ln(2)
-
-    def add_table(self, df: pd.DataFrame):
-        if df.empty:
-            self.add_paragraph("No hay datos disponibles.")
-            return
-
-        self.set_font("Arial", "B", 9)
-        col_width = self.w / (len(df.columns) + 1)
-        for col in df.columns:
-            self.cell(col_width, 8, str(col), border=1)
-        self.ln()
-        self.set_font("Arial", "", 9)
-        for _, row in df.iterrows():
-            for item in row:
-                self.cell(col_width, 8, str(item), border=1)
-            self.ln()
-        self.ln(5)
-
-    def add_figure(self, fig):
-        with tempfile.NamedTemporaryFile(suffix=".png") as tmpfile:
-            fig.savefig(tmpfile.name, bbox_inches="tight")
-            self.image(tmpfile.name, w=170)
-            plt.close(fig)
-        self.ln(5)
-
-
-def transform_metrics(dataframes: dict):
-    def merge_metrics(df_main: pd.DataFrame, df_metric: pd.DataFrame):
-        return df_main.merge(df_metric, on="ID Flow", how="left")
-
-    kpis = dataframes["Participantes Únicos"]
-    kpis = merge_metrics(kpis, dataframes["Total Aplicaciones"])
-    kpis = merge_metrics(kpis, dataframes["Votos Totales"])
-    kpis = merge_metrics(kpis, dataframes["Compartidos"])
-    kpis = merge_metrics(kpis, dataframes["Visualizaciones Únicas"])
-    kpis = merge_metrics(kpis, dataframes["Visualizaciones Totales"])
-    kpis = kpis.fillna(0)
-    kpis["ID Flow"] = kpis["ID Flow"].astype(str)
-
-    kpis = kpis.rename(
-        columns={
-            "Participantes Únicos": "Participantes",
-            "Total Aplicaciones": "Aplicaciones",
-            "Votos Totales": "Votos",
-            "Visualizaciones Únicas": "V. Unicas",
-            "Visualizaciones Totales": "V. Totales",
-        }
-    )
-
-    return kpis
+from processing.rankings import REPORT_TOP_K, top_k
+from reporting.cache import (
+    KEEP_REPORTS,
+    ArtifactStore,
+    cached_csv_report,
+    cached_render_charts,
+    fingerprint_metrics,
+    report_key,
+)
+from reporting.charts import DEFAULT_DPI, ChartSpec, render_charts
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_TEMPLATE_VERSION = "1.0"
+
+
+def generate_report_pdf(
+    dataframes: dict,
+    version=REPORT_TEMPLATE_VERSION,
+    dpi: int = DEFAULT_DPI,
+    processes: int | None = None,
+    store: ArtifactStore | None = None,
+):
+    from reporting.documents import PDFReport, transform_metrics
 
-
-def generate_report_pdf(dataframes: dict, version="1.0"):
     pdf = PDFReport()
     pdf.set_auto_page_break(auto=True, margin=10)
     pdf.add_page()
 
-    pdf.add_paragraph(
-        f"Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    )
     df_dates = dataframes["Métricas por Mes"]
     if not df_dates.empty:
         start_period = df_dates["Mes"].min()
@@ -93,6 +42,11 @@ def generate_report_pdf(dataframes: dict, version="1.0"):
     else:
         pdf.add_paragraph("Período analizado: No disponible")
     pdf.add_paragraph(f"Versión del reporte: {version}")
+    # No wall-clock date: the stored PDF is reused byte for byte while the metrics are unchanged
+    pdf.add_paragraph(
+        "El reporte depende solo de las métricas: se reutiliza sin cambios mientras estas no cambien, "
+        "por lo que la fecha de envío es la del correo."
+    )
 
     pdf.add_title("KPIS")
     kpis = transform_metrics(dataframes)
@@ -103,28 +57,40 @@ def generate_report_pdf(dataframes: dict, version="1.0"):
     pdf.add_title("Distribución por Edad")
     pdf.add_table(dataframes["Distribución por Edad"])
     pdf.add_title("Top Skills")
-    pdf.add_table(dataframes["Top Skills"])
+    pdf.add_table(top_k(dataframes["Top Skills"], "Cantidad", REPORT_TOP_K))
+    pdf.add_title("Top Flows")
+    pdf.add_table(dataframes["Top Flows"].head(REPORT_TOP_K))  # already in rank order
     pdf.add_title("Tasa de Conversión")
     pdf.add_table(dataframes["Tasa de Conversión"])
 
     pdf.add_title("Visualizaciones de Tendencias")
-    fig_mes, ax_mes = plt.subplots()
     df_mes = dataframes["Métricas por Mes"]
-    ax_mes.bar(df_mes["Mes"], df_mes["Total Aplicaciones"], color="#4c72b0")
-    ax_mes.set_title("Aplicaciones por Mes")
-    ax_mes.set_xlabel("Mes")
-    ax_mes.set_ylabel("Total Aplicaciones")
-    plt.xticks(rotation=45)
-    pdf.add_figure(fig_mes)
-
-    fig_sem, ax_sem = plt.subplots()
     df_sem = dataframes["Métricas por Semana"]
-    ax_sem.bar(df_sem["Semana"], df_sem["Total Aplicaciones"], color="#55a868")
-    ax_sem.set_title("Aplicaciones por Semana")
-    ax_sem.set_xlabel("Semana")
-    ax_sem.set_ylabel("Total Aplicaciones")
-    plt.xticks(rotation=45)
-    pdf.add_figure(fig_sem)
+    specs = [
+        ChartSpec(
+            "aplicaciones-mes",
+            "Aplicaciones por Mes",
+            df_mes["Mes"].tolist(),
+            df_mes["Total Aplicaciones"].tolist(),
+            "Mes",
+            "Total Aplicaciones",
+        ),
+        ChartSpec(
+            "aplicaciones-semana",
+            "Aplicaciones por Semana",
+            df_sem["Semana"].tolist(),
+            df_sem["Total Aplicaciones"].tolist(),
+            "Semana",
+            "Total Aplicaciones",
+            color="#55a868",
+        ),
+    ]
+    if store is None:
+        charts = render_charts(specs, dpi=dpi, processes=processes)
+    else:
+        charts = cached_render_charts(specs, store, dpi, processes)
+    for chart in charts:
+        pdf.add_chart(chart)
 
     pdf.add_title("Conclusiones y Recomendaciones")
     pdf.add_title("Conclusiones")
@@ -160,30 +126,11 @@ def generate_report_pdf(dataframes: dict, version="1.0"):
     return pdf.output(dest="S").encode("latin1")
 
 
-def create_csv_report(data: dict[str, pd.DataFrame]):
-    """
-    Write multiple dataframes to a single CSV file with section headers.
-
-    Each metric is preceded by a header line "-- metric_name --" followed by
-    the dataframe content and blank lines for separation.
-
-    Args:
-        data: Dictionary mapping metric names to their DataFrames
-        filename: Output CSV file path (default: "metrics_report.csv")
-    """
-
-    buffer = io.StringIO()
-    for title, df_metric in data.items():
-        buffer.write(f" -- {title} --\n")
-        df_metric.to_csv(buffer, index=False)
-        buffer.write("\n\n")
-
-    return buffer.getvalue().encode("utf-8")
+REPORT_EMAIL_DATA = {"subject": "Reporte Métricas"}
 
 
-def send_reports_email(csv_report: bytes, pdf_report: bytes):
-    dynamic_data = {"subject": "Reporte Métricas"}
-    attachments = [
+def report_attachments(csv_report: bytes, pdf_report: bytes) -> list[dict]:
+    return [
         {"filename": "metrics.csv", "content": csv_report, "type": "text/csv"},
         {
             "filename": "metrics_report.pdf",
@@ -191,7 +138,39 @@ def send_reports_email(csv_report: bytes, pdf_report: bytes):
             "type": "application/pdf",
         },
     ]
-    return sendgrid_service.send_email(
+
+
+def enqueue_reports_email(outbox: Outbox, csv_report: bytes, pdf_report: bytes, report_key: str) -> str:
+    """
+    Queue the reports email in the outbox instead of sending it.
+
+    The report key is the idempotency key, so the same report is queued (and
+    delivered) at most once however many times the pipeline runs.
+    """
+    from config import get_settings
+
+    settings = get_settings()
+    attachments = [
+        Attachment(file["filename"], file["type"], file["content"])
+        for file in report_attachments(csv_report, pdf_report)
+    ]
+    return outbox.enqueue(
+        receivers=settings.EMAIL_RECEIVER,
+        template_id=settings.TEMPLATE_ID,
+        dynamic_data=REPORT_EMAIL_DATA,
+        attachments=attachments,
+        idempotency_key=f"report:{report_key}",
+    )
+
+
+def send_reports_email(csv_report: bytes, pdf_report: bytes):
+    from config import get_settings
+    from utils.sengrid import get_sendgrid_service
+
+    settings = get_settings()
+    dynamic_data = REPORT_EMAIL_DATA
+    attachments = report_attachments(csv_report, pdf_report)
+    return get_sendgrid_service().send_email(
         receivers=settings.EMAIL_RECEIVER,
         template_id=settings.TEMPLATE_ID,
         dynamic_data=dynamic_data,
@@ -199,19 +178,109 @@ def send_reports_email(csv_report: bytes, pdf_report: bytes):
     )
 
 
-def save_metrics_csv_pdf(data: dict[str, pd.DataFrame]):
+class ReportBuild:
+    """
+    Artifact store lookup and store of one report, shared by build_reports and
+    the pipeline DAG (which renders the CSV and the PDF in separate tasks).
+
+    The report key combines the fingerprint of every metric DataFrame with
+    REPORT_TEMPLATE_VERSION. When both reports of the key are stored they are
+    reused without rendering; otherwise only the CSV sections and charts whose
+    inputs changed are rendered again. The reports carry no generation date, so
+    a reused report is identical to a fresh one.
+    """
+
+    def __init__(
+        self, metrics: dict[str, pd.DataFrame], store: ArtifactStore, keep_reports: int = KEEP_REPORTS
+    ) -> None:
+        self.started = time.time_ns()
+        self.metrics = metrics
+        self.store = store
+        self.keep_reports = keep_reports
+        self.fingerprints = fingerprint_metrics(metrics)
+        self.key = report_key(self.fingerprints, REPORT_TEMPLATE_VERSION)
+        csv_bytes = store.get(f"{self.key}.csv")
+        pdf_bytes = store.get(f"{self.key}.pdf")
+        self.stored = (csv_bytes, pdf_bytes) if csv_bytes is not None and pdf_bytes is not None else None
+        if self.stored is not None:
+            logger.info(f"Reports unchanged ({self.key[:12]}), reusing stored artifacts")
+
+    def csv(self) -> bytes:
+        if self.stored is not None:
+            return self.stored[0]
+        return cached_csv_report(self.metrics, self.fingerprints, self.store)
+
+    def pdf(self, processes: int | None = None) -> bytes:
+        if self.stored is not None:
+            return self.stored[1]
+        return generate_report_pdf(self.metrics, processes=processes, store=self.store)
+
+    def finish(self, csv_bytes: bytes, pdf_bytes: bytes) -> tuple[str, bytes, bytes]:
+        """
+        Store newly rendered reports under the key, record the build and keep
+        only the artifacts of the last keep_reports reports.
+
+        Returns:
+            Tuple of (report key, CSV bytes, PDF bytes)
+        """
+        if self.stored is None:
+            self.store.put(f"{self.key}.csv", csv_bytes)
+            self.store.put(f"{self.key}.pdf", pdf_bytes)
+        self.store.add_report(self.key, self.started)
+        self.store.collect(self.keep_reports)
+        return self.key, csv_bytes, pdf_bytes
+
+
+def build_reports(
+    metrics: dict[str, pd.DataFrame], store: ArtifactStore | None = None, keep_reports: int = KEEP_REPORTS
+) -> tuple[str, bytes, bytes]:
+    """
+    Build the CSV and PDF reports, reusing stored artifacts when possible (see ReportBuild).
+
+    Args:
+        metrics: Output of get_all_metrics_as_dict
+        store: Artifact store (no caching if None)
+        keep_reports: Reports whose artifacts are kept when the store is collected
+
+    Returns:
+        Tuple of (report key, CSV bytes, PDF bytes)
+    """
+    if store is None:
+        from reporting.documents import create_csv_report
+
+        key = report_key(fingerprint_metrics(metrics), REPORT_TEMPLATE_VERSION)
+        return key, create_csv_report(metrics), generate_report_pdf(metrics)
+
+    build = ReportBuild(metrics, store, keep_reports)
+    return build.finish(build.csv(), build.pdf())
+
+
+def save_metrics_csv_pdf(
+    data: dict[str, pd.DataFrame],
+    store: ArtifactStore | None = None,
+    outbox: Outbox | None = None,
+):
     """
     Compute metrics and generate both CSV and PDF reports.
 
     Reporting flow:
     1. Compute all metrics from raw data
-    2. Save metrics to CSV file
-    3. Generate PDF report with formatted tables
+    2. Build the CSV and PDF reports (reused from the store when unchanged)
+    3. Queue the reports email in the outbox, or send it right away when no
+       outbox is given (unless this exact report was already sent)
 
     Args:
         data: Dictionary of validated DataFrames from the loading phase
+        store: Artifact store for cached reports (always rebuilds if None)
+        outbox: Email outbox; delivery then happens in delivery.sender
     """
     metrics = get_all_metrics_as_dict(data)
-    csv_bytes = create_csv_report(metrics)
-    pdf_bytes = generate_report_pdf(metrics)
-    send_reports_email(csv_bytes, pdf_bytes)
+    key, csv_bytes, pdf_bytes = build_reports(metrics, store)
+    if outbox is not None:
+        enqueue_reports_email(outbox, csv_bytes, pdf_bytes, key)
+        return
+    if store is not None and f"sent:{key}" in store:
+        logger.info(f"Reports {key[:12]} already sent, skipping email")
+        return
+    if send_reports_email(csv_bytes, pdf_bytes) and store is not None:
+        store.mark(f"sent:{key}")
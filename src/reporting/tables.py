@@ -0,0 +1,329 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+CELL_PADDING = 2.0
+MIN_FONT_SIZE = 6.0
+ELLIPSIS = "..."
+
+
+class RawPDF:
+    """
+    The FPDF internals the table and chart renderers rely on, kept in one place.
+
+    Written against fpdf 1.7.2 (PyFPDF): the current font dictionary with its
+    character widths, string escaping, raw content stream writes and the
+    image registry have no public equivalent there. Check this class when
+    upgrading fpdf.
+    """
+
+    def __init__(self, pdf: FPDF) -> None:
+        self.pdf = pdf
+
+    def font(self) -> tuple[str, dict[str, int]]:
+        """Name and character widths (font units) of the current font."""
+        font = self.pdf.current_font
+        return font["name"], font["cw"]
+
+    def escape(self, text: str) -> str:
+        return self.pdf._escape(text)
+
+    def write(self, operators: str) -> None:
+        self.pdf._out(operators)
+
+    def register_image(self, name: str, width: int, height: int, data: bytes) -> str:
+        """
+        Register Flate-compressed 8-bit RGB pixels as an image XObject.
+
+        Images are keyed by name and a hash of the pixels, so the same image
+        is embedded once however often it is placed, and two images sharing
+        a name are both kept.
+
+        Returns:
+            Key to place the image with FPDF.image
+        """
+        key = f"{name}#{hashlib.blake2b(data, digest_size=8).hexdigest()}"
+        images = self.pdf.images
+        if key not in images:
+            images[key] = {
+                "i": len(images) + 1,
+                "w": width,
+                "h": height,
+                "cs": "DeviceRGB",
+                "bpc": 8,
+                "f": "FlateDecode",
+                "data": data,
+            }
+        return key
+
+
+def format_column(values: pd.Series) -> np.ndarray:
+    """
+    Format a whole column to display strings at once.
+
+    Integers are printed as is, floats with two decimals (without decimals when
+    the whole column is integral) and missing values as empty cells. Text is reduced to latin-1, the
+    only encoding supported by the core PDF fonts.
+
+    Args:
+        values: Column to format
+
+    Returns:
+        Object array of strings, one per row
+    """
+    if pd.api.types.is_bool_dtype(values):
+        formatted = values.astype(str).to_numpy(dtype=object)
+    elif pd.api.types.is_integer_dtype(values):
+        formatted = values.astype(str).to_numpy(dtype=object)
+    elif pd.api.types.is_float_dtype(values):
+        numbers = values.to_numpy(dtype=np.float64)
+        finite = np.isfinite(numbers)
+        formatted = np.full(len(numbers), "", dtype=object)
+        if (numbers[finite] == np.round(numbers[finite])).all():
+            formatted[finite] = numbers[finite].astype(np.int64).astype(str)
+        else:
+            formatted[finite] = np.char.mod("%.2f", numbers[finite])
+    else:
+        formatted = values.astype(str).to_numpy(dtype=object)
+        formatted[values.isna().to_numpy()] = ""
+        labels, uniques = pd.factorize(formatted)
+        uniques = np.array(
+            [text.encode("latin-1", "replace").decode("latin-1") for text in uniques],
+            dtype=object,
+        )
+        formatted = uniques[labels]
+    return formatted
+
+
+class FontMetrics:
+    """
+    Cached string widths for the core PDF fonts.
+
+    Widths are memoized per (font, text) in font units, so repeated values
+    (labels, common numbers) are measured once whatever the font size.
+    """
+
+    def __init__(self, pdf: FPDF) -> None:
+        self.pdf = pdf
+        self.raw = RawPDF(pdf)
+        self._widths: dict[tuple[str, str], float] = {}
+
+    def width(self, text: str) -> float:
+        """Width of text in the current font of the document (user units)."""
+        name, char_widths = self.raw.font()
+        key = (name, text)
+        units = self._widths.get(key)
+        if units is None:
+            units = sum(char_widths.get(char, 0) for char in text)
+            self._widths[key] = units
+        return units * self.pdf.font_size / 1000.0
+
+    def max_width(self, texts: np.ndarray) -> float:
+        """Widest string of a column, measuring each distinct value once."""
+        if len(texts) == 0:
+            return 0.0
+        return max(self.width(text) for text in pd.unique(texts))
+
+
+def column_widths(
+    metrics: FontMetrics, header: list[str], columns: list[np.ndarray], available: float
+) -> list[float]:
+    """
+    Natural width of each column (widest header or cell plus padding).
+
+    Widths are scaled down proportionally when the table is wider than the
+    available width.
+    """
+    pdf = metrics.pdf
+    family, size = pdf.font_family, pdf.font_size_pt
+    pdf.set_font(family, "B", size)
+    header_widths = [metrics.width(text) for text in header]
+    pdf.set_font(family, "", size)
+    widths = [
+        max(header_width, metrics.max_width(cells)) + 2 * CELL_PADDING
+        for header_width, cells in zip(header_widths, columns)
+    ]
+    total = sum(widths)
+    if total <= available:
+        return widths
+    return [width * available / total for width in widths]
+
+
+def fit_font_size(
+    metrics: FontMetrics, header: list[str], columns: list[np.ndarray], available: float, font_size: float
+) -> float:
+    """
+    Font size at which the table fits the available width, not below MIN_FONT_SIZE
+    (and set as the current font when it changes).
+
+    Text widths scale with the font size while the cell padding does not, so
+    the size is derived from the natural text width alone.
+    """
+    pdf = metrics.pdf
+    natural = sum(column_widths(metrics, header, columns, float("inf")))
+    if natural <= available:
+        return font_size
+    padding = 2 * CELL_PADDING * len(header)
+    fitted = font_size * max(available - padding, 0.0) / (natural - padding)
+    size = max(MIN_FONT_SIZE, float(np.floor(fitted * 2) / 2))  # half points
+    pdf.set_font(pdf.font_family, "", size)
+    return size
+
+
+def clip_text(metrics: FontMetrics, text: str, room: float) -> str:
+    """Longest prefix of text that, followed by an ellipsis, fits room (text itself if it fits)."""
+    if metrics.width(text) <= room:
+        return text
+    low, high = 0, len(text)
+    while low < high:  # longest prefix whose clipped form fits
+        middle = (low + high + 1) // 2
+        if metrics.width(text[:middle] + ELLIPSIS) <= room:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + ELLIPSIS if metrics.width(text[:low] + ELLIPSIS) <= room else ""
+
+
+def clip_column(metrics: FontMetrics, texts: np.ndarray, width: float) -> np.ndarray:
+    """Cells of a column clipped to its width, measuring each distinct value once."""
+    room = width - 2 * metrics.pdf.c_margin
+    labels, uniques = pd.factorize(texts)
+    if len(uniques) == 0:
+        return texts
+    clipped = np.array([clip_text(metrics, text, room) for text in uniques], dtype=object)
+    return clipped[labels]
+
+
+def cell_operators(
+    pdf: FPDF,
+    metrics: FontMetrics,
+    widths: list[float],
+    columns: list[np.ndarray],
+    aligns: list[str],
+) -> list[np.ndarray]:
+    """
+    Precompute the text drawing operators of every cell, column by column.
+
+    Each distinct value of a column is escaped and measured once. The operator
+    of a cell is split as (prefix, suffix) around its baseline, the only part
+    that depends on the row position. Empty cells map to None.
+    """
+    k = pdf.k
+    x = pdf.l_margin
+    operators = []
+    for width, texts, align in zip(widths, columns, aligns):
+        labels, uniques = pd.factorize(texts)
+        parts = np.empty(len(uniques), dtype=object)
+        for position, text in enumerate(uniques):
+            if not text:
+                continue
+            if align == "R":
+                offset = width - pdf.c_margin - metrics.width(text)
+            else:
+                offset = pdf.c_margin
+            parts[position] = (
+                "BT %.2f " % ((x + offset) * k),
+                " Td (%s) Tj ET" % metrics.raw.escape(text),
+            )
+        operators.append(parts[labels])
+        x += width
+    return operators
+
+
+def write_row(pdf: FPDF, raw: RawPDF, borders: str, cells, row_height: float) -> None:
+    """
+    Write one bordered row as raw PDF operators in a single content write.
+
+    Equivalent to one FPDF.cell per column followed by ln(), without the
+    per-cell bookkeeping.
+    """
+    k, page_height = pdf.k, pdf.h
+    baseline = "%.2f" % (
+        (page_height - (pdf.y + 0.5 * row_height + 0.3 * pdf.font_size)) * k
+    )
+    ops = [borders % {"top": (page_height - pdf.y) * k}]
+    for cell in cells:
+        if cell is not None:
+            ops.append(cell[0] + baseline + cell[1])
+    raw.write(" ".join(ops))
+    pdf.x = pdf.l_margin
+    pdf.y += row_height
+
+
+def render_table(
+    pdf: FPDF,
+    df: pd.DataFrame,
+    max_rows: int | None = None,
+    font_family: str = "Arial",
+    font_size: int = 9,
+    row_height: float = 8,
+    metrics: FontMetrics | None = None,
+) -> None:
+    """
+    Draw a DataFrame as a PDF table.
+
+    Every column is formatted once (format_column) and rows are written from the
+    precomputed arrays (write_row), without building a Series per row. Column widths follow
+    the content (cached font metrics), numeric columns are right-aligned, the
+    header is repeated after every page break, and tables longer than max_rows
+    end with a "... N filas más" footer.
+
+    A table wider than the page is drawn with a smaller font (down to
+    MIN_FONT_SIZE); cells that still do not fit their column are clipped and
+    end with an ellipsis, so no text overflows into the next cell.
+
+    Args:
+        pdf: Document to draw on, at the current position
+        df: Table to draw
+        max_rows: Maximum number of rows to draw (all rows if None)
+        font_family: Core font family
+        font_size: Font size in points
+        row_height: Height of each row
+        metrics: FontMetrics to reuse across tables of the same document
+    """
+    metrics = metrics if metrics is not None else FontMetrics(pdf)
+    shown = df if max_rows is None else df.iloc[:max_rows]
+    header = list(format_column(pd.Series([str(col) for col in df.columns])))
+    columns = [format_column(shown[col]) for col in shown.columns]
+    aligns = [
+        "R" if pd.api.types.is_numeric_dtype(shown[col]) else "L" for col in shown.columns
+    ]
+
+    available = pdf.w - pdf.l_margin - pdf.r_margin
+    pdf.set_font(font_family, "", font_size)
+    font_size = fit_font_size(metrics, header, columns, available, font_size)
+    widths = column_widths(metrics, header, columns, available)
+    columns = [clip_column(metrics, cells, width) for cells, width in zip(columns, widths)]
+    pdf.set_font(font_family, "B", font_size)
+    header = [clip_text(metrics, text, width - 2 * pdf.c_margin) for text, width in zip(header, widths)]
+    pdf.set_font(font_family, "", font_size)
+
+    def draw_header():
+        pdf.set_font(font_family, "B", font_size)
+        for width, text in zip(widths, header):
+            pdf.cell(width, row_height, text, border=1)
+        pdf.ln()
+        pdf.set_font(font_family, "", font_size)
+
+    k = pdf.k
+    lefts = pdf.l_margin + np.concatenate(([0.0], np.cumsum(widths)[:-1]))
+    borders = " ".join(
+        "%.2f %%(top).2f %.2f %.2f re S" % (left * k, width * k, -row_height * k)
+        for left, width in zip(lefts, widths)
+    )
+    operators = cell_operators(pdf, metrics, widths, columns, aligns)
+
+    draw_header()
+    for cells in zip(*operators):
+        if pdf.y + row_height > pdf.page_break_trigger:
+            pdf.add_page()
+            draw_header()
+        write_row(pdf, metrics.raw, borders, cells, row_height)
+
+    hidden = len(df) - len(shown)
+    if hidden > 0:
+        pdf.set_font(font_family, "I", font_size)
+        pdf.cell(0, row_height, f"... {hidden} filas más", 0, 1)
+        pdf.set_font(font_family, "", font_size)
@@ -0,0 +1,351 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+MEMORY_MODES = ("rss", "tracemalloc", "none")
+INSTRUMENTATION_DIR = "instrumentation"
+SUMMARY_FILE = "run_summary.json"
+PROMETHEUS_FILE = "pipeline.prom"
+METRIC_PREFIX = "talentpitch_pipeline"
+
+# Prometheus metric -> (Measurement field, help text); every sample is labelled by kind and name
+PROMETHEUS_METRICS = {
+    "calls_total": ("calls", "Times the stage, task or metric ran"),
+    "wall_seconds": ("wall_seconds", "Wall-clock time"),
+    "cpu_seconds": ("cpu_seconds", "CPU time of the thread that ran it"),
+    "rows_in": ("rows_in", "Input rows"),
+    "rows_out": ("rows_out", "Output rows"),
+    "rows_rejected": ("rejected", "Rows rejected by validation"),
+    "peak_memory_bytes": ("peak_memory", "Peak memory while it ran"),
+    "errors_total": ("errors", "Runs that raised an exception"),
+}
+
+
+class Measurement(NamedTuple):
+    """What one run of an instrumented stage, task or metric cost."""
+
+    name: str
+    kind: str
+    start: float  # seconds since the recorder was enabled
+    wall_seconds: float
+    cpu_seconds: float
+    rows_in: int | None
+    rows_out: int | None
+    rejected: int | None
+    peak_memory: int | None  # bytes
+    thread: str
+    error: str | None = None
+
+
+class Span:
+    """
+    Measurement in progress, returned by Recorder.measure.
+
+    The instrumented code sets rows_in, rows_out and rejected once it knows them.
+    """
+
+    __slots__ = ("recorder", "name", "kind", "rows_in", "rows_out", "rejected", "peak_memory", "_start", "_cpu")
+
+    def __init__(self, recorder: "Recorder", name: str, kind: str, rows_in: int | None = None) -> None:
+        self.recorder = recorder
+        self.name = name
+        self.kind = kind
+        self.rows_in = rows_in
+        self.rows_out: int | None = None
+        self.rejected: int | None = None
+        self.peak_memory: int | None = None
+
+    def __enter__(self) -> "Span":
+        self.recorder._open(self)
+        self._cpu = time.thread_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        wall = time.perf_counter() - self._start
+        cpu = time.thread_time() - self._cpu
+        self.recorder._close(self)
+        self.recorder.record(
+            Measurement(
+                self.name,
+                self.kind,
+                self._start - self.recorder.origin,
+                wall,
+                cpu,
+                self.rows_in,
+                self.rows_out,
+                self.rejected,
+                self.peak_memory,
+                threading.current_thread().name,
+                None if exc_type is None else exc_type.__name__,
+            )
+        )
+        return False
+
+
+class NullSpan:
+    """Span of a disabled recorder: entering, exiting and setting counts do nothing."""
+
+    __slots__ = ()
+    rows_in = rows_out = rejected = peak_memory = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of the process in bytes (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def count_rows(value: Any) -> int | None:
+    """Rows of a DataFrame or Series, or of every frame in a dict, list or tuple (None if there are none)."""
+    if hasattr(value, "shape") and getattr(value, "ndim", 0) in (1, 2):
+        return value.shape[0]
+    if isinstance(value, dict):
+        value = value.values()
+    if isinstance(value, (list, tuple, type({}.values()))):
+        counts = [rows for rows in map(count_rows, value) if rows is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+class Recorder:
+    """
+    Collects a Measurement for every span run while it is enabled.
+
+    Disabled (the default), measure returns NULL_SPAN and instrumented
+    functions call straight through, so the cost is one attribute check.
+
+    Memory modes:
+        rss: peak resident set size of the process when the span ended (cheap,
+             but it only grows, so it is a high-water mark of the whole run)
+        tracemalloc: peak of the memory traced by tracemalloc (Python objects
+             and numpy buffers) while the span was open; exact per span, but
+             tracing slows allocation-heavy code down
+        none: no memory measurement
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.memory = "none"
+        self.origin = time.perf_counter()
+        self.started_at: datetime | None = None
+        self.measurements: list[Measurement] = []
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def enable(self, memory: str = "rss") -> None:
+        if memory not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode {memory!r}, expected one of {', '.join(MEMORY_MODES)}")
+        self.disable()
+        self.reset()
+        self.memory = memory
+        if memory == "tracemalloc":
+            import tracemalloc
+
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording, keeping the measurements taken so far."""
+        self.enabled = False
+        if self._started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.measurements = []
+            self._spans = []
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now()
+
+    def measure(self, name: str, kind: str = "stage", rows_in: int | None = None) -> Span | NullSpan:
+        """
+        Context manager measuring the code in its block.
+
+        Args:
+            name: Stage, task or metric name
+            kind: Category of the measurement ('stage', 'task', 'metric', ...)
+            rows_in: Input rows, if already known
+
+        Returns:
+            Span (NULL_SPAN when disabled) whose rows_in, rows_out and rejected
+            the block may set
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, kind, rows_in)
+
+    def record(self, measurement: Measurement) -> None:
+        with self._lock:
+            self.measurements.append(measurement)
+
+    def _sample_peak(self) -> None:
+        # The traced peak since the last sample belongs to every span open during that interval
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for span in self._spans:
+            span.peak_memory = max(span.peak_memory or 0, peak)
+        tracemalloc.reset_peak()
+
+    def _open(self, span: Span) -> None:
+        if self.memory == "tracemalloc":
+            with self._lock:
+                self._sample_peak()
+                self._spans.append(span)
+
+    def _close(self, span: Span) -> None:
+        if self.memory == "tracemalloc":
+            with self._lock:
+                self._sample_peak()
+                self._spans.remove(span)
+        elif self.memory == "rss":
+            span.peak_memory = peak_rss()
+
+    def aggregate(self) -> dict[tuple[str, str], dict[str, float]]:
+        """
+        Measurements combined per (kind, name): times, rows and errors added
+        up, the peak memory is the largest one.
+        """
+        combined: dict[tuple[str, str], dict[str, float]] = {}
+        with self._lock:
+            measurements = list(self.measurements)
+        for measurement in measurements:
+            totals = combined.setdefault((measurement.kind, measurement.name), {"calls": 0, "errors": 0})
+            totals["calls"] += 1
+            totals["errors"] += measurement.error is not None
+            for field in ("wall_seconds", "cpu_seconds", "rows_in", "rows_out", "rejected"):
+                value = getattr(measurement, field)
+                if value is not None:
+                    totals[field] = totals.get(field, 0) + value
+            if measurement.peak_memory is not None:
+                totals["peak_memory"] = max(totals.get("peak_memory", 0), measurement.peak_memory)
+        return combined
+
+    def summary(self) -> dict:
+        """JSON-serializable run summary: every measurement and the per-name totals."""
+        with self._lock:
+            measurements = list(self.measurements)
+        return {
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "wall_seconds": round(time.perf_counter() - self.origin, 6),
+            "memory": self.memory,
+            "peak_rss": peak_rss(),
+            "rows_rejected": sum(m.rejected or 0 for m in measurements),
+            "measurements": [m._asdict() for m in sorted(measurements, key=lambda m: m.start)],
+            "totals": [
+                {"kind": kind, "name": name, **totals} for (kind, name), totals in sorted(self.aggregate().items())
+            ],
+        }
+
+    def prometheus_text(self) -> str:
+        """Per-name totals in the Prometheus text exposition format."""
+        combined = sorted(self.aggregate().items())
+        lines = []
+        for metric, (field, help_text) in PROMETHEUS_METRICS.items():
+            samples = [(key, totals[field]) for key, totals in combined if field in totals]
+            if not samples:
+                continue
+            kind = "counter" if metric.endswith("_total") else "gauge"
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+            for (kind_label, name), value in samples:
+                labels = f'kind="{escape_label(kind_label)}",name="{escape_label(name)}"'
+                formatted = value if isinstance(value, int) else f"{value:.9g}"
+                lines.append(f"{METRIC_PREFIX}_{metric}{{{labels}}} {formatted}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str | Path) -> tuple[Path, Path]:
+        """
+        Write the JSON run summary and the Prometheus file under directory.
+
+        Both files are written to a temporary name and renamed, so a
+        collector reading them (e.g. the node_exporter textfile collector)
+        never sees a partial file.
+
+        Returns:
+            Paths of the JSON summary and of the Prometheus file
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = directory / SUMMARY_FILE, directory / PROMETHEUS_FILE
+        contents = json.dumps(self.summary(), indent=2, ensure_ascii=False), self.prometheus_text()
+        for path, content in zip(paths, contents):
+            temporary = path.with_name(f".{path.name}.tmp")
+            temporary.write_text(content, encoding="utf-8")
+            os.replace(temporary, path)
+        return paths
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide recorder used by measure and instrument
+RECORDER = Recorder()
+
+
+def measure(name: str, kind: str = "stage", rows_in: int | None = None) -> Span | NullSpan:
+    """Context manager measuring a block with the process-wide recorder (see Recorder.measure)."""
+    if not RECORDER.enabled:
+        return NULL_SPAN
+    return Span(RECORDER, name, kind, rows_in)
+
+
+def instrument(name: str | None = None, kind: str = "stage") -> Callable[[Callable], Callable]:
+    """
+    Decorator measuring every call of a function with the process-wide recorder.
+
+    Input rows are counted from the DataFrame arguments (also inside dict
+    arguments) and output rows from the returned frame(s).
+
+    Args:
+        name: Measurement name (the function name if None)
+        kind: Category of the measurement
+    """
+
+    def decorate(function: Callable) -> Callable:
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not RECORDER.enabled:
+                return function(*args, **kwargs)
+            with Span(RECORDER, label, kind, count_rows([*args, *kwargs.values()])) as span:
+                result = function(*args, **kwargs)
+                span.rows_out = count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorate
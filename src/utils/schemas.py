@@ -1,4 +1,4 @@
-from db.models import Flow, User, Resume, ResumeExhibited, Vote, View, Profile
+from db.models import Flow, User, Resume, ResumeExhibited, Vote, Share, View, Profile
 
 FIELDS_FILES = {
     "flows": ["id", "name", "slug", "description", "status", "created_at", "views"],
@@ -76,6 +76,7 @@ TABLES_MAP = {
     "resumes": Resume,
     "resumes_exhibited": ResumeExhibited,
     "votes": Vote,
+    "shares": Share,
     "views": View,
     "profiles": Profile,
 }
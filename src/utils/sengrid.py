@@ -1,13 +1,15 @@
 import logging
 import base64
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Attachment, FileContent, FileName, FileType, Disposition
-from config import settings
+from functools import lru_cache
+
+from config import get_settings
 
 
 class ServiceEmail:
     def __init__(self) -> None:
-        self.sg_client = SendGridAPIClient(settings.SENDGRID_API_KEY)
+        from sendgrid import SendGridAPIClient
+
+        self.sg_client = SendGridAPIClient(get_settings().SENDGRID_API_KEY)
 
     def send_email(
         self,
@@ -15,10 +17,11 @@ class ServiceEmail:
         template_id: str,
         dynamic_data: dict,
         attachments: list[dict] = None
-    ) -> dict:
+    ) -> bool:
+        from sendgrid.helpers.mail import Mail, Attachment, FileContent, FileName, FileType, Disposition
 
         sg_message = Mail(
-            from_email=settings.EMAIL_SENDER,
+            from_email=get_settings().EMAIL_SENDER,
             to_emails=receivers,
         )
 
@@ -40,8 +43,20 @@ class ServiceEmail:
         try:
             self.sg_client.send(sg_message)
             logging.info("Mail sent successfully")
+            return True
         except Exception as e:
             logging.error(f"Failed to send mail: {e}")
+            return False
+
+
+@lru_cache(maxsize=None)
+def get_sendgrid_service() -> ServiceEmail:
+    """Shared ServiceEmail, created (with its SendGrid client) on first use."""
+    return ServiceEmail()
 
 
-sendgrid_service = ServiceEmail()
+def __getattr__(name: str):
+    # Backwards compatible `from utils.sengrid import sendgrid_service`, created lazily
+    if name == "sendgrid_service":
+        return get_sendgrid_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
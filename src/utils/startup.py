@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# Pipeline entry points and the cold-start import budget of each one (ms)
+ENTRY_POINT_BUDGETS_MS = {
+    "main": 2500,
+    "processing.metrics": 1500,
+    "reporting.reports": 1500,
+    "reporting.fanout": 2500,
+    "delivery.sender": 500,
+}
+
+# Dependencies an entry point must not import until they are actually used
+DEFERRED_IMPORTS = {
+    "main": ("matplotlib", "fpdf", "sendgrid", "pydantic_settings", "scipy"),
+    "processing.metrics": ("matplotlib", "fpdf", "sendgrid", "pydantic_settings", "scipy", "sqlalchemy"),
+    "reporting.reports": ("matplotlib", "fpdf", "sendgrid", "pydantic_settings", "scipy"),
+    "reporting.fanout": ("matplotlib", "sendgrid", "pydantic_settings"),
+    "delivery.sender": ("pandas", "sendgrid", "pydantic_settings"),
+}
+
+
+class ImportProfile(NamedTuple):
+    """Cold import of one module as reported by python -X importtime."""
+
+    module: str
+    total_ms: float
+    self_ms: dict[str, float]
+
+    def imported(self, package: str) -> bool:
+        """Whether package (or any of its submodules) was imported."""
+        return any(name == package or name.startswith(package + ".") for name in self.self_ms)
+
+
+def profile_import(module: str, env: dict | None = None) -> ImportProfile:
+    """
+    Import module in a fresh interpreter with -X importtime and parse the report.
+
+    Args:
+        module: Dotted module name, importable from the src directory
+        env: Environment of the interpreter (os.environ if None)
+
+    Returns:
+        ImportProfile with the cumulative time of the module and the self time
+        of every module it imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        env=os.environ if env is None else env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    self_ms = {}
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        self_ms[name] = int(self_us) / 1000
+        if name == module:
+            total_ms = int(cumulative_us) / 1000
+    return ImportProfile(module, total_ms, self_ms)
@@ -6,3 +6,122 @@ ROOT = Path(__file__).resolve().parent.parent  # raíz del proyecto
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def build_sample_data(n_users: int = 60, seed: int = 7) -> dict[str, pd.DataFrame]:
+    """Datos sintéticos y reproducibles con las 8 tablas del pipeline."""
+    rng = np.random.default_rng(seed)
+
+    def dates(size, start="2024-01-01", days=400):
+        offsets = pd.to_timedelta(rng.integers(0, days * 24, size), unit="h")
+        return (pd.Timestamp(start) + offsets).astype(str)
+
+    skills = ["Python", "SQL", "UX", "Figma", "Data", "Power BI, DAX", "Excel"]
+    n_flows, n_events = 6, n_users * 4
+    flows = pd.DataFrame({"id": np.arange(1, n_flows + 1), "created_at": dates(n_flows)})
+    users = pd.DataFrame(
+        {
+            "id": np.arange(1, n_users + 1),
+            "gender": rng.choice(["M", "F", "O"], n_users),
+            "country": rng.choice(["CO", "MX"], n_users),
+            "city": rng.choice(["Bogotá", "Medellín", "CDMX"], n_users),
+            "birth_date": dates(n_users, "1960-01-01", 17000),
+            "created_at": dates(n_users),
+        }
+    )
+    resumes = pd.DataFrame(
+        {
+            "id": np.arange(1, n_users + 1),
+            "user_id": rng.integers(1, n_users + 1, n_users),
+            "skills": [
+                str(rng.choice(skills, rng.integers(1, 4), replace=False).tolist())
+                for _ in range(n_users)
+            ],
+            "created_at": dates(n_users),
+        }
+    )
+    resumes_exhibited = pd.DataFrame(
+        {
+            "id": np.arange(1, n_events + 1),
+            "resume_id": rng.integers(1, n_users + 1, n_events),
+            "model_id": rng.integers(1, n_flows + 1, n_events),
+            "created_at": dates(n_events),
+        }
+    )
+    data = {
+        "flows": flows,
+        "users": users,
+        "resumes": resumes,
+        "resumes_exhibited": resumes_exhibited,
+    }
+    for table in ["votes", "shares", "views"]:
+        data[table] = pd.DataFrame(
+            {
+                "id": np.arange(1, n_events + 1),
+                "model_id": rng.integers(1, n_flows + 1, n_events),
+                "user_id": rng.integers(1, n_users + 1, n_events),
+                "created_at": dates(n_events),
+            }
+        )
+    data["votes"]["value"] = rng.integers(1, 6, n_events)
+    data["profiles"] = pd.DataFrame(
+        {
+            "user_id": np.arange(1, n_users + 1),
+            "skills": [str(rng.choice(skills, 2, replace=False).tolist()) for _ in range(n_users)],
+            "tools": "['Figma']",
+            "languages": "['Español']",
+        }
+    )
+    return data
+
+
+@pytest.fixture
+def sample_data() -> dict[str, pd.DataFrame]:
+    return build_sample_data()
+
+
+@pytest.fixture
+def make_sample_data():
+    return build_sample_data
+
+
+@pytest.fixture
+def large_sample_data() -> dict[str, pd.DataFrame]:
+    return build_sample_data(n_users=3000, seed=11)
+
+
+def complete_tables(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Agrega las columnas del esquema que faltan para que las tablas pasen la validación."""
+    from utils.schemas import FIELDS_FILES
+
+    tables = {}
+    for table, df in data.items():
+        df = df.copy()
+        for column in FIELDS_FILES[table]:
+            if column in df.columns:
+                continue
+            if column == "email":
+                df[column] = [f"user{i}@talentpitch.co" for i in df["id"]]
+            elif column == "sent_at":
+                df[column] = df["created_at"]
+            else:
+                df[column] = 0 if column == "views" else "x"
+        tables[table] = df
+    return tables
+
+
+@pytest.fixture
+def write_dataset():
+    """Escribe las tablas (completas según el esquema) como CSV en un directorio."""
+
+    def write(directory: Path, data: dict[str, pd.DataFrame]) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        for table, df in complete_tables(data).items():
+            df.to_csv(directory / f"{table}.csv", index=False)
+        return directory
+
+    return write
@@ -0,0 +1,56 @@
+"""
+Tests para métricas out-of-core con agregados parciales combinables.
+"""
+
+import pandas as pd
+from processing.aggregates import (
+    build_metric_aggregates,
+    finalize_aggregates,
+    update_aggregates,
+)
+from processing.metrics import get_all_metrics_as_dict
+
+
+def split_chunks(df: pd.DataFrame, size: int):
+    return (df.iloc[start : start + size] for start in range(0, len(df), size))
+
+
+def assert_same_metrics(result: dict, expected: dict):
+    assert list(result) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(
+            result[name].reset_index(drop=True),
+            expected[name].reset_index(drop=True),
+            obj=name,
+        )
+
+
+def test_chunked_metrics_match_eager(sample_data):
+    expected = get_all_metrics_as_dict(
+        {name: df.copy() for name, df in sample_data.items()}
+    )
+    chunked = {name: split_chunks(df, 17) for name, df in sample_data.items()}
+    result = get_all_metrics_as_dict(chunked)
+    assert_same_metrics(result, expected)
+
+
+def test_merge_partitions(sample_data):
+    expected = get_all_metrics_as_dict(
+        {name: df.copy() for name, df in sample_data.items()}
+    )
+    left, right = build_metric_aggregates(), build_metric_aggregates()
+    update_aggregates(
+        left, {name: df.iloc[: len(df) // 2] for name, df in sample_data.items()}
+    )
+    update_aggregates(
+        right, {name: df.iloc[len(df) // 2 :] for name, df in sample_data.items()}
+    )
+    for name, aggregate in left.items():
+        aggregate.merge(right[name])
+
+    result = finalize_aggregates(left)
+    for metrics in (result, expected):
+        metrics["Top Skills"] = metrics["Top Skills"].sort_values(
+            ["Cantidad", "Skill"], ascending=[False, True]
+        )
+    assert_same_metrics(result, expected)
@@ -0,0 +1,163 @@
+"""
+Tests para la API local de métricas: consultas, caché con TTL e invalidación por versión de datos.
+"""
+
+import http.client
+import json
+import sqlite3
+import threading
+
+import api.server as server_module
+import pandas as pd
+import pytest
+from api.cache import TTLCache
+from api.queries import data_version, flow_kpis
+from api.server import APIError, MetricsService, make_server
+from db.database import get_engine
+from db.save import save_data, save_data_version
+from pipeline.stages import pipeline_context, run_ingest, run_persist
+from processing.metrics import get_all_metrics_as_dict
+
+
+@pytest.fixture
+def ctx(tmp_path, sample_data, write_dataset):
+    ctx = pipeline_context(write_dataset(tmp_path / "data", sample_data), tmp_path / "salida")
+    run_ingest(ctx)
+    run_persist(ctx)
+    yield ctx
+    ctx.outbox.close()
+
+
+@pytest.fixture
+def service(ctx):
+    service = MetricsService(ctx.database, version_check_seconds=0)
+    yield service
+    service.close()
+
+
+def get(service, path):
+    return json.loads(service.handle(path))
+
+
+def test_flow_kpis_match_pipeline_metrics(ctx, service):
+    metrics = get_all_metrics_as_dict(ctx.checkpoints.load_tables(ctx.checkpoints.get("ingest")))
+    body = get(service, "/flows")
+    assert body["version"] == ctx.checkpoints.get("ingest").run_id
+
+    flows = {flow["ID Flow"]: flow for flow in body["data"]}
+    for label in ("Participantes Únicos", "Total Aplicaciones", "Votos Totales", "Compartidos"):
+        expected = metrics[label].set_index("ID Flow")[label]
+        assert {flow_id: flows[flow_id][label] for flow_id in expected.index} == expected.to_dict()
+    conversion = metrics["Tasa de Conversión"].set_index("ID Flow")["Tasa Conversión"]
+    for flow_id, rate in conversion.items():
+        assert flows[flow_id]["Tasa Conversión"] == pytest.approx(rate)
+
+    flow_id = next(iter(flows))
+    assert get(service, f"/flows/{flow_id}")["data"] == flows[flow_id]
+    with pytest.raises(APIError) as error:
+        service.handle("/flows/99999")
+    assert error.value.status == 404
+
+
+def test_series_and_top_skills(ctx, service):
+    metrics = get_all_metrics_as_dict(ctx.checkpoints.load_tables(ctx.checkpoints.get("ingest")))
+    monthly = get(service, "/series/month")["data"]
+    assert sum(row["Total Aplicaciones"] for row in monthly) == metrics["Total Aplicaciones"]["Total Aplicaciones"].sum()
+    assert [row["Mes"] for row in monthly] == sorted(row["Mes"] for row in monthly)
+
+    flow_id = int(metrics["Total Aplicaciones"]["ID Flow"].iloc[0])
+    weekly = get(service, f"/series/week?flow={flow_id}")["data"]
+    assert all(row["Semana"][4:6] == "-W" for row in weekly)
+    assert sum(row["Total Aplicaciones"] for row in weekly) == int(
+        metrics["Total Aplicaciones"].set_index("ID Flow").loc[flow_id, "Total Aplicaciones"]
+    )
+
+    skills = get(service, "/skills/top?limit=3")["data"]
+    assert len(skills) <= 3
+    assert [skill["Cantidad"] for skill in skills] == sorted((skill["Cantidad"] for skill in skills), reverse=True)
+
+    for path in ("/series/year", "/skills/top?limit=0", "/series/month?flow=x"):
+        with pytest.raises(APIError) as error:
+            service.handle(path)
+        assert error.value.status == 400
+
+
+def test_new_data_version_invalidates_cache(ctx, service):
+    first = service.handle("/flows")
+    assert service.handle("/flows") is first
+    assert service.cache.stats().hits == 1
+
+    save_data_version("nueva", bind=get_engine(ctx.database))
+    body = json.loads(service.handle("/flows"))
+    assert body["version"] == "nueva"
+    assert body["data"] == json.loads(first)["data"]
+    assert service.cache.stats().entries == 1
+
+
+def test_flow_reuses_cached_flows(service, monkeypatch):
+    calls = []
+
+    def counted(connection):
+        calls.append(1)
+        return flow_kpis(connection)
+
+    monkeypatch.setattr(server_module, "flow_kpis", counted)
+    flows = get(service, "/flows")["data"]
+    for flow in flows:
+        assert get(service, f"/flows/{flow['ID Flow']}")["data"] == flow
+    assert len(calls) == 1
+
+
+def test_flow_kpis_read_one_snapshot(ctx):
+    statements = []
+    connection = sqlite3.connect(ctx.database)
+    connection.set_trace_callback(statements.append)
+    flow_kpis(connection)
+    connection.close()
+    assert statements[0] == "BEGIN" and statements[-1] == "COMMIT"
+    assert len(statements) > 3
+
+
+def test_data_version_commits_with_data(ctx):
+    bind = get_engine(ctx.database)
+    flows = pd.DataFrame({"id": [1]})  # id repetido: falla la transacción completa
+    with pytest.raises(Exception):
+        save_data({"flows": flows}, bind=bind, version="rota")
+    connection = sqlite3.connect(ctx.database)
+    assert data_version(connection) == ctx.checkpoints.get("ingest").run_id
+    connection.close()
+
+
+def test_ttl_cache_expires_and_evicts_least_recent():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # "b" es la menos usada
+    assert cache.get("b") is None and cache.get("a") == 1
+
+    now[0] = 10
+    assert cache.get("a") is None
+    assert cache.get_or_compute("a", lambda: 4) == 4
+    assert cache.stats() == (2, 3, 1, 2)
+
+
+def test_http_server_keeps_connections_alive(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+        for path in ("/flows", "/version"):
+            connection.request("GET", path)
+            response = connection.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())["version"]
+        connection.request("GET", "/desconocida")
+        response = connection.getresponse()
+        assert response.status == 404 and "error" in json.loads(response.read())
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
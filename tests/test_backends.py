@@ -0,0 +1,88 @@
+"""
+Tests de equivalencia entre backends (pandas, Polars lazy, Arrow compute).
+"""
+
+import pandas as pd
+import pytest
+
+from processing.backends import GROUP_METRICS, compute_group_metrics
+from processing.metrics import (
+    application_total,
+    get_all_metrics_as_dict,
+    group_by_gender,
+    total_shared,
+    total_views,
+    total_votes,
+    unique_participants,
+    unique_views,
+)
+
+BACKEND_MODULES = {"pandas": "pandas", "polars": "polars", "arrow": "pyarrow"}
+
+
+@pytest.fixture(params=list(BACKEND_MODULES))
+def backend(request):
+    pytest.importorskip(BACKEND_MODULES[request.param])
+    return request.param
+
+
+def eager_metrics(data):
+    return {
+        "Participantes Únicos": unique_participants(data),
+        "Total Aplicaciones": application_total(data["resumes_exhibited"]),
+        "Votos Totales": total_votes(data["votes"]),
+        "Compartidos": total_shared(data["shares"]),
+        "Visualizaciones Únicas": unique_views(data["views"]),
+        "Visualizaciones Totales": total_views(data["views"]),
+        "Distribución por Género": group_by_gender(data["users"]),
+    }
+
+
+def assert_same_metrics(result, expected):
+    assert list(result) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(result[name], expected[name], obj=name)
+
+
+def test_backend_matches_eager_metrics(sample_data, backend):
+    result = compute_group_metrics(sample_data, backend)
+    assert_same_metrics(result, eager_metrics(sample_data))
+
+
+def test_backend_reads_csv_sources(sample_data, backend, tmp_path):
+    paths = {}
+    for table in {metric.table for metric in GROUP_METRICS.values()} | {"resumes"}:
+        paths[table] = tmp_path / f"{table}.csv"
+        sample_data[table].to_csv(paths[table], index=False)
+
+    result = compute_group_metrics(paths, backend)
+    assert_same_metrics(result, eager_metrics(sample_data))
+
+
+def test_backend_handles_missing_values(backend):
+    data = {
+        "resumes": pd.DataFrame({"id": [1, 2], "user_id": [10, 20]}),
+        "resumes_exhibited": pd.DataFrame(
+            {"id": [1, 2, 3], "resume_id": [1, 9, 2], "model_id": [1, 2, 1]}
+        ),
+        "votes": pd.DataFrame({"model_id": [1, 1], "value": [2, 3]}),
+        "shares": pd.DataFrame({"id": [1], "model_id": [2]}),
+        "views": pd.DataFrame({"id": [1, 2], "model_id": [1, 1], "user_id": [5, 5]}),
+        "users": pd.DataFrame({"id": [1, 2, 3], "gender": ["F", None, "M"]}),
+    }
+    result = compute_group_metrics(data, backend)
+    assert_same_metrics(result, eager_metrics(data))
+
+
+def test_get_all_metrics_with_backend(sample_data, backend):
+    expected = get_all_metrics_as_dict({k: v.copy() for k, v in sample_data.items()})
+    result = get_all_metrics_as_dict(
+        {k: v.copy() for k, v in sample_data.items()}, backend=backend
+    )
+    assert_same_metrics(result, expected)
+
+
+def test_chunked_tables_need_pandas_backend(sample_data):
+    chunked = {name: iter([df]) for name, df in sample_data.items()}
+    with pytest.raises(ValueError, match="polars"):
+        get_all_metrics_as_dict(chunked, backend="polars")
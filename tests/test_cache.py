@@ -0,0 +1,114 @@
+"""
+Tests para el almacén de artefactos de reportes.
+"""
+
+import pandas as pd
+from processing.metrics import get_all_metrics_as_dict
+from reporting.cache import (
+    ArtifactStore,
+    cached_csv_report,
+    cached_render_charts,
+    fingerprint_frame,
+    fingerprint_metrics,
+    report_key,
+)
+from reporting.charts import ChartSpec
+from reporting.documents import create_csv_report
+from reporting.reports import build_reports
+
+
+def test_fingerprint_frame_is_content_based():
+    df = pd.DataFrame({"Mes": ["2024-01", "2024-02"], "Total": [3, 5]})
+    same = pd.DataFrame({"Mes": ["2024-01", "2024-02"], "Total": [3, 5]}, index=[7, 8])
+    changed = pd.DataFrame({"Mes": ["2024-01", "2024-02"], "Total": [3, 6]})
+    renamed = df.rename(columns={"Total": "Cantidad"})
+
+    assert fingerprint_frame(df) == fingerprint_frame(same)
+    assert fingerprint_frame(df) != fingerprint_frame(changed)
+    assert fingerprint_frame(df) != fingerprint_frame(renamed)
+
+
+def test_report_key_depends_on_version():
+    fingerprints = {"Votos Totales": "abc"}
+    assert report_key(fingerprints, "1.0") == report_key(dict(fingerprints), "1.0")
+    assert report_key(fingerprints, "1.0") != report_key(fingerprints, "1.1")
+
+
+def test_artifact_store_round_trip(tmp_path):
+    store = ArtifactStore(tmp_path)
+    assert store.get("reporte.csv") is None
+    assert "reporte.csv" not in store
+
+    first = store.put("reporte.csv", b"contenido")
+    second = store.put("copia.csv", b"contenido")
+    assert first == second
+    assert store.get("reporte.csv") == b"contenido"
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2
+
+    store.mark("sent:reporte")
+    assert "sent:reporte" in store
+
+
+def test_cached_csv_report_reuses_sections(sample_data, tmp_path):
+    sample_metrics = get_all_metrics_as_dict(sample_data)
+    store = ArtifactStore(tmp_path)
+    fingerprints = fingerprint_metrics(sample_metrics)
+    result = cached_csv_report(sample_metrics, fingerprints, store)
+    assert result == create_csv_report(sample_metrics)
+
+    sections = len(list((tmp_path / "refs").iterdir()))
+    changed = dict(sample_metrics, **{"Votos Totales": pd.DataFrame({"ID Flow": [1], "Votos": [99]})})
+    result = cached_csv_report(changed, fingerprint_metrics(changed), store)
+    assert result == create_csv_report(changed)
+    assert len(list((tmp_path / "refs").iterdir())) == sections + 1
+
+
+def test_cached_render_charts(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path)
+    specs = [
+        ChartSpec("mes", "Aplicaciones por Mes", ["2024-01", "2024-02"], [3, 5], "Mes", "Total"),
+        ChartSpec("semana", "Aplicaciones por Semana", ["2024-W01"], [2], "Semana", "Total"),
+    ]
+    first = cached_render_charts(specs, store, dpi=50)
+
+    def render_nothing(specs, *args):
+        assert specs == []
+        return []
+
+    monkeypatch.setattr("reporting.cache.render_charts", render_nothing)
+    second = cached_render_charts(specs, store, dpi=50)
+    assert first == second
+
+
+def without_creation_date(pdf: bytes) -> bytes:
+    return b"\n".join(line for line in pdf.split(b"\n") if b"/CreationDate" not in line)
+
+
+def test_build_reports_reuses_identical_pdf(sample_data, tmp_path):
+    metrics = get_all_metrics_as_dict(sample_data)
+    store = ArtifactStore(tmp_path)
+    key, csv_bytes, pdf_bytes = build_reports(metrics, store)
+    assert build_reports(metrics, store) == (key, csv_bytes, pdf_bytes)
+    _, _, fresh_pdf = build_reports(metrics, ArtifactStore(tmp_path / "otro"))
+    # Mismo contenido salvo la fecha de creación de los metadatos del PDF
+    assert without_creation_date(fresh_pdf) == without_creation_date(pdf_bytes)
+
+
+def test_collect_keeps_last_reports(sample_data, tmp_path):
+    metrics = get_all_metrics_as_dict(sample_data)
+    store = ArtifactStore(tmp_path)
+    days = [
+        dict(metrics, **{"Votos Totales": pd.DataFrame({"ID Flow": [1], "Votos Totales": [day]})})
+        for day in range(3)
+    ]
+    keys = [build_reports(day, store, keep_reports=2)[0] for day in days]
+    assert store.get(f"{keys[0]}.pdf") is None and store.get(f"{keys[0]}.csv") is None
+    assert all(store.get(f"{key}.pdf") is not None for key in keys[1:])
+    assert sorted(path.name for path in (tmp_path / "reports").iterdir()) == sorted(keys[1:])
+
+    # Las secciones compartidas siguen disponibles: reconstruir no vuelve a formatearlas
+    objects = len(list((tmp_path / "objects").glob("*/*")))
+    assert build_reports(days[1], store, keep_reports=2)[0] == keys[1]
+    assert len(list((tmp_path / "objects").glob("*/*"))) == objects
+    assert store.collect(keep=1) > 0
+    assert store.get(f"{keys[2]}.pdf") is None and store.get(f"{keys[1]}.pdf") is not None
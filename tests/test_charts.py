@@ -0,0 +1,64 @@
+"""
+Tests para el renderizado de gráficos en memoria del reporte PDF.
+"""
+
+import zlib
+
+from fpdf import FPDF
+from reporting.charts import ChartSpec, add_chart, render_chart, render_charts
+
+SPECS = [
+    ChartSpec("mes", "Aplicaciones por Mes", ["2024-01", "2024-02"], [3, 5], "Mes", "Total"),
+    ChartSpec("semana", "Aplicaciones por Semana", ["2024-W01"], [2], "Semana", "Total"),
+]
+
+
+def test_render_chart_dpi():
+    chart = render_chart(SPECS[0], dpi=50)
+    assert (chart.width, chart.height) == (320, 240)
+    assert len(zlib.decompress(chart.data)) == chart.width * chart.height * 3
+
+    chart = render_chart(SPECS[0], dpi=100)
+    assert (chart.width, chart.height) == (640, 480)
+
+
+def test_render_charts_in_process_pool():
+    serial = render_charts(SPECS, dpi=40)
+    parallel = render_charts(SPECS, dpi=40, processes=2)
+    assert [chart.name for chart in parallel] == ["mes", "semana"]
+    assert parallel == serial
+
+
+def test_add_chart_embeds_image():
+    pdf = FPDF()
+    pdf.add_page()
+    chart = render_chart(SPECS[0], dpi=40)
+    add_chart(pdf, chart)
+    add_chart(pdf, chart)
+    output = pdf.output(dest="S")
+    assert output.count("/Subtype /Image") == 1
+    assert "/ColorSpace /DeviceRGB" in output
+
+
+def test_add_chart_keeps_distinct_images_with_same_name():
+    pdf = FPDF()
+    pdf.add_page()
+    add_chart(pdf, render_chart(SPECS[0], dpi=40))
+    add_chart(pdf, render_chart(SPECS[0]._replace(values=[5, 3]), dpi=40))
+    assert pdf.output(dest="S").count("/Subtype /Image") == 2
+
+
+def test_add_figure_closes_pyplot_figures():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from reporting.documents import PDFReport
+
+    pdf = PDFReport()
+    pdf.add_page()
+    fig, ax = plt.subplots()
+    ax.bar(["a", "b"], [1, 2])
+    pdf.add_figure(fig, dpi=30)
+    assert not plt.fignum_exists(fig.number)
+    assert len(pdf.images) == 1
@@ -0,0 +1,70 @@
+"""
+Tests para cohortes de usuarios y retención.
+"""
+
+import pandas as pd
+from processing.cohorts import cohort_activity, retention_rates
+
+
+def build_data():
+    df_users = pd.DataFrame(
+        data={
+            "id": [1, 2, 3, 4],
+            "created_at": ["2025-01-03", "2025-01-20", "2025-02-10", None],
+        }
+    )
+    df_resumes = pd.DataFrame(data={"id": [7, 8], "user_id": [2, 3]})
+    df_votes = pd.DataFrame(
+        data={
+            "user_id": [1, 1, 1, 3, 4],
+            "created_at": [
+                "2025-01-05",
+                "2025-01-25",
+                "2025-03-01",
+                "2025-02-11",
+                "2025-02-01",
+            ],
+        }
+    )
+    df_views = pd.DataFrame(
+        data={"user_id": [2, 1], "created_at": ["2025-02-02", "2024-12-31"]}
+    )
+    df_resumes_exhibited = pd.DataFrame(
+        data={"resume_id": [7, 8], "created_at": ["2025-02-15", "2025-04-01"]}
+    )
+    return {
+        "users": df_users,
+        "resumes": df_resumes,
+        "votes": df_votes,
+        "views": df_views,
+        "resumes_exhibited": df_resumes_exhibited,
+    }
+
+
+def test_cohort_activity():
+    result_mock = pd.DataFrame(
+        data={
+            "Cohorte": ["2025-01", "2025-02"],
+            "Usuarios": [2, 1],
+            "Mes 0": [1, 1],
+            "Mes 1": [1, 0],
+            "Mes 2": [1, 1],
+        }
+    )
+    result = cohort_activity(build_data())
+    assert result.astype({"Cohorte": object}).equals(
+        result_mock.astype({"Cohorte": object})
+    )
+
+
+def test_cohort_activity_max_periods():
+    result = cohort_activity(build_data(), max_periods=1)
+    assert list(result.columns) == ["Cohorte", "Usuarios", "Mes 0", "Mes 1"]
+    assert list(result["Mes 1"]) == [1, 0]
+
+
+def test_retention_rates():
+    result = retention_rates(cohort_activity(build_data()))
+    assert list(result["Mes 0"]) == [50.0, 100.0]
+    assert list(result["Mes 1"]) == [50.0, 0.0]
+    assert list(result["Usuarios"]) == [2, 1]
@@ -0,0 +1,78 @@
+"""
+Tests para la ejecución del pipeline como DAG de tareas.
+"""
+
+import threading
+import time
+
+import pytest
+from pipeline.dag import Task, critical_path, run_dag, topological_order
+
+
+def test_topological_order_respects_dependencies():
+    tasks = [Task("c", lambda inputs: None, ("a", "b")), Task("b", lambda inputs: None, ("a",)), Task("a", lambda inputs: None)]
+    assert topological_order(tasks) == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize(
+    "tasks, message",
+    [
+        ([Task("a", lambda inputs: None, ("b",)), Task("b", lambda inputs: None, ("a",))], "cycle"),
+        ([Task("a", lambda inputs: None, ("x",))], "unknown"),
+        ([Task("a", lambda inputs: None), Task("a", lambda inputs: None)], "Duplicate"),
+    ],
+)
+def test_topological_order_rejects_invalid_dags(tasks, message):
+    with pytest.raises(ValueError, match=message):
+        topological_order(tasks)
+
+
+def test_run_dag_passes_dependency_results():
+    report = run_dag(
+        [
+            Task("a", lambda inputs: 2),
+            Task("b", lambda inputs: 3),
+            Task("suma", lambda inputs: inputs["a"] + inputs["b"], ("a", "b")),
+            Task("doble", lambda inputs: inputs["suma"] * 2, ("suma",)),
+        ]
+    )
+    assert report.results == {"a": 2, "b": 3, "suma": 5, "doble": 10}
+    assert set(report.timings) == {"a", "b", "suma", "doble"}
+    assert report.timings["suma"].start >= max(report.timings["a"].end, report.timings["b"].end)
+
+
+def test_run_dag_runs_independent_tasks_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait(inputs):
+        barrier.wait()  # only passes if the three tasks are running at the same time
+        time.sleep(0.05)
+
+    tasks = [Task(name, wait) for name in ("a", "b", "c")] + [Task("fin", lambda inputs: None, ("a", "b", "c"))]
+    report = run_dag(tasks, max_workers=3)
+    assert report.wall_seconds < 0.5
+    assert report.critical_path[-1] == "fin"
+
+
+def test_run_dag_stops_on_error():
+    ran = []
+
+    def fail(inputs):
+        raise RuntimeError("fallo")
+
+    tasks = [Task("a", fail), Task("b", lambda inputs: ran.append("b"), ("a",))]
+    with pytest.raises(RuntimeError, match="fallo"):
+        run_dag(tasks)
+    assert ran == []
+
+
+def test_critical_path_is_longest_chain():
+    tasks = [Task("a", None), Task("b", None, ("a",)), Task("c", None), Task("d", None, ("b", "c"))]
+    report = run_dag([Task(task.name, lambda inputs: None, task.deps) for task in tasks])
+    timings = {
+        name: timing._replace(start=0.0, end=seconds)
+        for (name, timing), seconds in zip(sorted(report.timings.items()), (1.0, 2.0, 5.0, 1.0))
+    }
+    path, seconds = critical_path(tasks, timings)
+    assert path == ["c", "d"]
+    assert seconds == 6.0
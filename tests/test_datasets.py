@@ -0,0 +1,56 @@
+"""
+Tests para la ejecución del pipeline sobre varios datasets en paralelo.
+"""
+
+import json
+import sqlite3
+
+import pytest
+from pipeline.datasets import discover_datasets, run_datasets
+from pipeline.stages import pipeline_context
+
+
+@pytest.fixture
+def datasets_root(tmp_path, write_dataset, make_sample_data, monkeypatch):
+    for key in ("SENDGRID_API_KEY", "EMAIL_SENDER", "EMAIL_RECEIVER", "TEMPLATE_ID"):
+        monkeypatch.setenv(key, "reportes@talentpitch.co")
+    root = tmp_path / "paises"
+    write_dataset(root / "co", make_sample_data(n_users=40, seed=1))
+    write_dataset(root / "mx", make_sample_data(n_users=80, seed=2))
+    roto = write_dataset(root / "pe", make_sample_data(n_users=20, seed=3))
+    (roto / "users.csv").write_text("id,created_at\n1,2024-01-01\n")  # faltan columnas requeridas
+    (root / "vacio").mkdir()
+    return root
+
+
+def test_pipeline_context_writes_under_output_dir(tmp_path):
+    ctx = pipeline_context(tmp_path / "data", tmp_path / "salida")
+    assert ctx.database == tmp_path / "salida" / "talentpitch_data_clean.db"
+    assert ctx.checkpoints.root == tmp_path / "salida" / "checkpoints"
+    assert ctx.outbox.path == tmp_path / "salida" / "outbox.db"
+    ctx.outbox.close()
+
+
+def test_run_datasets_isolates_each_dataset(datasets_root, tmp_path):
+    datasets = discover_datasets(datasets_root)
+    assert list(datasets) == ["co", "mx", "pe"]
+
+    summary = run_datasets(datasets, tmp_path / "runs", processes=2)
+    assert [result.name for result in summary.results] == ["co", "mx", "pe"]
+    assert summary.failed == ["pe"]
+    assert "KeyError" in summary.results[2].error
+
+    for result in summary.results[:2]:
+        assert result.ok and result.report_key
+        with sqlite3.connect(tmp_path / "runs" / result.name / "talentpitch_data_clean.db") as connection:
+            users = connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        assert users == result.rows["users"]
+        assert (tmp_path / "runs" / result.name / "pipeline.log").read_text()
+    assert summary.results[0].rows["users"] == 40 and summary.results[1].rows["users"] == 80
+
+    written = json.loads((tmp_path / "runs" / "summary.json").read_text())
+    assert written["failed"] == ["pe"]
+    assert written["totals"]["users"] == 120
+    assert written["totals"]["Total Aplicaciones"] == sum(
+        result.totals["Total Aplicaciones"] for result in summary.results[:2]
+    )
@@ -0,0 +1,227 @@
+"""
+Tests para el outbox de correos y el envío asíncrono.
+"""
+
+import base64
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from delivery.batch import AttachmentEncoder, BatchDeliveryError, BatchMailer, Recipient
+from delivery.outbox import Attachment, Outbox
+from delivery.sender import backoff_delay, send_outbox
+from delivery.transport import SendGridTransport, TransportError
+
+
+class StubSendGrid(BaseHTTPRequestHandler):
+    """Local stand-in for the SendGrid API: replies with the queued status codes."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append((dict(self.headers), body))
+            server.clients.add(self.client_address)
+            status = server.statuses.pop(0) if server.statuses else 202
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSendGrid)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.statuses = []
+    server.clients = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    yield outbox
+    outbox.close()
+
+
+def transport_for(server):
+    host, port = server.server_address
+    return SendGridTransport("clave", "reportes@talentpitch.co", base_url=f"http://{host}:{port}")
+
+
+def test_enqueue_is_idempotent(outbox):
+    attachment = Attachment("metrics.csv", "text/csv", b"a,b\n1,2\n")
+    first = outbox.enqueue("equipo@talentpitch.co", "tpl", {"subject": "Reporte"}, [attachment])
+    second = outbox.enqueue(["equipo@talentpitch.co"], "tpl", {"subject": "Reporte"}, [attachment])
+    assert first == second
+    assert outbox.counts() == {"pending": 1}
+
+    outbox.enqueue("otro@talentpitch.co", "tpl", {}, [attachment], idempotency_key="otro")
+    assert outbox.counts() == {"pending": 2}
+    assert outbox.conn.execute("SELECT COUNT(*) FROM blobs").fetchone() == (1,)
+
+
+def test_claim_leases_messages(outbox):
+    outbox.enqueue("equipo@talentpitch.co", "tpl", {}, idempotency_key="a")
+    (message,) = outbox.claim(10, now=1e12)
+    assert message.attempts == 1
+    assert outbox.claim(10, now=1e12) == []
+    # An expired lease makes the message claimable again
+    (message,) = outbox.claim(10, now=1e12 + outbox.lease_seconds + 1)
+    assert message.attempts == 2
+
+
+def test_backoff_delay():
+    rng = random.Random(0)
+    delays = [backoff_delay(attempt, base=1.0, cap=10.0, rng=rng) for attempt in range(1, 7)]
+    assert 0.5 <= delays[0] <= 1.0
+    assert 2.0 <= delays[2] <= 4.0
+    assert all(5.0 <= delay <= 10.0 for delay in delays[4:])
+
+
+def test_send_outbox_delivers_to_stub(outbox, stub_server):
+    content = b"ID Flow,Votos\n1,3\n"
+    for receiver in ("a@talentpitch.co", "b@talentpitch.co", "c@talentpitch.co"):
+        outbox.enqueue(receiver, "tpl", {"subject": "Reporte"}, [Attachment("m.csv", "text/csv", content)])
+
+    result = send_outbox(outbox, transport_for(stub_server), concurrency=2)
+    assert result.sent == 3
+    assert outbox.counts() == {"sent": 3}
+
+    headers, body = stub_server.requests[0]
+    assert headers["Authorization"] == "Bearer clave"
+    assert headers["Idempotency-Key"] == body["custom_args"]["idempotency_key"]
+    assert body["template_id"] == "tpl"
+    assert base64.b64decode(body["attachments"][0]["content"]) == content
+
+
+def test_send_outbox_retries_with_backoff(outbox, stub_server):
+    stub_server.statuses = [503, 429]
+    key = outbox.enqueue("a@talentpitch.co", "tpl", {})
+
+    result = send_outbox(outbox, transport_for(stub_server), backoff_base=0.01, timeout=5)
+    assert result == (1, 2, 0)
+    assert outbox.status(key) == "sent"
+    assert len(stub_server.requests) == 3
+
+
+def test_send_outbox_permanent_failure(outbox, stub_server):
+    stub_server.statuses = [400]
+    key = outbox.enqueue("a@talentpitch.co", "tpl", {})
+
+    result = send_outbox(outbox, transport_for(stub_server))
+    assert result == (0, 0, 1)
+    assert outbox.status(key) == "failed"
+    (error,) = outbox.conn.execute("SELECT last_error FROM messages").fetchone()
+    assert error.startswith("HTTP 400")
+
+
+def test_send_outbox_gives_up_after_max_attempts(outbox):
+    class DownTransport:
+        async def send(self, message):
+            raise TransportError("caído")
+
+    key = outbox.enqueue("a@talentpitch.co", "tpl", {})
+    result = send_outbox(outbox, DownTransport(), max_attempts=3, backoff_base=0.001, timeout=5)
+    assert result == (0, 2, 1)
+    assert outbox.status(key) == "failed"
+
+
+def test_send_outbox_reuses_connections(outbox, stub_server):
+    for i in range(6):
+        outbox.enqueue(f"{i}@talentpitch.co", "tpl", {})
+    transport = transport_for(stub_server)
+    assert send_outbox(outbox, transport, concurrency=2).sent == 6
+    transport.close()
+    assert len(stub_server.clients) <= 2
+
+
+def test_attachment_encoder_encodes_once():
+    encoder = AttachmentEncoder()
+    csv = Attachment("flow_1.csv", "text/csv", b"ID Flow\n1\n")
+    same = Attachment("flow_2.csv", "text/csv", b"ID Flow\n1\n")
+    encoded = json.loads(encoder.encode_all([csv, same]))
+    assert len(encoder.cache) == 1
+    assert [item["filename"] for item in encoded] == ["flow_1.csv", "flow_2.csv"]
+    assert base64.b64decode(encoded[1]["content"]) == b"ID Flow\n1\n"
+
+
+def test_batch_mailer_groups_personalizations(stub_server):
+    host, port = stub_server.server_address
+    recipients = [Recipient(f"{i}@talentpitch.co", {"nombre": f"Usuario {i}"}) for i in range(25)]
+    attachment = Attachment("metrics.pdf", "application/pdf", b"%PDF-1.3")
+
+    with BatchMailer("clave", "reportes@talentpitch.co", f"http://{host}:{port}", batch_size=10) as mailer:
+        result = mailer.send(recipients, "tpl", [attachment])
+        mailer.send(["extra@talentpitch.co"], "tpl", [attachment])
+
+    assert (result.messages, result.requests, result.connections) == (25, 3, 1)
+    assert result.messages_per_second > 0
+    assert len(stub_server.clients) == 1
+    assert [len(body["personalizations"]) for _, body in stub_server.requests] == [10, 10, 5, 1]
+    first = stub_server.requests[0][1]["personalizations"][0]
+    assert first == {"to": [{"email": "0@talentpitch.co"}], "dynamic_template_data": {"nombre": "Usuario 0"}}
+    assert stub_server.requests[2][1]["attachments"][0]["filename"] == "metrics.pdf"
+
+
+def test_batch_mailer_rejected_request(stub_server):
+    host, port = stub_server.server_address
+    stub_server.statuses = [401]
+    with BatchMailer("clave", "reportes@talentpitch.co", f"http://{host}:{port}") as mailer:
+        with pytest.raises(TransportError):
+            mailer.send(["a@talentpitch.co"], "tpl")
+
+
+def test_batch_mailer_reports_progress_of_failed_batch(stub_server):
+    host, port = stub_server.server_address
+    stub_server.statuses = [202, 503]
+    with BatchMailer("clave", "reportes@talentpitch.co", f"http://{host}:{port}", batch_size=10) as mailer:
+        with pytest.raises(BatchDeliveryError) as error:
+            mailer.send([f"{i}@talentpitch.co" for i in range(25)], "tpl")
+    assert error.value.batch == 1 and error.value.retryable
+    assert (error.value.result.messages, error.value.result.requests) == (10, 1)
+
+
+def test_batch_mailer_outbox_skips_sent_batches(outbox, stub_server):
+    host, port = stub_server.server_address
+    recipients = [Recipient(f"{i}@talentpitch.co", {"nombre": f"Usuario {i}"}) for i in range(25)]
+    attachment = Attachment("metrics.pdf", "application/pdf", b"%PDF-1.3")
+    stub_server.statuses = [202, 503]
+    with BatchMailer("clave", "reportes@talentpitch.co", f"http://{host}:{port}", batch_size=10) as mailer:
+        with pytest.raises(BatchDeliveryError):
+            mailer.send(recipients, "tpl", [attachment], outbox=outbox, key="campaña")
+        assert outbox.counts() == {"sent": 1, "pending": 1}
+
+        result = mailer.send(recipients, "tpl", [attachment], outbox=outbox, key="campaña")
+    assert (result.messages, result.requests, result.skipped) == (15, 2, 10)
+    assert outbox.counts() == {"sent": 3}
+    sent_to = [p["to"][0]["email"] for _, body in stub_server.requests[2:] for p in body["personalizations"]]
+    assert sent_to == [recipient.email for recipient in recipients[10:]]
+    assert all(headers["Idempotency-Key"].startswith("campaña:") for headers, _ in stub_server.requests)
+
+
+def test_outbox_sender_delivers_failed_batch(outbox, stub_server):
+    host, port = stub_server.server_address
+    recipients = [Recipient(f"{i}@talentpitch.co", {"nombre": f"Usuario {i}"}) for i in range(3)]
+    stub_server.statuses = [503]
+    with BatchMailer("clave", "reportes@talentpitch.co", f"http://{host}:{port}") as mailer:
+        with pytest.raises(BatchDeliveryError):
+            mailer.send(recipients, "tpl", outbox=outbox, key="campaña")
+
+    assert send_outbox(outbox, transport_for(stub_server)).sent == 1
+    _, body = stub_server.requests[-1]
+    assert body["personalizations"] == [
+        {"to": [{"email": r.email}], "dynamic_template_data": r.dynamic_data} for r in recipients
+    ]
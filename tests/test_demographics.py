@@ -0,0 +1,84 @@
+"""
+Tests para la segmentación demográfica (edades exactas, rangos y tablas cruzadas).
+"""
+
+import numpy as np
+import pandas as pd
+from processing.demographics import (
+    age_distribution,
+    age_labels,
+    demographic_crosstab,
+    exact_ages,
+)
+from processing.metrics import group_by_age
+
+REFERENCE = pd.Timestamp("2024-06-15")
+
+
+def test_exact_ages():
+    birth_dates = pd.Series(["2006-06-15", "2006-06-16", "1990-01-01", None, "no es fecha"])
+    result = exact_ages(birth_dates, REFERENCE)
+    np.testing.assert_array_equal(result, [18.0, 17.0, 34.0, np.nan, np.nan])
+
+
+def test_age_labels():
+    assert age_labels() == ["<18", "18-25", "26-55", "56+"]
+    assert age_labels((0, 30, 60)) == ["<30", "30-59", "60+"]
+
+
+def test_age_distribution_custom_edges():
+    users = pd.DataFrame({"birth_date": ["2010-01-01", "1994-06-16", "1994-06-15", "1950-01-01"]})
+    result_mock = pd.DataFrame({"Rango Edad": ["<30", "30-59", "60+"], "Cantidad": [2, 1, 1]})
+    result = age_distribution(users, edges=(0, 30, 60), reference=REFERENCE)
+    assert result.equals(result_mock)
+
+
+def test_group_by_age_does_not_modify_input():
+    users = pd.DataFrame({"birth_date": ["1990-05-15", "2010-01-01"]})
+    original = users.copy()
+    group_by_age(users)
+    assert users.equals(original)
+
+
+def test_demographic_crosstab():
+    data = {
+        "users": pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4],
+                "gender": ["F", "M", "F", None],
+                "birth_date": ["2010-01-01", "1990-01-01", "1991-01-01", "1990-01-01"],
+            }
+        )
+    }
+    result_mock = pd.DataFrame(
+        {
+            "Rango Edad": ["<18", "26-55", "26-55"],
+            "Género": ["F", "F", "M"],
+            "Cantidad": [1, 1, 1],
+        }
+    )
+    result = demographic_crosstab(data, ("age", "gender"), reference=REFERENCE)
+    assert result.equals(result_mock)
+
+
+def test_demographic_crosstab_per_flow():
+    data = {
+        "users": pd.DataFrame({"id": [10, 20, 30], "gender": ["F", "M", "F"]}),
+        "resumes": pd.DataFrame({"id": [100, 200, 300, 101], "user_id": [10, 20, 30, 10]}),
+        "resumes_exhibited": pd.DataFrame(
+            {"resume_id": [100, 101, 200, 300, 300], "model_id": [1, 1, 1, 2, 2]}
+        ),
+    }
+    result_mock = pd.DataFrame(
+        {"ID Flow": [1, 1, 2], "Género": ["F", "M", "F"], "Cantidad": [1, 1, 1]}
+    )
+    result = demographic_crosstab(data, ("gender",), per_flow=True)
+    assert result.equals(result_mock)
+
+
+def test_demographic_crosstab_matches_groupby(sample_data):
+    users = sample_data["users"]
+    result = demographic_crosstab(sample_data, ("gender", "country", "city"))
+    expected = users.groupby(["gender", "country", "city"]).size()
+    assert result["Cantidad"].tolist() == expected.tolist()
+    assert result["Cantidad"].sum() == len(users)
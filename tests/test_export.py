@@ -0,0 +1,78 @@
+"""
+Tests para la exportación de métricas por streaming.
+"""
+
+import gzip
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+from processing.metrics import get_all_metrics_as_dict
+from reporting.documents import create_csv_report
+from reporting.export import export_metrics, iter_chunks, metric_slug, write_csv_report
+
+
+def test_metric_slug():
+    assert metric_slug("Distribución por Género") == "distribucion_por_genero"
+    assert metric_slug("Top Skills") == "top_skills"
+
+
+def test_iter_chunks():
+    df = pd.DataFrame({"Votos": range(7)})
+    assert [len(chunk) for chunk in iter_chunks(df, 3)] == [3, 3, 1]
+    assert [len(chunk) for chunk in iter_chunks(df.iloc[:0], 3)] == [0]
+    assert [len(chunk) for chunk in iter_chunks(iter([df, df]), 3)] == [7, 7]
+
+
+def test_write_csv_report_matches_create_csv_report(sample_data):
+    metrics = get_all_metrics_as_dict(sample_data)
+    expected = create_csv_report(metrics)
+
+    buffer = io.BytesIO()
+    write_csv_report(metrics, buffer, chunk_rows=2)
+    assert buffer.getvalue() == expected
+    assert not buffer.closed
+
+
+def test_write_csv_report_compressed(sample_data, tmp_path):
+    metrics = get_all_metrics_as_dict(sample_data)
+    expected = create_csv_report(metrics)
+
+    write_csv_report(metrics, tmp_path / "metrics.csv.gz", compression="gzip")
+    assert gzip.decompress((tmp_path / "metrics.csv.gz").read_bytes()) == expected
+
+    write_csv_report(metrics, tmp_path / "metrics.zip", compression="zip")
+    with zipfile.ZipFile(tmp_path / "metrics.zip") as archive:
+        assert archive.read("metrics.csv") == expected
+
+
+def test_write_csv_report_chunk_iterables():
+    chunks = (pd.DataFrame({"ID Flow": [i], "Votos": [i * 2]}) for i in range(3))
+    buffer = io.BytesIO()
+    write_csv_report({"Votos Totales": chunks}, buffer)
+    assert buffer.getvalue() == b" -- Votos Totales --\nID Flow,Votos\n0,0\n1,2\n2,4\n\n\n"
+
+
+def test_write_csv_report_unknown_compression():
+    with pytest.raises(ValueError):
+        write_csv_report({}, io.BytesIO(), compression="bz2")
+
+
+@pytest.mark.parametrize(
+    "fmt,compression,suffix",
+    [("jsonl", None, ".jsonl"), ("jsonl", "gzip", ".jsonl.gz"), ("parquet", "zstd", ".parquet")],
+)
+def test_export_metrics(sample_data, tmp_path, fmt, compression, suffix):
+    metrics = get_all_metrics_as_dict(sample_data)
+    paths = export_metrics(metrics, tmp_path, fmt=fmt, compression=compression, chunk_rows=4)
+    assert list(paths) == list(metrics)
+
+    result = paths["Top Flows"]
+    assert result.name == f"top_flows{suffix}"
+    if fmt == "parquet":
+        result = pd.read_parquet(result)
+    else:
+        result = pd.read_json(result, lines=True)
+    result_mock = metrics["Top Flows"].reset_index(drop=True)
+    assert result.equals(result_mock)
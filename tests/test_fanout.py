@@ -0,0 +1,54 @@
+"""
+Tests para la generación de reportes por flow en paralelo.
+"""
+
+import pandas as pd
+from main import main
+from pipeline.stages import pipeline_context
+from reporting.fanout import FlowPartition, fan_out_flow_reports, flow_report_tables
+
+
+def test_flow_partition_matches_filter(sample_data):
+    tables = flow_report_tables(sample_data)
+    partition = FlowPartition(tables)
+    assert list(partition.flow_ids) == [1, 2, 3, 4, 5, 6]
+
+    for flow_id in partition.flow_ids:
+        flow_tables = partition.tables_for(flow_id)
+        for name, df in tables.items():
+            expected = df[df["ID Flow"] == flow_id].reset_index(drop=True)
+            pd.testing.assert_frame_equal(flow_tables[name], expected, obj=name)
+
+
+def test_flow_partition_missing_flow():
+    partition = FlowPartition({"KPIs": pd.DataFrame({"ID Flow": [1, 1], "Votos": [2, 3]})})
+    assert partition.tables_for(7)["KPIs"].empty
+
+
+def test_fan_out_flow_reports(sample_data, tmp_path):
+    summary = fan_out_flow_reports(sample_data, tmp_path / "flows", flow_ids=[1, 2], processes=2)
+    assert summary.reports == 2
+    assert summary.reports_per_second > 0
+    names = sorted(path.name for path in (tmp_path / "flows").iterdir())
+    assert names == ["flow_1.csv", "flow_1.pdf", "flow_2.csv", "flow_2.pdf"]
+    assert (tmp_path / "flows" / "flow_1.pdf").read_bytes().startswith(b"%PDF")
+    assert " -- KPIs --" in (tmp_path / "flows" / "flow_2.csv").read_text()
+
+
+def test_fanout_stage_from_cli(sample_data, write_dataset, tmp_path):
+    data_dir = write_dataset(tmp_path / "data", sample_data)
+    output_dir = tmp_path / "salida"
+    main(["metrics", "--data-dir", str(data_dir), "--output-dir", str(output_dir)])
+    main(["fanout", "--data-dir", str(data_dir), "--output-dir", str(output_dir), "--workers", "1"])
+
+    names = sorted(path.name for path in (output_dir / "flow_reports").iterdir())
+    assert names == [f"flow_{flow_id}.{ext}" for flow_id in range(1, 7) for ext in ("csv", "pdf")]
+    ctx = pipeline_context(data_dir, output_dir)
+    checkpoint = ctx.checkpoints.get("fanout")
+    assert checkpoint.meta["reports"] == 6
+    assert checkpoint.upstream == ctx.checkpoints.get("metrics").run_id
+    ctx.outbox.close()
+
+    others = tmp_path / "otros"
+    main(["fanout", "--data-dir", str(data_dir), "--output-dir", str(output_dir), "--flow-reports", str(others)])
+    assert len(list(others.glob("flow_*.pdf"))) == 6
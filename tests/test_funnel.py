@@ -0,0 +1,32 @@
+"""
+Tests para el embudo de conversión por flow (vistas -> aplicaciones -> votos).
+"""
+
+import pandas as pd
+from processing.funnel import engagement_funnel
+
+
+def test_engagement_funnel():
+    data = {
+        "views": pd.DataFrame(
+            data={"model_id": [1, 1, 1, 2, 2, 1], "user_id": [10, 20, 30, 10, 40, 10]}
+        ),
+        "resumes": pd.DataFrame(data={"id": [100, 200, 400], "user_id": [10, 20, 40]}),
+        "resumes_exhibited": pd.DataFrame(
+            data={"resume_id": [100, 200, 400, 100], "model_id": [1, 1, 3, 2]}
+        ),
+        "votes": pd.DataFrame(data={"model_id": [1, 2], "user_id": [20, 30]}),
+        "shares": pd.DataFrame(data={"model_id": [1, 1, 3]}),
+    }
+    result_mock = pd.DataFrame(
+        data={
+            "ID Flow": [1, 2, 3],
+            "Vistas Únicas": [3, 2, 0],
+            "Vieron y Aplicaron": [2, 1, 0],
+            "Aplicantes que Votaron": [1, 0, 0],
+            "Compartidos": [2, 0, 1],
+            "Conversión Vista-Aplicación": [66.67, 50.0, 0.0],
+        }
+    )
+    result = engagement_funnel(data)
+    assert result.equals(result_mock)
@@ -0,0 +1,105 @@
+"""
+Tests para la instrumentación del pipeline: tiempos, filas, memoria y archivos de resumen.
+"""
+
+import json
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.stages import pipeline_context, run_stage
+from utils.instrumentation import NULL_SPAN, RECORDER, Recorder, instrument, measure
+
+
+@pytest.fixture
+def recorder():
+    yield RECORDER
+    RECORDER.disable()
+    RECORDER.reset()
+
+
+@instrument("Duplicar", kind="metric")
+def double(df):
+    return pd.concat([df, df])
+
+
+def test_disabled_recorder_measures_nothing(recorder):
+    assert measure("ingest") is NULL_SPAN
+    with measure("ingest") as span:
+        span.rows_out = 10
+    assert span.rows_out is None
+    assert len(double(pd.DataFrame({"a": [1, 2]}))) == 4
+    assert recorder.measurements == []
+
+
+def test_spans_record_time_rows_and_errors(recorder):
+    recorder.enable(memory="none")
+    assert len(double(pd.DataFrame({"a": [1, 2, 3]}))) == 6
+    with pytest.raises(ValueError):
+        with measure("persist") as span:
+            span.rows_in = 5
+            raise ValueError("fallo")
+
+    metric, stage = recorder.measurements
+    assert (metric.name, metric.kind, metric.rows_in, metric.rows_out) == ("Duplicar", "metric", 3, 6)
+    assert metric.wall_seconds >= 0 and metric.cpu_seconds >= 0 and metric.error is None
+    assert (stage.name, stage.rows_in, stage.error) == ("persist", 5, "ValueError")
+    assert recorder.aggregate()[("stage", "persist")]["errors"] == 1
+
+
+def test_tracemalloc_peak_covers_nested_spans(recorder):
+    recorder.enable(memory="tracemalloc")
+    with measure("exterior") as outer:
+        with measure("interior") as inner:
+            buffer = np.ones(2_000_000)  # ~16 MB
+            del buffer
+        small = bytearray(1000)
+    assert inner.peak_memory >= 16_000_000
+    assert outer.peak_memory >= inner.peak_memory
+    assert len(small) == 1000
+
+
+def test_pipeline_stages_and_metrics_are_recorded(recorder, tmp_path, sample_data, write_dataset):
+    resumes = sample_data["resumes"]
+    # Dos resumes de usuarios inexistentes: los rechaza la validación de FK
+    sample_data["resumes"] = pd.concat([resumes, resumes.tail(2).assign(id=[901, 902], user_id=[9001, 9002])])
+    ctx = pipeline_context(write_dataset(tmp_path / "data", sample_data), tmp_path / "salida")
+    recorder.enable()
+    try:
+        run_stage(ctx, "metrics")
+    finally:
+        ctx.outbox.close()
+
+    measurements = {(m.kind, m.name): m for m in recorder.measurements}
+    validation = measurements[("validation", "resumes")]
+    assert validation.rows_in == len(sample_data["resumes"])
+    assert validation.rejected == 2 and validation.rows_out == validation.rows_in - 2
+    assert measurements[("read", "resumes")].rows_out == len(sample_data["resumes"])
+
+    metrics = ctx.checkpoints.load_tables(ctx.checkpoints.get("metrics"))
+    for name in ("Total Aplicaciones", "Top Skills", "Embudo de Conversión", "Retención por Cohorte"):
+        assert measurements[("metric", name)].rows_out == len(metrics[name])
+    assert measurements[("stage", "metrics")].peak_memory > 0
+
+    summary, prometheus = recorder.write(tmp_path / "instrumentation")
+    written = json.loads(summary.read_text())
+    assert written["rows_rejected"] == 2
+    totals = {(total["kind"], total["name"]): total for total in written["totals"]}
+    assert totals[("validation", "resumes")]["rejected"] == 2
+    assert len(written["measurements"]) == len(recorder.measurements)
+    text = prometheus.read_text()
+    assert 'talentpitch_pipeline_rows_rejected{kind="validation",name="resumes"} 2' in text
+    assert "# TYPE talentpitch_pipeline_calls_total counter" in text
+    sample = re.compile(r'^talentpitch_pipeline_\w+\{kind="[^"]*",name="(?:[^"\\]|\\.)*"\} \S+$')
+    assert all(line.startswith("#") or sample.match(line) for line in text.splitlines())
+
+
+def test_prometheus_labels_are_escaped():
+    recorder = Recorder()
+    recorder.enable(memory="none")
+    with recorder.measure('tabla "rara"\\', "stage"):
+        pass
+    assert 'name="tabla \\"rara\\"\\\\"' in recorder.prometheus_text()
+    with pytest.raises(ValueError):
+        recorder.enable(memory="heap")
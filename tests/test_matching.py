@@ -0,0 +1,82 @@
+"""
+Tests para el emparejamiento candidato-flow con matrices dispersas de skills.
+"""
+
+import numpy as np
+import pandas as pd
+from processing.matching import SkillMatcher
+from processing.skills import SKILL_COLUMNS
+
+
+def build_data():
+    return {
+        "resumes": pd.DataFrame(
+            {
+                "id": [100, 200, 300],
+                "user_id": [1, 2, 3],
+                "skills": ["['Python', 'SQL']", "['Python']", "['UX']"],
+            }
+        ),
+        "profiles": pd.DataFrame(
+            {"user_id": [4, 5], "skills": ["['python', 'sql']", "['sql']"]}
+        ),
+        "resumes_exhibited": pd.DataFrame({"resume_id": [100, 300], "model_id": [1, 2]}),
+    }
+
+
+def test_skill_matrices():
+    matcher = SkillMatcher.build(build_data())
+    assert list(matcher.user_ids) == [1, 2, 3, 4, 5]
+    assert matcher.users.shape == (5, 3)
+    assert matcher.users.nnz == 7
+    assert matcher.flows.toarray().tolist() == [[1, 1, 0], [0, 0, 1]]
+
+
+def test_top_candidates():
+    matcher = SkillMatcher.build(build_data())
+    result_mock = pd.DataFrame(
+        {"ID Flow": [1, 1], "ID Usuario": [4, 2], "Similitud": [1.0, 0.7071]}
+    )
+    result = matcher.top_candidates(k=2)
+    assert result.equals(result_mock)
+
+
+def test_top_candidates_including_applicants():
+    matcher = SkillMatcher.build(build_data())
+    result = matcher.top_candidates(k=5, flow_ids=[2], exclude_applicants=False)
+    assert result["ID Usuario"].tolist() == [3]
+
+
+def test_top_candidates_match_dense_scores(sample_data):
+    matcher = SkillMatcher.build(sample_data)
+    result = matcher.top_candidates(k=3, batch_size=2)
+
+    users = matcher.users.toarray()
+    flows = matcher.flows.toarray()
+    users = users / np.maximum(np.linalg.norm(users, axis=1, keepdims=True), 1e-12)
+    flows = flows / np.linalg.norm(flows, axis=1, keepdims=True)
+    dense = flows @ users.T
+    dense[matcher.applicants.toarray() > 0] = 0
+    expected = np.sort(dense, axis=1)[:, ::-1][:, :3]
+    scores = result.groupby("ID Flow")["Similitud"].apply(list)
+    for row, flow_id in enumerate(matcher.flow_ids):
+        np.testing.assert_allclose(scores[flow_id], expected[row], atol=1e-4)
+
+
+def test_languages_and_tools_do_not_match():
+    data = build_data()
+    # El aplicante del Flow 1 (usuario 1) y el usuario 4 solo comparten idioma y herramienta
+    data["profiles"] = pd.DataFrame(
+        {
+            "user_id": [1, 4],
+            "skills": ["['Python']", "['UX']"],
+            "tools": ["['Excel']", "['Excel']"],
+            "languages": ["['Español']", "['Español']"],
+        }
+    )
+    matcher = SkillMatcher.build(data)
+    assert "español" not in matcher.dictionary.skills and "excel" not in matcher.dictionary.skills
+    assert matcher.top_candidates(k=5, flow_ids=[1])["ID Usuario"].tolist() == [2]
+
+    with_languages = SkillMatcher.build(data, columns=SKILL_COLUMNS)
+    assert 4 in with_languages.top_candidates(k=5, flow_ids=[1])["ID Usuario"].tolist()
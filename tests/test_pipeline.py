@@ -0,0 +1,140 @@
+"""
+Tests para las etapas del pipeline y sus checkpoints.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+from config import get_settings
+from delivery.outbox import Outbox
+from pipeline import stages
+from pipeline.checkpoints import CheckpointStore
+from pipeline.stages import PipelineContext, is_current, run_pipeline, run_pipeline_dag, run_stage
+from reporting.cache import ArtifactStore
+
+
+@pytest.fixture
+def ctx(tmp_path, monkeypatch):
+    for key, value in {
+        "SENDGRID_API_KEY": "clave",
+        "EMAIL_SENDER": "reportes@talentpitch.co",
+        "EMAIL_RECEIVER": "equipo@talentpitch.co",
+        "TEMPLATE_ID": "tpl",
+    }.items():
+        monkeypatch.setenv(key, value)
+    get_settings.cache_clear()
+    outbox = Outbox(tmp_path / "outbox.db")
+    yield PipelineContext(
+        CheckpointStore(tmp_path / "checkpoints"),
+        ArtifactStore(tmp_path / "artifacts"),
+        outbox,
+        data_dir=tmp_path / "data",
+    )
+    outbox.close()
+    get_settings.cache_clear()
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoints = CheckpointStore(tmp_path)
+    assert checkpoints.get("metrics") is None
+
+    tables = {"Top Skills": pd.DataFrame({"Skill": ["Python"], "Cantidad": [3]}), "Vacía": pd.DataFrame()}
+    first = checkpoints.save("metrics", tables=tables, blobs={"a.bin": b"\x00\x01"}, meta={"n": 1})
+    result = checkpoints.load_tables(checkpoints.get("metrics"))
+    assert list(result) == ["Top Skills", "Vacía"]
+    assert result["Top Skills"].equals(tables["Top Skills"])
+    assert checkpoints.load_blob(first, "a.bin") == b"\x00\x01"
+    assert first.meta == {"n": 1}
+
+    second = checkpoints.save("report", upstream=first)
+    assert checkpoints.is_current("report", first)
+    third = checkpoints.save("metrics", tables=tables)
+    assert third.run_id != first.run_id
+    assert not checkpoints.is_current("report", third)
+    assert second.upstream == first.run_id
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics", "report"]
+
+
+def test_checkpoint_survives_crash_between_renames(tmp_path, monkeypatch):
+    checkpoints = CheckpointStore(tmp_path)
+    first = checkpoints.save("metrics", tables={"Top Skills": pd.DataFrame({"Cantidad": [3]})})
+
+    replace = os.replace
+
+    def crash_on_second_rename(source, target):
+        if str(source).endswith(".tmp"):
+            raise KeyboardInterrupt  # the process dies between the two renames
+        replace(source, target)
+
+    monkeypatch.setattr(os, "replace", crash_on_second_rename)
+    with pytest.raises(KeyboardInterrupt):
+        checkpoints.save("metrics", tables={"Top Skills": pd.DataFrame({"Cantidad": [4]})})
+    monkeypatch.setattr(os, "replace", replace)
+
+    assert not (tmp_path / "metrics").exists()
+    recovered = checkpoints.get("metrics")
+    assert recovered.run_id == first.run_id
+    assert checkpoints.load_tables(recovered)["Top Skills"]["Cantidad"].tolist() == [3]
+
+    third = checkpoints.save("metrics", tables={"Top Skills": pd.DataFrame({"Cantidad": [5]})})
+    assert checkpoints.get("metrics").run_id == third.run_id
+    assert not list(tmp_path.glob(".metrics.*.old"))
+
+
+def test_stage_restarts_from_checkpoint(ctx, sample_data):
+    ingest = ctx.checkpoints.save("ingest", tables=sample_data, meta={"sources": {}})
+
+    report = run_stage(ctx, "report")
+    metrics = ctx.checkpoints.get("metrics")
+    assert metrics.upstream == ingest.run_id
+    assert report.upstream == metrics.run_id
+    assert ctx.checkpoints.load_blob(report, "metrics_report.pdf").startswith(b"%PDF")
+
+    send = run_stage(ctx, "send")
+    assert send.upstream == report.run_id
+    assert send.meta["status"] == "pending"
+    assert ctx.outbox.counts() == {"pending": 1}
+
+
+def test_run_pipeline_resume_skips_current_stages(ctx, sample_data, monkeypatch):
+    ran = []
+
+    def fake_persist(ctx):
+        ran.append("persist")
+        return ctx.checkpoints.save("persist", upstream=ctx.checkpoints.get("ingest"))
+
+    monkeypatch.setattr(stages, "source_signature", lambda data_dir: {})
+    monkeypatch.setitem(stages.STAGE_FUNCTIONS, "persist", fake_persist)
+    ctx.checkpoints.save("ingest", tables=sample_data, meta={"sources": {}})
+    run_stage(ctx, "persist")
+    run_stage(ctx, "send")
+    assert all(is_current(ctx, stage) for stage in ("ingest", "persist", "metrics", "report", "send"))
+
+    ran.clear()
+    before = {stage: ctx.checkpoints.get(stage).run_id for stage in stages.STAGES}
+    checkpoints = run_pipeline(ctx, resume=True)
+    assert ran == []
+    assert {stage: checkpoint.run_id for stage, checkpoint in checkpoints.items()} == before
+    assert ctx.outbox.counts() == {"pending": 1}
+
+    # New metrics invalidate the report and send checkpoints
+    run_stage(ctx, "metrics")
+    assert not is_current(ctx, "report")
+    assert not is_current(ctx, "send")
+    assert is_current(ctx, "persist")
+
+
+def test_dag_and_stages_share_report_cache(ctx, sample_data, write_dataset, tmp_path, monkeypatch):
+    write_dataset(ctx.data_dir, sample_data)
+    ctx = ctx._replace(database=tmp_path / "pipeline.db")
+    run_pipeline_dag(ctx, max_workers=4)
+    key = ctx.checkpoints.get("report").meta["report_key"]
+    assert ctx.checkpoints.load_blob(ctx.checkpoints.get("report"), "metrics_report.pdf").startswith(b"%PDF")
+
+    stored = []
+    put = ctx.store.put
+    monkeypatch.setattr(ctx.store, "put", lambda name, data: stored.append(name) or put(name, data))
+    run_pipeline_dag(ctx._replace(database=tmp_path / "otra.db"), max_workers=4)
+    assert run_stage(ctx, "report").meta["report_key"] == key
+    assert stored == []  # sin cambios en las métricas no se vuelve a guardar nada
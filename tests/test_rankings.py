@@ -0,0 +1,79 @@
+"""
+Tests para los rankings top-K de flows y skills.
+"""
+
+import numpy as np
+import pandas as pd
+from processing.metrics import get_all_metrics_as_dict
+from processing.rankings import REPORT_TOP_K, TopKAccumulator, flow_rankings, top_k, top_k_indices
+
+
+def test_top_k_indices_multiple_keys():
+    votes = np.array([5, 9, 5, 1, 9, 5])
+    views = np.array([10, 3, 20, 50, 3, 10])
+    result = top_k_indices([votes, views], 4)
+    np.testing.assert_array_equal(result, [1, 4, 2, 0])
+
+
+def test_top_k_indices_with_ties():
+    counts = np.array([3, 1, 2, 2, 2, 0])
+    np.testing.assert_array_equal(top_k_indices([counts], 2), [0, 2])
+    np.testing.assert_array_equal(top_k_indices([counts], 2, with_ties=True), [0, 2, 3, 4])
+
+
+def test_top_k_ascending_and_missing_values():
+    df = pd.DataFrame({"flow": [1, 2, 3, 4], "score": [4.0, np.nan, 1.0, 2.0]})
+    result = top_k(df, "score", 3, ascending=True)
+    assert result["flow"].tolist() == [3, 4, 1]
+    result = top_k(df, "score", 4)
+    assert result["flow"].tolist() == [1, 4, 3, 2]
+
+
+def test_top_k_matches_full_sort():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"a": rng.integers(0, 20, 500), "b": rng.integers(0, 5, 500)})
+    expected = df.sort_values(["a", "b"], ascending=False, kind="stable").head(25)
+    result = top_k(df, ["a", "b"], 25)
+    assert result.equals(expected.reset_index(drop=True))
+
+
+def test_top_k_accumulator_over_chunks():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({"flow": np.arange(300), "votes": rng.integers(0, 30, 300)})
+    left, right = TopKAccumulator("votes", 10), TopKAccumulator("votes", 10)
+    for start in range(0, 150, 40):
+        left.update(df.iloc[start : min(start + 40, 150)])
+    right.update(df.iloc[150:])
+    result = left.merge(right).finalize()
+    assert result.equals(top_k(df, "votes", 10))
+    assert len(left.rows) < 40
+
+
+def test_flow_rankings():
+    metrics = {
+        "Total Aplicaciones": pd.DataFrame({"ID Flow": [1, 2, 3], "Total Aplicaciones": [4, 7, 4]}),
+        "Votos Totales": pd.DataFrame({"ID Flow": [1, 3], "Votos Totales": [2, 2]}),
+        "Visualizaciones Totales": pd.DataFrame(
+            {"ID Flow": [3, 4], "Visualizaciones Totales": [8, 1]}
+        ),
+    }
+    result_mock = pd.DataFrame(
+        {
+            "ID Flow": [2, 3, 1],
+            "Total Aplicaciones": [7, 4, 4],
+            "Votos Totales": [0, 2, 2],
+            "Visualizaciones Totales": [0, 8, 0],
+        }
+    )
+    result = flow_rankings(metrics, k=3)
+    assert result.equals(result_mock)
+    assert flow_rankings(metrics)["ID Flow"].tolist() == [2, 3, 1, 4]
+
+
+def test_metrics_keep_every_flow_in_top_flows(make_sample_data):
+    data = make_sample_data(n_users=200, seed=3)
+    n_flows = REPORT_TOP_K + 5
+    data["flows"] = pd.DataFrame({"id": range(1, n_flows + 1), "created_at": data["flows"]["created_at"].iloc[0]})
+    data["resumes_exhibited"]["model_id"] = np.arange(len(data["resumes_exhibited"])) % n_flows + 1
+    ranking = get_all_metrics_as_dict(data)["Top Flows"]
+    assert len(ranking) == n_flows
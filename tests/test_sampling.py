@@ -0,0 +1,79 @@
+"""
+Tests para el modo de vista previa con muestreo e intervalos de confianza.
+"""
+
+import numpy as np
+import pandas as pd
+import processing.metrics as metrics_module
+import pytest
+from processing.metrics import get_all_metrics_as_dict
+from processing.sampling import hash_uniform, sample_events
+
+
+def test_hash_uniform_is_reproducible():
+    ids = np.arange(10_000)
+    values = hash_uniform(ids, seed=3)
+    assert np.array_equal(values, hash_uniform(ids[::-1], seed=3)[::-1])
+    assert not np.array_equal(values, hash_uniform(ids, seed=4))
+    assert values.min() >= 0 and values.max() < 1
+    assert abs((values < 0.25).mean() - 0.25) < 0.02
+
+
+def test_sample_events_keeps_small_flows_and_whole_users(sample_data):
+    sample, rates = sample_events(sample_data, 0.5, min_flow_events=0)
+    assert (rates == 0.5).all()
+    views, votes = sample["views"], sample["votes"]
+    assert 0 < len(views) < len(sample_data["views"])
+    kept_users = set(views["user_id"]) | set(votes["user_id"])
+    dropped = sample_data["views"][~sample_data["views"]["user_id"].isin(kept_users)]
+    assert dropped["user_id"].isin(views["user_id"]).sum() == 0
+
+    sample, rates = sample_events(sample_data, 0.5, min_flow_events=10**6)
+    assert (rates == 1.0).all()
+    assert len(sample["views"]) == len(sample_data["views"])
+
+
+def test_full_fraction_matches_exact_metrics(sample_data):
+    expected = get_all_metrics_as_dict({k: v.copy() for k, v in sample_data.items()})
+    result = get_all_metrics_as_dict(sample_data, sample_fraction=1.0)
+    intervals = result.pop("Intervalos de Confianza")
+    assert list(result) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(result[name], expected[name], obj=name)
+    assert (intervals["Límite Inferior"] == intervals["Límite Superior"]).all()
+
+
+def test_preview_intervals_cover_exact_values(large_sample_data):
+    data = large_sample_data
+    exact = get_all_metrics_as_dict({k: v.copy() for k, v in data.items()})
+    preview = get_all_metrics_as_dict(data, sample_fraction=0.3, seed=1)
+    assert preview["Total Aplicaciones"].equals(
+        get_all_metrics_as_dict(data, sample_fraction=0.3, seed=1)["Total Aplicaciones"]
+    )
+
+    intervals = preview["Intervalos de Confianza"]
+    covered = []
+    for name, rows in intervals.groupby("Métrica"):
+        truth = exact[name].set_index("ID Flow")[name]
+        values = truth.reindex(rows["ID Flow"]).to_numpy()
+        covered.extend(
+            (rows["Límite Inferior"].to_numpy() <= values)
+            & (values <= rows["Límite Superior"].to_numpy())
+        )
+    assert np.mean(covered) >= 0.8
+
+
+def test_chunked_tables_reject_sampling(sample_data):
+    chunked = {name: iter([df]) for name, df in sample_data.items()}
+    with pytest.raises(ValueError, match="sample_fraction"):
+        get_all_metrics_as_dict(chunked, sample_fraction=0.5)
+
+
+def test_preview_computes_retention_once(sample_data, monkeypatch):
+    calls = []
+    original = metrics_module.cohort_activity
+    monkeypatch.setattr(metrics_module, "cohort_activity", lambda data: calls.append(data) or original(data))
+    preview = get_all_metrics_as_dict(sample_data, sample_fraction=0.5)
+    assert len(calls) == 1
+    assert len(calls[0]["users"]) < len(sample_data["users"])
+    assert (preview["Retención por Cohorte"]["Usuarios"] >= 0).all()
@@ -0,0 +1,78 @@
+"""
+Tests para el índice invertido de skills (skill -> resumes/usuarios/flows).
+"""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, insert
+
+from db.models import Base, SkillPosting
+from processing.skill_index import SkillIndex, load_skill_index
+
+
+def build_data():
+    df_resumes = pd.DataFrame(
+        data={
+            "id": [1, 2, 3, 4],
+            "user_id": [10, 20, 30, 10],
+            "skills": [
+                "['Python', 'SQL']",
+                "['UX', 'Figma']",
+                "['Python', 'Data']",
+                "['Data']",
+            ],
+        }
+    )
+    df_resumes_exhibited = pd.DataFrame(
+        data={
+            "id": [1, 2, 3, 4, 5],
+            "resume_id": [1, 2, 3, 4, 1],
+            "model_id": [1, 1, 2, 2, 2],
+        }
+    )
+    df_profiles = pd.DataFrame(data={"user_id": [20], "skills": ["['Python']"]})
+    return {
+        "resumes": df_resumes,
+        "resumes_exhibited": df_resumes_exhibited,
+        "profiles": df_profiles,
+    }
+
+
+def test_resume_and_user_postings():
+    index = SkillIndex.build(build_data())
+
+    assert list(index.resumes(all_of=["python"])) == [1, 3]
+    assert list(index.resumes(all_of=["Python", "data"])) == [3]
+    assert list(index.resumes(any_of=["ux", "data"])) == [2, 3, 4]
+    assert list(index.resumes(all_of=["python"], any_of=["sql", "ux"])) == [1]
+    assert list(index.resumes(all_of=["cobol"])) == []
+    assert list(index.users(all_of=["python"])) == [10, 20, 30]
+
+
+def test_flow_counts():
+    index = SkillIndex.build(build_data())
+    result_mock = pd.DataFrame(
+        data={"ID Flow": [1, 2], "Aplicaciones": [1, 3], "Participantes": [1, 2]}
+    )
+    result = index.flow_counts(any_of=["python", "data"])
+    assert result.equals(result_mock)
+
+
+def test_round_trip_through_database():
+    data = build_data()
+    index = SkillIndex.build(data)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[SkillPosting.__table__])
+    with engine.begin() as connection:
+        connection.execute(insert(SkillPosting), index.to_records())
+    data["resumes"][["id", "user_id"]].to_sql("resumes", engine, index=False)
+    data["resumes_exhibited"].to_sql("resumes_exhibited", engine, index=False)
+
+    loaded = load_skill_index(engine)
+    for skill in index.dictionary.skills:
+        for kind in ("resume", "user"):
+            assert np.array_equal(loaded.posting(skill, kind), index.posting(skill, kind))
+    assert loaded.flow_counts(all_of=["python"]).equals(
+        index.flow_counts(all_of=["python"])
+    )
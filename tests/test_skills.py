@@ -0,0 +1,106 @@
+"""
+Tests para el tokenizador de skills y el diccionario compartido.
+"""
+
+import numpy as np
+import pandas as pd
+from processing.skills import (
+    SkillDictionary,
+    encode_skill_columns,
+    parse_skill_list,
+    skill_counts,
+)
+from processing.metrics import top_skills
+
+
+def test_parse_skill_list_keeps_commas_and_quotes():
+    raw = "['Python', 'Power BI, DAX', \"Maker's mindset\"]"
+    result = parse_skill_list(raw)
+    assert result == ["python", "power bi, dax", "maker's mindset"]
+
+
+def test_sample_data_skills_are_real_skill_lists(sample_data):
+    vocabulary = {"python", "sql", "ux", "figma", "data", "power bi, dax", "excel"}
+    for table in ("resumes", "profiles"):
+        parsed = [parse_skill_list(raw) for raw in sample_data[table]["skills"]]
+        assert all(skills and set(skills) <= vocabulary for skills in parsed)
+
+
+def test_parse_skill_list_nulls_and_malformed():
+    assert parse_skill_list(None) == []
+    assert parse_skill_list(np.nan) == []
+    assert parse_skill_list("[]") == []
+    assert parse_skill_list("[Python, SQL") == ["python", "sql"]
+
+
+def test_encode_shares_codes_between_rows():
+    dictionary = SkillDictionary()
+    values = pd.Series(["['Python', 'SQL']", None, "['Python', 'SQL']", "['UX']"])
+    encoded = dictionary.encode(values, row_ids=[10, 11, 12, 13])
+
+    assert len(encoded) == 4
+    assert list(encoded.row_ids) == [10, 11, 12, 13]
+    assert list(encoded.lengths()) == [2, 0, 2, 1]
+    assert list(encoded[2]) == [dictionary.code("Python"), dictionary.code("sql")]
+    assert list(encoded[3]) == [dictionary.code("ux")]
+    assert list(dictionary.to_categorical(encoded.codes)) == [
+        "python",
+        "sql",
+        "python",
+        "sql",
+        "ux",
+    ]
+
+
+def test_encode_skill_columns_uses_one_dictionary():
+    data = {
+        "resumes": pd.DataFrame({"id": [1, 2], "skills": ["['Python']", "['SQL']"]}),
+        "profiles": pd.DataFrame(
+            {
+                "user_id": [5],
+                "skills": ["['python', 'Figma']"],
+                "tools": ["['Figma']"],
+                "languages": ["['Español']"],
+            }
+        ),
+    }
+    dictionary = SkillDictionary()
+    encoded = encode_skill_columns(data, dictionary)
+
+    assert set(encoded) == {
+        ("resumes", "skills"),
+        ("profiles", "skills"),
+        ("profiles", "tools"),
+        ("profiles", "languages"),
+    }
+    assert encoded[("profiles", "skills")][0][0] == encoded[("resumes", "skills")][0][0]
+    assert list(encoded[("profiles", "tools")].row_ids) == [5]
+    assert len(dictionary) == 4
+
+
+def test_skill_counts_top_n_with_ties():
+    dictionary = SkillDictionary()
+    values = pd.Series(["['a', 'b', 'c']", "['c', 'b']", "['c', 'd']"])
+    encoded = dictionary.encode(values)
+
+    result = skill_counts(encoded, dictionary, top_n=2)
+    result_mock = pd.DataFrame({"Skill": ["c", "b"], "Cantidad": [3, 2]})
+    assert result.equals(result_mock)
+
+
+def test_top_skills():
+    df_resumes = pd.DataFrame(
+        data={
+            "id": [1, 2, 3],
+            "skills": [
+                "['Python', 'SQL']",
+                "['python', 'UX, UI']",
+                "['SQL', 'Python']",
+            ],
+        }
+    )
+    result_mock = pd.DataFrame(
+        data={"Skill": ["python", "sql", "ux, ui"], "Cantidad": [3, 2, 1]}
+    )
+    result = top_skills(df_resumes)
+    assert result.equals(result_mock)
@@ -0,0 +1,23 @@
+"""
+Tests del tiempo de arranque (importación en frío) de los puntos de entrada.
+"""
+
+import os
+
+import pytest
+from utils.startup import DEFERRED_IMPORTS, ENTRY_POINT_BUDGETS_MS, profile_import
+
+SETTINGS_VARIABLES = ("SENDGRID_API_KEY", "EMAIL_SENDER", "EMAIL_RECEIVER", "TEMPLATE_ID")
+
+# Slow CI machines can scale every budget, e.g. IMPORT_BUDGET_SCALE=2
+BUDGET_SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+
+@pytest.mark.parametrize("module", list(ENTRY_POINT_BUDGETS_MS))
+def test_entry_point_import_budget(module):
+    # No settings in the environment (nor a .env file): importing must not need them
+    env = {key: value for key, value in os.environ.items() if key not in SETTINGS_VARIABLES}
+    profile = profile_import(module, env)
+
+    assert [name for name in DEFERRED_IMPORTS[module] if profile.imported(name)] == []
+    assert profile.total_ms <= ENTRY_POINT_BUDGETS_MS[module] * BUDGET_SCALE
@@ -0,0 +1,96 @@
+"""
+Tests para el renderizado de tablas del reporte PDF.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from reporting.tables import MIN_FONT_SIZE, FontMetrics, clip_text, format_column, render_table
+
+
+def build_pdf() -> FPDF:
+    pdf = FPDF()
+    pdf.set_compression(False)
+    pdf.set_auto_page_break(auto=True, margin=10)
+    pdf.add_page()
+    return pdf
+
+
+def test_format_column():
+    assert list(format_column(pd.Series([1, 20, 300]))) == ["1", "20", "300"]
+    assert list(format_column(pd.Series([1.0, 66.666, np.nan]))) == ["1.00", "66.67", ""]
+    assert list(format_column(pd.Series([3.0, np.nan]))) == ["3", ""]
+    assert list(format_column(pd.Series(["Bogotá", None, "日本"]))) == ["Bogotá", "", "??"]
+
+
+def test_font_metrics_match_fpdf():
+    pdf = build_pdf()
+    pdf.set_font("Arial", "", 9)
+    metrics = FontMetrics(pdf)
+    for text in ["Participantes", "12345", "Conv. %"]:
+        assert metrics.width(text) == pdf.get_string_width(text)
+
+
+def test_render_table_repeats_header_and_limits_rows():
+    df = pd.DataFrame({"ID Flow": np.arange(500), "Cantidad Total": np.arange(500) * 3})
+    pdf = build_pdf()
+    render_table(pdf, df, max_rows=120)
+    output = pdf.output(dest="S")
+
+    assert pdf.page_no() > 1
+    assert output.count("(Cantidad Total)") == pdf.page_no()
+    assert "... 380 filas m" in output
+    assert "(357)" in output
+    assert "(360)" not in output
+
+
+def test_clip_text_fits_room():
+    pdf = build_pdf()
+    pdf.set_font("Arial", "", 9)
+    metrics = FontMetrics(pdf)
+    assert clip_text(metrics, "12345", 50) == "12345"
+    clipped = clip_text(metrics, "123456789012345", 10)
+    assert clipped.endswith("...") and "123456789012345".startswith(clipped[:-3])
+    assert metrics.width(clipped) <= 10
+    assert clip_text(metrics, "123", 0.5) == ""
+
+
+def test_wide_table_shrinks_font_and_clips_cells():
+    wide = pd.DataFrame({f"Columna Larga {i}": [123456789012.5 + i, 1.25] for i in range(12)})
+    pdf = build_pdf()
+    render_table(pdf, wide)
+    output = pdf.output(dest="S")
+    assert f"{MIN_FONT_SIZE:.2f} Tf" in output
+    assert "(123456789012.50)" not in output and "...) Tj" in output
+
+    # Ningún texto sobrepasa el borde derecho de su celda
+    pdf = build_pdf()
+    metrics = FontMetrics(pdf)
+    render_table(pdf, wide, metrics=metrics)
+    page = pdf.pages[1]
+    borders = [tuple(map(float, match)) for match in re.findall(r"([\d.]+) [\d.]+ ([\d.]+) -[\d.]+ re S", page)]
+    rights = sorted({(left + width) / pdf.k for left, width in borders})
+    assert rights[-1] <= pdf.w - pdf.r_margin + 0.01
+    for x, text in re.findall(r"BT ([\d.]+) [\d.]+ Td \((.*?)\) Tj ET", page):
+        left = float(x) / pdf.k
+        right = min(edge for edge in rights if edge > left)
+        assert left + metrics.width(text) <= right + 0.01
+
+
+def test_slightly_wide_table_only_shrinks_font():
+    wide = pd.DataFrame({f"Columna Larga {i}": [123456789012.5 + i, 1.25] for i in range(7)})
+    pdf = build_pdf()
+    render_table(pdf, wide)
+    output = pdf.output(dest="S")
+    sizes = {float(size) for size in re.findall(r"([\d.]+) Tf", output)}
+    assert MIN_FONT_SIZE < min(sizes) < 9
+    assert "(123456789012.50)" in output and "..." not in output
+
+
+def test_narrow_table_keeps_font_size():
+    pdf = build_pdf()
+    render_table(pdf, pd.DataFrame({"ID Flow": [1, 2], "Total": [3, 4]}))
+    output = pdf.output(dest="S")
+    assert f"{MIN_FONT_SIZE:.2f} Tf" not in output and "9.00 Tf" in output
@@ -0,0 +1,111 @@
+"""
+Tests para el motor de series de tiempo (códigos enteros de período).
+"""
+
+import numpy as np
+import pandas as pd
+from processing.timeseries import (
+    EventTimeline,
+    aggregate_events,
+    build_timelines,
+    day_to_period,
+    period_labels,
+    period_metrics,
+    to_day_codes,
+)
+from processing.metrics import metrics_per_month, metrics_per_week
+
+
+def build_applications():
+    return pd.DataFrame(
+        data={
+            "id": [1, 2, 3, 4, 5],
+            "model_id": [1, 1, 2, 2, 1],
+            "created_at": [
+                "2024-12-30 10:00:00",
+                "2025-01-05 08:00:00",
+                "2025-01-06 09:00:00",
+                "2025-03-31 23:59:00",
+                None,
+            ],
+        }
+    )
+
+
+def test_period_labels_match_calendar():
+    days, valid = to_day_codes(build_applications()["created_at"])
+    assert list(valid) == [True, True, True, True, False]
+
+    weeks = period_labels(day_to_period(days, "week"), "week")
+    assert list(weeks) == ["2025-W01", "2025-W01", "2025-W02", "2025-W14"]
+    expected = [
+        pd.Timestamp(day).isocalendar()
+        for day in ["2024-12-30", "2025-01-05", "2025-01-06", "2025-03-31"]
+    ]
+    assert list(weeks) == [f"{year}-W{week:02d}" for year, week, _ in expected]
+
+    assert list(period_labels(day_to_period(days, "month"), "month")) == [
+        "2024-12",
+        "2025-01",
+        "2025-01",
+        "2025-03",
+    ]
+    assert list(period_labels(day_to_period(days, "quarter"), "quarter")) == [
+        "2024-Q4",
+        "2025-Q1",
+        "2025-Q1",
+        "2025-Q1",
+    ]
+
+
+def test_aggregate_events_by_flow():
+    timeline = EventTimeline(build_applications())
+    result_mock = pd.DataFrame(
+        data={
+            "Mes": ["2024-12", "2025-01", "2025-01", "2025-03"],
+            "ID Flow": [1, 1, 2, 2],
+            "Aplicaciones": [1, 1, 1, 1],
+        }
+    )
+    result = aggregate_events(timeline, "month", "Aplicaciones", by_flow=True)
+    assert result.astype({"Mes": object}).equals(result_mock.astype({"Mes": object}))
+
+
+def test_metrics_per_month_and_week():
+    df_applications = build_applications()
+    result = metrics_per_month(df_applications)
+    assert list(result.columns) == ["Mes", "Total Aplicaciones"]
+    assert list(result["Mes"]) == ["2024-12", "2025-01", "2025-03"]
+    assert list(result["Total Aplicaciones"]) == [1, 2, 1]
+
+    result = metrics_per_week(df_applications)
+    assert list(result["Semana"]) == ["2025-W01", "2025-W02", "2025-W14"]
+    assert list(result["Total Aplicaciones"]) == [2, 1, 1]
+
+
+def test_period_metrics_aligns_event_tables():
+    data = {
+        "resumes_exhibited": build_applications(),
+        "votes": pd.DataFrame(
+            data={
+                "id": [1, 2],
+                "model_id": [2, 3],
+                "value": [4.5, 3.0],
+                "created_at": ["2025-01-10", "2025-02-01"],
+            }
+        ),
+        "views": pd.DataFrame(
+            data={"id": [1], "model_id": [1], "created_at": ["2025-01-02"]}
+        ),
+    }
+    result = period_metrics(build_timelines(data), "month")
+    assert list(result["Mes"]) == ["2024-12", "2025-01", "2025-02", "2025-03"]
+    assert list(result["Aplicaciones"]) == [1, 2, 0, 1]
+    assert np.allclose(result["Votos"], [0.0, 4.5, 3.0, 0.0])
+    assert list(result["Visualizaciones"]) == [0, 1, 0, 0]
+    assert list(result["Compartidos"]) == [0, 0, 0, 0]
+
+    result = period_metrics(build_timelines(data), "quarter", by_flow=True)
+    assert list(result["ID Flow"]) == [1, 1, 2, 3]
+    assert list(result["Trimestre"]) == ["2024-Q4", "2025-Q1", "2025-Q1", "2025-Q1"]
+    assert list(result["Aplicaciones"]) == [1, 1, 2, 0]
@@ -0,0 +1,170 @@
+"""
+Tests para el modo watch: ingesta incremental, estado en memoria y reportes con debounce.
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+from config import get_settings
+from delivery.outbox import Outbox
+from ingestion.loader import read_file_tail
+from ingestion.watcher import InotifyWatcher, PollingWatcher
+from pipeline.checkpoints import CheckpointStore
+from pipeline.stages import PipelineContext
+from pipeline.watch import WarmState, run_watch
+from processing.aggregates import stream_all_metrics
+from reporting.cache import ArtifactStore
+
+
+@pytest.fixture
+def data_dir(tmp_path, sample_data, write_dataset):
+    # Registros cuyo usuario todavía no existe: los rechaza la validación de FK
+    resumes = sample_data["resumes"]
+    sample_data["resumes"] = pd.concat([resumes, resumes.tail(2).assign(id=[901, 902], user_id=[61, 62])])
+    return write_dataset(tmp_path / "data", sample_data)
+
+
+def append_rows(path, rows):
+    rows.to_csv(path, mode="a", header=False, index=False)
+
+
+def new_users(data_dir, ids):
+    users = pd.read_csv(data_dir / "users.csv").tail(len(ids))
+    return users.assign(id=ids, email=[f"nuevo{i}@talentpitch.co" for i in ids])
+
+
+def assert_same_metrics(state):
+    """Las métricas incrementales coinciden con las de una carga completa de los archivos."""
+    fresh = WarmState(state.data_dir)
+    fresh.load()
+    expected = stream_all_metrics(fresh.data)
+    assert list(state.metrics) == list(expected)
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(
+            state.metrics[name].reset_index(drop=True), frame.reset_index(drop=True), check_dtype=False
+        )
+
+
+def test_read_file_tail_reads_complete_appended_rows(tmp_path):
+    path = tmp_path / "flows.csv"
+    path.write_text("id,name\n1,a\n")
+    rows, offset = read_file_tail(path, 0)
+    assert rows["id"].tolist() == [1] and offset == path.stat().st_size
+
+    with open(path, "a") as file:
+        file.write("2,b\n3,c")  # the last row is still being written
+    rows, offset = read_file_tail(path, offset)
+    assert rows.to_dict("list") == {"id": [2], "name": ["b"]}
+    assert read_file_tail(path, offset)[0].empty
+
+
+def test_append_is_folded_into_warm_aggregates(data_dir):
+    state = WarmState(data_dir)
+    state.load()
+    votes = pd.read_csv(data_dir / "votes.csv")
+    append_rows(data_dir / "votes.csv", votes.head(5).assign(id=range(10_001, 10_006)))
+
+    result = state.apply({"votes"})
+    assert result.appended == {"votes": 5}
+    assert result.reloaded == []
+    assert "Votos Totales" in result.metrics and "Top Skills" not in result.metrics
+    assert len(state.data["votes"]) == len(votes) + 5
+    assert_same_metrics(state)
+
+
+def test_new_references_revalidate_rejected_rows(data_dir):
+    state = WarmState(data_dir)
+    state.load()
+    assert not state.data["resumes"]["id"].isin([901, 902]).any()
+
+    append_rows(data_dir / "users.csv", new_users(data_dir, [61, 62]))
+    result = state.apply({"users"})
+    assert result.appended == {"users": 2}
+    assert result.reloaded == ["resumes", "resumes_exhibited"]
+    assert state.data["resumes"]["id"].isin([901, 902]).sum() == 2
+    assert_same_metrics(state)
+
+
+def test_rewritten_or_updated_files_are_reloaded(data_dir):
+    state = WarmState(data_dir)
+    state.load()
+
+    # Una fila con un id existente es una actualización, no un registro nuevo
+    shares = pd.read_csv(data_dir / "shares.csv")
+    append_rows(data_dir / "shares.csv", shares.head(1).assign(model_id=1, created_at="2030-01-01"))
+    assert state.apply({"shares"}).reloaded == ["shares"]
+    assert_same_metrics(state)
+
+    flows = pd.read_csv(data_dir / "flows.csv")
+    flows.head(3).to_csv(data_dir / "flows.csv", index=False)
+    result = state.apply({"flows"})
+    assert result.reloaded == ["flows", "resumes_exhibited", "votes", "shares", "views"]
+    assert set(state.data["votes"]["model_id"]) <= {1, 2, 3}
+    assert_same_metrics(state)
+
+    assert not state.apply({"flows"}).changed
+
+
+def test_polling_watcher_reports_changed_tables(data_dir):
+    watcher = PollingWatcher(data_dir, interval=0.01)
+    assert watcher.changes(0.02) == set()
+    append_rows(data_dir / "users.csv", new_users(data_dir, [70]))
+    (data_dir / "notas.txt").write_text("ignorado")
+    assert watcher.changes(1) == {"users"}
+
+
+def test_inotify_watcher_reports_changed_tables(data_dir):
+    try:
+        watcher = InotifyWatcher(data_dir)
+    except (OSError, AttributeError):
+        pytest.skip("inotify no disponible")
+    try:
+        append_rows(data_dir / "views.csv", pd.read_csv(data_dir / "views.csv").head(1))
+        (data_dir / "notas.txt").write_text("ignorado")
+        assert watcher.changes(1) == {"views"}
+        assert watcher.changes(0.01) == set()
+    finally:
+        watcher.close()
+
+
+def test_run_watch_debounces_reports(data_dir, tmp_path, monkeypatch):
+    for key in ("SENDGRID_API_KEY", "EMAIL_SENDER", "EMAIL_RECEIVER", "TEMPLATE_ID"):
+        monkeypatch.setenv(key, "reportes@talentpitch.co")
+    get_settings.cache_clear()
+    outbox = Outbox(tmp_path / "outbox.db")
+    ctx = PipelineContext(
+        CheckpointStore(tmp_path / "checkpoints"), ArtifactStore(tmp_path / "artifacts"), outbox, data_dir=data_dir
+    )
+    stop = threading.Event()
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(
+            state=run_watch(ctx, interval=0.05, debounce=0.5, polling=True, persist=False, stop=stop)
+        )
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 60
+        while ctx.checkpoints.get("report") is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        first = ctx.checkpoints.get("report")
+        assert first is not None
+
+        votes = pd.read_csv(data_dir / "votes.csv")
+        for i in range(3):  # several batches, a single report
+            append_rows(data_dir / "votes.csv", votes.head(1).assign(id=20_000 + i))
+            time.sleep(0.15)
+        while ctx.checkpoints.get("report").run_id == first.run_id and time.monotonic() < deadline:
+            time.sleep(0.05)
+        second = ctx.checkpoints.get("report")
+        assert second.run_id != first.run_id
+        assert len(ctx.checkpoints.load_tables(ctx.checkpoints.get("ingest"))["votes"]) == len(votes) + 3
+        assert second.meta["report_key"] != first.meta["report_key"]
+    finally:
+        stop.set()
+        thread.join()
+        outbox.close()
+        get_settings.cache_clear()
+    assert len(result["state"].data["votes"]) == len(votes) + 3